@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# AUTHOR: Tonio Weidler
+
+"""Micro-benchmark comparing the batch lookup methods of the WordNet Interface with their per-item variants.
+
+Usage:
+	python3 benchmarks/benchmark_batch.py [WORDNET_DIR] [LOOKUPS]
+
+Draws LOOKUPS (default 100000) lemmas, sense keys and synsets with repetitions (following a Zipf like distribution,
+as in a corpus), resolves them one by one and with the batch methods, checks that both agree and reports the
+time per lookup. WORDNET_DIR defaults to data/wordnet_database/.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), "../"))
+
+import time
+import random
+
+from src.WordnetInterface import WordNet
+
+def draw(population, size, rng):
+	"""Draw a sample with repetitions, the first elements of the population are drawn much more often."""
+	weights = [1.0 / (rank + 1) for rank in range(len(population))]
+	return rng.choices(population, weights=weights, k=size)
+
+def measure(function):
+	"""Call a function and get its result and duration in seconds."""
+	start = time.time()
+	result = function()
+	return result, time.time() - start
+
+def run(wordnet_dir, lookups):
+	"""Run the benchmark and print a table of the results."""
+	wordnet = WordNet(wordnet_dir, "src/pointers/noun_pointers.txt", "src/pointers/adj_pointers.txt", "src/pointers/verb_pointers.txt", "src/pointers/adv_pointers.txt")
+	wordnet.graph("hypernym")
+	rng = random.Random(0)
+
+	lemmas = draw(sorted(wordnet.lemmas["noun"]), lookups, rng)
+	sense_keys = draw(sorted(wordnet.sense_keys), lookups, rng)
+	synsets = draw([wordnet.synsets[synset_id] for synset_id in sorted(wordnet.synsets)], lookups, rng)
+
+	comparisons = [
+		("synsets_for_lemma(s)", lambda: [wordnet.synsets_for_lemma(lemma, "noun") for lemma in lemmas], lambda: wordnet.synsets_for_lemmas(lemmas, "noun")),
+		("synset_id(s)_from_key(s)", lambda: [wordnet.synset_id_from_key(sense_key) for sense_key in sense_keys], lambda: wordnet.synset_ids_from_keys(sense_keys)),
+		("hypernyms (depth 3)", lambda: [wordnet.get_hypernym_synsets(synset, traversal_depth=3) for synset in synsets], lambda: wordnet.hypernyms_many(synsets, depth=3))
+	]
+
+	print("\n{0} lookups".format(lookups))
+	print("{0:<28}{1:>16}{2:>16}{3:>10}".format("query", "per item (us)", "batch (us)", "speedup"))
+	for name, per_item, batch in comparisons:
+		per_item_result, per_item_time = measure(per_item)
+		batch_result, batch_time = measure(batch)
+		if per_item_result != batch_result:
+			print("WARNING: results of {0} disagree".format(name))
+		print("{0:<28}{1:>16.2f}{2:>16.2f}{3:>9.1f}x".format(name, per_item_time / lookups * 1e6, batch_time / lookups * 1e6, per_item_time / batch_time))
+
+if __name__ == "__main__":
+	run(sys.argv[1] if len(sys.argv) > 1 else "data/wordnet_database/", int(sys.argv[2]) if len(sys.argv) > 2 else 100000)
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# AUTHOR: Tonio Weidler
+
+"""Benchmark comparing the loading of the WordNet database files with the streaming loading of a WN-LMF XML file.
+
+Usage:
+	python3 benchmarks/benchmark_lmf.py [WORDNET_DIR] [LMF_FILE]
+
+Every loader runs in a fresh process, which reports its load time, the peak of the memory allocated by python while
+loading (tracemalloc, measured in a second run as tracing slows loading down) and its peak resident memory. The sizes of
+the loaded tables are printed as well, so that the resources can be compared. WORDNET_DIR defaults to
+data/wordnet_database/, LMF_FILE to data/english-wordnet.xml (gzipped files are supported).
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), "../"))
+
+import time
+import resource
+import tracemalloc
+import multiprocessing
+
+from src.WordnetInterface import WordNet
+
+POINTERS = ["src/pointers/noun_pointers.txt", "src/pointers/adj_pointers.txt", "src/pointers/verb_pointers.txt", "src/pointers/adv_pointers.txt"]
+
+def measure(source, traced):
+	"""Load a WordNet from a database directory or WN-LMF file, runs in a separate process.
+
+	Returns:
+		(tuple):	load time in seconds, peak of traced allocations in MB (None if not traced), peak RSS in MB, table sizes
+	"""
+	if traced:
+		tracemalloc.start()
+	start = time.time()
+	wordnet = WordNet(source, *POINTERS)
+	load_time = time.time() - start
+	traced_peak = tracemalloc.get_traced_memory()[1] / 1024.0 / 1024.0 if traced else None
+
+	sizes = {
+		"lemmas": sum(len(wordnet.lemmas[wordclass]) for wordclass in wordnet.wordclasses),
+		"synsets": len(wordnet.synsets),
+		"sense keys": len(wordnet.sense_keys)
+	}
+	return load_time, traced_peak, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0, sizes
+
+def run(wordnet_dir, lmf_file):
+	"""Measure both loaders and print a table of the results."""
+	results = {}
+	for name, source in [("database files", wordnet_dir), ("WN-LMF", lmf_file)]:
+		# spawned processes dont inherit the memory of this process, so their peaks only contain the loader
+		with multiprocessing.get_context("spawn").Pool(1) as pool:
+			load_time, _, peak_rss, sizes = pool.apply(measure, (source, False))
+		with multiprocessing.get_context("spawn").Pool(1) as pool:
+			traced_peak = pool.apply(measure, (source, True))[1]
+		results[name] = (load_time, traced_peak, peak_rss, sizes)
+
+	print("\n{0:<24}{1:>18}{2:>18}".format("", "database files", "WN-LMF"))
+	print("{0:<24}{1:>18.2f}{2:>18.2f}".format("load (s)", results["database files"][0], results["WN-LMF"][0]))
+	print("{0:<24}{1:>18.1f}{2:>18.1f}".format("peak allocated (MB)", results["database files"][1], results["WN-LMF"][1]))
+	print("{0:<24}{1:>18.1f}{2:>18.1f}".format("peak RSS (MB)", results["database files"][2], results["WN-LMF"][2]))
+	for table in results["database files"][3]:
+		print("{0:<24}{1:>18}{2:>18}".format(table, results["database files"][3][table], results["WN-LMF"][3][table]))
+
+if __name__ == "__main__":
+	run(sys.argv[1] if len(sys.argv) > 1 else "data/wordnet_database/", sys.argv[2] if len(sys.argv) > 2 else "data/english-wordnet.xml")
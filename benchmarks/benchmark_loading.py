@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# AUTHOR: Tonio Weidler
+
+"""Benchmark comparing the former whole-file parsers of the WordNet Interface with the streaming parsers.
+
+Usage:
+	python3 benchmarks/benchmark_loading.py [WORDNET_DIR]
+
+For every database file the parse time and the peak memory allocated while parsing (measured with tracemalloc)
+are reported for both loaders. WORDNET_DIR defaults to data/wordnet_database/.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), "../"))
+
+import time
+import tracemalloc
+
+from src.WordnetInterface import WordNet
+
+### FORMER LOADER ###
+
+def legacy_parse_index_file(file_content):
+	"""Parser for index.POS files as used before the streaming parsers."""
+	lines = [line.strip().split(" ") for line in file_content.split("\n") if line[:2] != "  " and len(line.strip().split(" ")) > 1]
+	index = {}
+
+	for word in lines:
+		if word[0] not in index:
+			index[word[0]] = {
+				"pos": word[1],
+				"synset_cnt": word[2],
+				"p_cnt": word[3],
+				"ptr_symbol": word[4:4+int(word[3])],
+				"sense_cnt": word[4+int(word[3])],
+				"tagsense_cnt": word[4+int(word[3])+1],
+				"synset_offsets": word[4+int(word[3])+2:]
+			}
+
+	return index
+
+def legacy_parse_data_file(file_content):
+	"""Parser for data.POS files as used before the streaming parsers."""
+	lines = [line.strip().split(" ") for line in file_content.split("\n") if line[:2] != "  " and len(line.strip().split(" ")) > 1]
+	data = {}
+
+	for word in lines:
+		if word[0] not in data:
+			word_chunk_length = 2
+			word_info = {
+				"lex_filenum": word[1],
+				"ss_type": word[2],
+				"w_cnt": int(word[3], 16),
+				"p_cnt": int(word[4+int(word[3], 16)*2]),
+				"gloss": " ".join(word[word.index("|")+1:]),
+				"sense_keys": []
+			}
+
+			word_list = [(w, word[4:4+word_info["w_cnt"]*word_chunk_length+1][i+1]) for i, w in list(enumerate(word[4:4+word_info["w_cnt"]*word_chunk_length]))[::2]]
+			pointers = [word[4+word_info["w_cnt"]*word_chunk_length+1:4+word_info["w_cnt"]*word_chunk_length+1 + word_info["p_cnt"]*4][i:i+4] for i in range(0, word_info["p_cnt"]*4, 4)]
+
+			word_info.update({
+				"words": word_list,
+				"pointers": pointers
+			})
+
+			if word_info["ss_type"] == "v":
+				f_cnt_position = int(4 + (word_info["w_cnt"] * word_chunk_length) + 1 + (word_info["p_cnt"] * 4))
+				f_cnt = int(word[f_cnt_position], 16)
+				frame_list = [word[f_cnt_position+1:f_cnt_position+1+f_cnt*3][i+1:i+3] for i in range(0, f_cnt*3, 3)]
+
+				word_info.update({
+					"f_cnt": f_cnt,
+					"frames": frame_list
+				})
+
+			data[word[0]] = word_info
+
+	return data
+
+def legacy_parse_sense_index_file(file_content):
+	"""Parser for the index.sense file as used before the streaming parsers."""
+	lines = [line.strip().split(" ") for line in file_content.split("\n") if line[:2] != "  " and len(line.strip().split(" ")) > 1]
+	index = {}
+
+	for word in lines:
+		if word[0] not in index:
+			index[word[0]] = {
+				"synset_offset": word[1],
+				"sense_number": word[2],
+				"tag_cnt": word[3]
+			}
+
+	return index
+
+### BENCHMARK ###
+
+def measure(parse, path):
+	"""Parse a file and measure the time and the peak of allocated memory.
+
+	Returns:
+		(tuple):	parse result, seconds, peak memory in MB
+	"""
+	tracemalloc.start()
+	start = time.time()
+	with open(path) as f:
+		result = parse(f)
+	duration = time.time() - start
+	peak = tracemalloc.get_traced_memory()[1] / 1024.0 / 1024.0
+	tracemalloc.stop()
+
+	return result, duration, peak
+
+def as_strings(result):
+	"""Convert the parse result of a file to plain dicts with numbers as strings, as the former parsers stored them."""
+	return {key: {field: str(value) if isinstance(value, int) else value for field, value in entry.items()} for key, entry in result.items()}
+
+def run(wordnet_dir):
+	"""Run the benchmark on all database files in the directory and print a table of the results."""
+	# the parsers dont depend on a loaded database, so an unloaded WordNet object suffices
+	wordnet = WordNet.__new__(WordNet)
+
+	parsers = [("index.sense", legacy_parse_sense_index_file, wordnet._parse_sense_index_file)]
+	for wordclass in ["noun", "adj", "verb", "adv"]:
+		parsers.append(("index." + wordclass, legacy_parse_index_file, wordnet._parse_index_file))
+		parsers.append(("data." + wordclass, legacy_parse_data_file, lambda lines: wordnet._parse_data_file(lines, None)))
+
+	print("{0:<14}{1:>12}{2:>12}{3:>14}{4:>14}".format("file", "old (s)", "new (s)", "old peak (MB)", "new peak (MB)"))
+	totals = [0.0, 0.0, 0.0, 0.0]
+	for filename, legacy_parser, streaming_parser in parsers:
+		path = os.path.join(wordnet_dir, filename)
+		legacy_result, legacy_time, legacy_peak = measure(lambda f: legacy_parser(f.read()), path)
+		streaming_result, streaming_time, streaming_peak = measure(streaming_parser, path)
+
+		if as_strings(legacy_result) != as_strings(streaming_result):
+			print("WARNING: parsers disagree on {0}".format(filename))
+
+		for i, value in enumerate([legacy_time, streaming_time, legacy_peak, streaming_peak]):
+			totals[i] += value
+		print("{0:<14}{1:>12.2f}{2:>12.2f}{3:>14.1f}{4:>14.1f}".format(filename, legacy_time, streaming_time, legacy_peak, streaming_peak))
+
+	print("{0:<14}{1:>12.2f}{2:>12.2f}{3:>14.1f}{4:>14.1f}".format("total", *totals))
+
+if __name__ == "__main__":
+	run(sys.argv[1] if len(sys.argv) > 1 else "data/wordnet_database/")
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# AUTHOR: Tonio Weidler
+
+"""Benchmark comparing the in-memory WordNet Interface with the SQLite backed WordNet.
+
+Usage:
+	python3 benchmarks/benchmark_storage.py [WORDNET_DIR] [DATABASE_PATH]
+
+Every backend is loaded in a fresh process, which reports its resident memory (RSS) after loading and the mean
+latency of synset_from_id, synset_from_key, synsets_for_lemma and get_hypernym_synsets over a random sample of
+lookups. Lookups are measured cold (first access) and hot (repeated access). WORDNET_DIR defaults to
+data/wordnet_database/, DATABASE_PATH to extracted_data/wordnet_benchmark.sqlite (created if needed).
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), "../"))
+
+import time
+import random
+import resource
+import multiprocessing
+
+from src.WordnetInterface import WordNet
+from src.WordnetSQLite import SQLiteWordNet
+
+POINTERS = ["src/pointers/noun_pointers.txt", "src/pointers/adj_pointers.txt", "src/pointers/verb_pointers.txt", "src/pointers/adv_pointers.txt"]
+SAMPLE_SIZE = 2000
+
+def rss():
+	"""Get the current resident memory of the process in MB, the peak if /proc is not available."""
+	try:
+		with open("/proc/self/status") as f:
+			for line in f:
+				if line.startswith("VmRSS:"):
+					return int(line.split()[1]) / 1024.0
+	except IOError:
+		pass
+	return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+def mean_latency(query, arguments):
+	"""Run a query for all arguments and get the mean latency in microseconds."""
+	start = time.time()
+	for argument in arguments:
+		query(*argument)
+	return (time.time() - start) / len(arguments) * 1e6
+
+def measure(backend, wordnet_dir, database_path, sample):
+	"""Load a backend and measure its memory and lookup latencies, runs in a separate process.
+
+	Returns:
+		(tuple):	load time in seconds, RSS in MB, dict of query names and (cold, hot) latencies
+	"""
+	start = time.time()
+	if backend == "in-memory":
+		wordnet = WordNet(wordnet_dir, *POINTERS)
+	else:
+		wordnet = SQLiteWordNet(database_path)
+	load_time = time.time() - start
+	memory = rss()
+
+	synset_ids, sense_keys, lemmas = sample
+	queries = [
+		("synset_from_id", wordnet.synset_from_id, [(synset_id,) for synset_id in synset_ids]),
+		("synset_from_key", wordnet.synset_from_key, [(sense_key,) for sense_key in sense_keys]),
+		("synsets_for_lemma", wordnet.synsets_for_lemma, lemmas),
+		("get_hypernym_synsets", lambda synset_id: wordnet.get_hypernym_synsets(wordnet.synset_from_id(synset_id), traversal_depth=3), [(synset_id,) for synset_id in reversed(synset_ids)])
+	]
+
+	latencies = {}
+	for name, query, arguments in queries:
+		latencies[name] = (mean_latency(query, arguments), mean_latency(query, arguments))
+
+	return load_time, memory, latencies
+
+def run(wordnet_dir, database_path):
+	"""Build the database if necessary, measure both backends and print a table of the results."""
+	arguments = [wordnet_dir] + POINTERS
+	SQLiteWordNet.attach(database_path, *arguments)
+
+	# draw the same sample for both backends
+	wordnet = SQLiteWordNet(database_path)
+	rng = random.Random(0)
+	draw = lambda population, size: rng.sample(population, min(size, len(population)))
+	synset_ids = draw(list(wordnet.synsets), SAMPLE_SIZE)
+	sense_keys = draw(list(wordnet.sense_keys), SAMPLE_SIZE)
+	lemmas = [(lemma, wordclass) for wordclass in wordnet.wordclasses for lemma in draw(list(wordnet.lemmas[wordclass]), SAMPLE_SIZE // len(wordnet.wordclasses))]
+	sample = (synset_ids, sense_keys, lemmas)
+
+	# spawned processes dont inherit the memory of this process, so their RSS only contains the backend
+	results = {}
+	for backend in ["in-memory", "sqlite"]:
+		with multiprocessing.get_context("spawn").Pool(1) as pool:
+			results[backend] = pool.apply(measure, (backend, wordnet_dir, database_path, sample))
+
+	print("\n{0:<24}{1:>14}{2:>14}".format("", "in-memory", "sqlite"))
+	print("{0:<24}{1:>14.2f}{2:>14.2f}".format("load (s)", results["in-memory"][0], results["sqlite"][0]))
+	print("{0:<24}{1:>14.1f}{2:>14.1f}".format("RSS (MB)", results["in-memory"][1], results["sqlite"][1]))
+	print("{0:<24}{1:>14}{2:>14}".format("latency (us)", "cold / hot", "cold / hot"))
+	for name in results["in-memory"][2]:
+		print("{0:<24}{1:>14}{2:>14}".format(name, *["{0:.1f} / {1:.1f}".format(*results[backend][2][name]) for backend in ["in-memory", "sqlite"]]))
+
+if __name__ == "__main__":
+	run(sys.argv[1] if len(sys.argv) > 1 else "data/wordnet_database/", sys.argv[2] if len(sys.argv) > 2 else "extracted_data/wordnet_benchmark.sqlite")
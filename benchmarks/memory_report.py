@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# AUTHOR: Tonio Weidler
+
+"""Memory report comparing the slot based Synset, Gloss and Token classes with the former dict based classes.
+
+Usage:
+	python3 benchmarks/memory_report.py [WORDNET_DIR] [GLOSSTAG_DIR]
+
+Collects all glosses and, if GLOSSTAG_DIR is given, disambiguates them. The resulting structure is then copied into
+equivalents of the former classes (a per-instance __dict__, eagerly created attributes and no interned strings) and
+the deep size of both structures is reported. WORDNET_DIR defaults to data/wordnet_database/.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), "../"))
+
+from src.WordnetInterface import WordNet
+from src.glosses.Glosses import CollocationHead, CollocationMember
+
+### FORMER CLASSES ###
+
+class LegacySynset(object):
+	"""Synset as it was stored before using slots."""
+
+	def __init__(self, synset_id, sense_keys, words, relations, gloss):
+		self.__dict__.update(locals())
+		del self.__dict__["self"]
+
+		self.ss_type = synset_id[0]
+		self.offset = synset_id[1:]
+
+		gloss_parts = [part.strip() for part in gloss.split(";")]
+		self.definitions = [part for part in gloss_parts if not part.startswith('"') or not part.endswith('"')]
+		self.examples = [part for part in gloss_parts if part.startswith('"') and part.endswith('"')]
+
+class LegacyGloss(object):
+	"""Gloss as it was stored before using slots."""
+
+	def __init__(self, pos, synset_offset, synset_id, gloss_text, gloss_definitions, gloss_examples, synset):
+		self.__dict__.update(locals())
+		del self.__dict__["self"]
+
+		self.tokens = {}
+
+class LegacyToken(object):
+	"""Token (and collocation) as it was stored before using slots, the collocation fields are passed as keywords."""
+
+	def __init__(self, id, token, lemma, wn_synset_offset, wn_sense_key, tag, pos, **collocation):
+		self.__dict__.update(locals())
+		del self.__dict__["self"]
+		del self.__dict__["collocation"]
+		self.__dict__.update(collocation)
+
+		self.lemma_strings = set([lemma_string.split("%")[0].lower() for lemma_string in self.lemma.split("|")])
+
+### REPORT ###
+
+def fresh(value):
+	"""Copy strings into new objects, as they were when they were not interned yet."""
+	if isinstance(value, str) and len(value) > 1:
+		return (value + " ")[:-1]
+	if isinstance(value, list):
+		return [fresh(v) for v in value]
+	if isinstance(value, tuple):
+		return tuple(fresh(v) for v in value)
+	if isinstance(value, dict):
+		return {fresh(k): fresh(v) for k, v in value.items()}
+	return value
+
+def to_legacy(glosses):
+	"""Copy a dict of glosses (and their synsets and tokens) into the former classes."""
+	legacy = {}
+	for synset_id, gloss in glosses.items():
+		synset = gloss.synset
+		legacy_synset = LegacySynset(fresh(synset.synset_id), fresh(synset.sense_keys), fresh(synset.words), fresh(synset.relations), fresh(synset.gloss))
+		legacy_gloss = LegacyGloss(fresh(gloss.pos), legacy_synset.offset, legacy_synset.synset_id, legacy_synset.gloss, legacy_synset.definitions, legacy_synset.examples, legacy_synset)
+
+		for token_id, token in gloss.tokens.items():
+			collocation = {}
+			if isinstance(token, CollocationMember):
+				collocation["collocation_id"] = fresh(token.collocation_id)
+			if isinstance(token, CollocationHead):
+				collocation.update(collocation_lemma=fresh(token.collocation_lemma), collocation_wn_sense_key=fresh(token.collocation_wn_sense_key), collocation_tag=fresh(token.collocation_tag))
+			legacy_gloss.tokens[token_id] = LegacyToken(token.id, fresh(token.token), fresh(token.lemma), fresh(token.wn_synset_offset), fresh(token.wn_sense_key), fresh(token.tag), fresh(token.pos), **collocation)
+
+		legacy[legacy_synset.synset_id] = legacy_gloss
+
+	return legacy
+
+def deep_size(root):
+	"""Sum the sizes of all objects reachable from root, counting shared objects once."""
+	seen = set()
+	stack = [root]
+	size = 0
+
+	while stack:
+		obj = stack.pop()
+		if id(obj) in seen:
+			continue
+		seen.add(id(obj))
+		size += sys.getsizeof(obj)
+
+		if isinstance(obj, dict):
+			stack.extend(obj.keys())
+			stack.extend(obj.values())
+		elif isinstance(obj, (list, tuple, set, frozenset)):
+			stack.extend(obj)
+		elif not isinstance(obj, (str, int, float, bool, type(None))):
+			if hasattr(obj, "__dict__"):
+				stack.append(obj.__dict__)
+			for cls in type(obj).__mro__:
+				for slot in cls.__dict__.get("__slots__", ()):
+					if hasattr(obj, slot):
+						stack.append(getattr(obj, slot))
+
+	return size
+
+def run(wordnet_dir, glosstag_dir=None):
+	"""Build the glosses and print their footprint in both representations."""
+	wordnet = WordNet(wordnet_dir, "src/pointers/noun_pointers.txt", "src/pointers/adj_pointers.txt", "src/pointers/verb_pointers.txt", "src/pointers/adv_pointers.txt")
+	glosses = wordnet.collect_glosses()
+
+	if glosstag_dir:
+		from src.glosses.GlossWSD import GlossDisambiguator
+		glosstag_files = [os.path.join(glosstag_dir, f) for f in ["adv.xml", "verb.xml", "noun.xml", "adj.xml"]]
+		glosses = GlossDisambiguator(glosses, glosstag_files, wordnet).disambiguate_glosses()
+
+	legacy_glosses = to_legacy(glosses)
+	tokens = sum(len(gloss.tokens) for gloss in glosses.values())
+
+	current_size = deep_size(glosses) / 1024.0 / 1024.0
+	legacy_size = deep_size(legacy_glosses) / 1024.0 / 1024.0
+
+	print("\n{0} synsets/glosses, {1} tokens".format(len(glosses), tokens))
+	print("{0:<22}{1:>12.1f} MB".format("former classes", legacy_size))
+	print("{0:<22}{1:>12.1f} MB".format("slot based classes", current_size))
+	print("{0:<22}{1:>12.1f} %".format("saved", 100.0 * (legacy_size - current_size) / legacy_size))
+
+if __name__ == "__main__":
+	run(sys.argv[1] if len(sys.argv) > 1 else "data/wordnet_database/", sys.argv[2] if len(sys.argv) > 2 else None)
@@ -53,6 +53,12 @@ arg_parser.add_argument("--detailed",
 	default=False,
 	type=bool)
 
+arg_parser.add_argument("--workers",
+	required=False,
+	dest="workers",
+	default=None,
+	type=int)
+
 arguments = arg_parser.parse_args()
 
 file_extension = arguments.file_extension
@@ -78,7 +84,7 @@ if new_disambiguation and not new_logic_transformation:
 	new_logic_transformation = True
 
 # initialize
-wn = WordNet("data/wordnet_database/", "src/pointers/noun_pointers.txt", "src/pointers/adj_pointers.txt", "src/pointers/verb_pointers.txt", "src/pointers/adv_pointers.txt")
+wn = WordNet.from_snapshot("extracted_data/wordnet.snapshot", "data/wordnet_database/", "src/pointers/noun_pointers.txt", "src/pointers/adj_pointers.txt", "src/pointers/verb_pointers.txt", "src/pointers/adv_pointers.txt")
 glosses = wn.collect_glosses()
 
 if use_test_gloss_portion:
@@ -92,7 +98,7 @@ for excl in excluded_synsets:
 
 # disambiguating the glosses or read already disambiguated glosses
 if new_disambiguation:
-	gd = GlossDisambiguator(glosses, ["data/wordnet_glosstags/adv.xml", "data/wordnet_glosstags/verb.xml", "data/wordnet_glosstags/noun.xml", "data/wordnet_glosstags/adj.xml"], wn)
+	gd = GlossDisambiguator(glosses, ["data/wordnet_glosstags/adv.xml", "data/wordnet_glosstags/verb.xml", "data/wordnet_glosstags/noun.xml", "data/wordnet_glosstags/adj.xml"], wn, workers=arguments.workers, token_store_dir="extracted_data/", mfs_table_path="extracted_data/glosstag_lemmas.mfs")
 	disambiguated_glosses = gd.disambiguate_glosses()
 
 	print("...writing glosses")
@@ -139,5 +145,7 @@ re.get_extracted_relations_stats(relations)
 
 with open("extracted_data/relations{0}.rel".format(file_extension), "wb") as f:
 	pickle.dump(relations, f, protocol=2)
+# the overlay contains the same relations with resolved synset ids, it is integrated much faster when loading a WordNet
+wn.write_relation_overlay(relations, "extracted_data/relations{0}.ovl".format(file_extension))
 
 print("\n\nDone.")
@@ -10,31 +10,89 @@ sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), "..
 
 import re
 import itertools
-
-from src.util import get_ss_type_from_sense_key, add_key
+import json
+import hashlib
+import pickle
+import struct
+import gc
+import mmap
+import bisect
+import functools
+import atexit
+import gzip
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from xml.etree import ElementTree
+
+try:
+	from collections.abc import Mapping
+except ImportError:
+	from collections import Mapping
+
+from src.util import get_ss_type_from_sense_key, add_key, intern_string, set_slot_state, LRUCache
 from src.glosses.Glosses import Gloss
 import src.constants as CONSTANTS
 
+SNAPSHOT_MAGIC = b"EHWONSNP"
+SNAPSHOT_VERSION = 6
+SHARED_STORE_MAGIC = b"EHWONSHM"
+SHARED_STORE_VERSION = 5
+SHARED_STORE_HEADER_SPACE = 1 << 16
+OVERLAY_MAGIC = b"EHWONOVL"
+OVERLAY_VERSION = 1
+OVERLAY_ARRAYS = ["sources", "source_indptr", "entry_relation", "entry_indptr", "members"]
+
+# query methods whose results depend on the relations of the synsets, their caches are cleared when relations change
+RELATION_DEPENDENT_QUERIES = ["get_hypernym_synsets", "get_similar_adjectives"]
+_MISSING = object()
+
+# patterns of the ids and metadata attributes of WN-LMF files
+LMF_SYNSET_ID = re.compile(r"(\d{8})-([nvars])$")
+LMF_SENSE_ID_ESCAPE = re.compile(r"--|-(" + "|".join(CONSTANTS.LMF_SENSE_ID_ESCAPES) + r")-")
+DC_IDENTIFIER = "{http://purl.org/dc/elements/1.1/}identifier"
+
+def cached_query(method):
+	"""Decorator that memoises a query method of the WordNet in its query cache, if the cache is enabled.
+	Lists and sets are copied when they are returned, so callers cant modify the cached results."""
+	@functools.wraps(method)
+	def cached_method(self, *args, **kwargs):
+		if self._query_caches is None:
+			return method(self, *args, **kwargs)
+
+		cache = self._query_caches[method.__name__]
+		key = (args, tuple(sorted(kwargs.items()))) if kwargs else args
+		result = cache.get(key, _MISSING)
+		if result is _MISSING:
+			result = method(self, *args, **kwargs)
+			cache.put(key, result)
+
+		return type(result)(result) if isinstance(result, (list, set)) else result
+
+	return cached_method
+
 class WordNet(object):
-	"""Allows interaction with a WordNet Database. Loads all database files into an representation that allows
-	easy interaction with the Synsets and their relations as well as providing methods to extend the relations
+	"""Allows interaction with a WordNet Database. Loads all database files (or a WN-LMF XML file) into an representation
+	that allows easy interaction with the Synsets and their relations as well as providing methods to extend the relations
 	between different Synsets.
 
 	Attributes:
-		lemmas		(dict)		lemmas of all words in WordNet as keys with a dictionary as value containing
-								a field for each wordclass (noun, verb, adverb, adjective), each of which
-								themselves contain a dictionary with the following values:
+		lemmas		(dict)		a LemmaIndex for each wordclass (noun, verb, adverb, adjective), mapping the lemmas of the
+								word class to a dictionary with the following values (counts are integers):
 									"pos": the part of speech this lemma is interpreted as (n/v/a/r)
 									"synset_cnt": the amount of synsets the lemma is in for this word class
 									"p_cnt": the amount of different pointers the lemma has in all synsets its in
 									"ptr_symbol": the different pointers that the lemma has in all synsets its in
 									"sense_cnt": the amount of different senses that exist for this lemma in the word class
 									"synset_offsets": list of the offsets for the synsets in the data file that contain this lemma
-		sense_keys	(dict)		sense keys as keys and a dict with the following fields as value:
+		sense_keys	(SenseIndex)	sense keys as keys and a dict with the following fields as value (numbers are integers):
 									"synset_offset": the offset of the synset that this sense belongs to in the data file
 									"sense_number": the number of that the sense in relation to the lemma, starting at 1
 									"tag_cnt": frequency of the sense in a corpus
-		synsets		(dict)		synset ids (pos+offset) as keys and a Synset Object for that id as value
+		synsets		(dict)		synset ids (pos+offset) as keys and a Synset Object for that id as value; in lazy mode
+								a LazySynsetTable that reads and caches the synsets from the data files on access
+		exceptions	(dict)		word classes as keys, dicts of irregular inflected forms and their base forms as values,
+								read from the optional [wordclass].exc files
 
 	Public Methods:
 		collect_glosses			(dict):		get all glosses from all synsets and create Gloss Objects for them
@@ -42,18 +100,44 @@ class WordNet(object):
 		synset_from_key			(Synset):	get the synset object for that sense key
 		synsets_from_lemma		(list):		get a list of Synsets that contain the given lemma
 		synset_id_from_key		(string):	get the synset id of the synset that sense key belongs to
+		morphy					(list):		get the base forms of an inflected word form that exist in a word class
+		lemmatize				(string):	get the shortest base form of an inflected word form, the form itself if there is none
 		get_hypernym_synsets 	(list):		get a list of synsets for the hypernyms of the given synset
+		get_similar_adjectives	(set):		get the adjectives similar to the given adjective synset up to two steps away
+		get_relation_sources	(list):		get the synsets that have a relation to the given synset (inverse relation lookup)
+		synsets_for_lemmas		(list):		batch variant of synsets_for_lemma, aligned with the given lemmas
+		synset_ids_from_keys	(list):		batch variant of synset_id_from_key, aligned with the given sense keys
+		hypernyms_many			(list):		batch variant of get_hypernym_synsets, aligned with the given synsets
+		graph					(RelationGraph):	get the integer id (CSR) adjacency representation of a relation
+		is_hypernym_of			(bool):		check if a synset is a (transitive) hypernym of another synset
+		ancestors				(list):		get the hypernym ancestors and their distances for a list of synsets
+		ancestor_index			(AncestorIndex):	get the precomputed ancestors of all synsets over hypernymy relations
+		enable_query_cache		(None):		memoise the results of the query methods in size bounded caches
+		cache_stats				(dict):		get hit, miss and eviction statistics of the query caches
+		print_cache_stats		(None):		print the statistics of the query caches
+		build_snapshot			(None):		write the loaded WordNet into a binary snapshot file
+		from_snapshot			(WordNet):	load a WordNet from a snapshot file, rebuilding it if the sources changed
+		build_shared_store		(None):		write the loaded WordNet into a store file that SharedWordNet maps read-only
+		write_relation_overlay	(None):		write extracted relations with resolved synset ids into a relation overlay file
 	"""
 
 
-	def __init__(self, wordnet_dir, noun_pointers, adj_pointers, verb_pointers, adv_pointers, relations_filename=None):
+	def __init__(self, wordnet_dir, noun_pointers, adj_pointers, verb_pointers, adv_pointers, relations_filename=None, lazy=False, workers=None, keep_glosses=True):
 		"""
 		Initialize and load the WordNet Interface.
 
 		Arguments:
-			wordnet_dir				(string)	the path to the directory where the wordnet database files can be found
+			wordnet_dir				(string)	the path to the directory where the wordnet database files can be found, or the
+												path of a WN-LMF XML file (e.g. Open English WordNet, optionally gzipped)
 			[wordclass]_pointers	(string)	paths to the pointer files
-			relations_filename		(string)	the path to an optional byte file containing additional relations that will be loaded into the WordNet
+			relations_filename		(string)	the path to an optional byte file containing additional relations that will be loaded into the WordNet,
+												either a pickled relations dict or a relation overlay; a list of paths stacks
+												the relations of all files in the given order
+			lazy					(bool)		if True the data files are memory-mapped and synsets are only parsed when they are requested
+			workers					(int)		number of processes that parse the files of the word classes in parallel, None
+												or 1 to parse them one after another
+			keep_glosses			(bool)		if False the gloss texts are not kept in memory, synsets read their gloss from
+												the data file whenever it is requested
 		"""
 		self.__dict__.update(locals())
 		del self.__dict__["self"]
@@ -68,16 +152,207 @@ class WordNet(object):
 		}
 
 		self.possible_pointers = list(set([item for sublist in list(self.pointers.values()) for item in sublist]))
-
-		self.lemmas, self.synsets, self.sense_keys = self._load_wordnet(self.wordnet_dir)
-
-		if relations_filename:
-			self._integrate_relations_from_file(relations_filename)
+		if os.path.isfile(wordnet_dir) and (lazy or not keep_glosses):
+			raise ValueError("WN-LMF files are always parsed completely, lazy loading and keep_glosses=False require the database files.")
+		self._gloss_sources = None if keep_glosses else {wordclass: GlossSource(os.path.join(wordnet_dir, "data." + wordclass)) for wordclass in self.wordclasses}
+
+		self._init_transient_state()
+		# loading creates millions of small objects that all stay alive, garbage collection runs would be wasted
+		gc.disable()
+		try:
+			self.lemmas, self.synsets, self.sense_keys = self._load_wordnet(self.wordnet_dir)
+			self.exceptions = self._load_exception_files(self.wordnet_dir)
+		finally:
+			gc.enable()
+
+		for filename in self._relation_filenames(relations_filename):
+			self._integrate_relations_from_file(filename)
+
+		# lazy WordNets would have to parse every synset, they index the inverse relations on first request
+		if not self.lazy:
+			self._inverse_relation_index()
 
 		print("finished loading...")
 
 	### PUBLIC ###
 
+	def build_snapshot(self, path):
+		"""Serialise the fully loaded WordNet (lemmas, synsets, sense keys and integrated relations) into a
+		versioned binary snapshot file that can be loaded much faster than the database files.
+
+		The file consists of a magic string, the snapshot version, a json header and a pickled payload. The header
+		stores the constructor arguments, a fingerprint of all source files and the sha256 checksum of the payload.
+
+		Arguments:
+			path	(string)	the path the snapshot will be written to
+		"""
+		print("...writing snapshot")
+		payload = pickle.dumps(self._snapshot_state(), protocol=pickle.HIGHEST_PROTOCOL)
+		header = json.dumps({
+			"version": SNAPSHOT_VERSION,
+			"checksum": hashlib.sha256(payload).hexdigest(),
+			"arguments": self._snapshot_arguments(),
+			"sources": self._fingerprint_sources(self._snapshot_arguments())
+		}).encode("utf-8")
+
+		# write to a temporary file first so that concurrent readers never see a partial snapshot
+		tmp_path = "{0}.{1}.tmp".format(path, os.getpid())
+		with open(tmp_path, "wb") as f:
+			f.write(SNAPSHOT_MAGIC)
+			f.write(struct.pack("<II", SNAPSHOT_VERSION, len(header)))
+			f.write(header)
+			f.write(payload)
+		os.replace(tmp_path, path)
+
+	@classmethod
+	def from_snapshot(cls, path, *args, **kwargs):
+		"""Load a WordNet from a snapshot file created by build_snapshot. If the snapshot does not exist, is from an
+		older snapshot version, fails the checksum validation or any of its source files changed, the WordNet is
+		loaded from the database files instead and the snapshot is rebuilt.
+
+		Arguments:
+			path		(string)	the path of the snapshot file
+			*args		()			optional constructor arguments of WordNet used for (re)building the snapshot,
+									if omitted the arguments stored in the snapshot are used
+
+		Returns:
+			(WordNet):	the loaded WordNet
+		"""
+		print("=== Loading WordNet Snapshot... ===")
+		header, payload = cls._read_snapshot(path)
+		arguments = cls._constructor_arguments(*args, **kwargs) if (args or kwargs) else (header or {}).get("arguments")
+
+		if header is not None and payload is not None and cls._same_content(arguments, header["arguments"]) and cls._sources_unchanged(header["sources"], arguments):
+			wordnet = cls.__new__(cls)
+			# the payload consists of a huge number of small objects, garbage collection runs while unpickling them are wasted
+			gc.disable()
+			try:
+				wordnet.__dict__.update(pickle.loads(payload))
+			finally:
+				gc.enable()
+			wordnet._init_transient_state()
+			if not wordnet.lazy:
+				wordnet._inverse_relation_index()
+			print("...finished")
+			return wordnet
+
+		if arguments is None:
+			raise ValueError("The snapshot {0} is not usable and no arguments to rebuild it were provided.".format(path))
+
+		print("...snapshot missing or outdated, rebuilding")
+		wordnet = cls(**arguments)
+		wordnet.build_snapshot(path)
+		return wordnet
+
+	def build_shared_store(self, path):
+		"""Write the loaded WordNet into a store file that can be attached by any number of processes with SharedWordNet.
+		Lemmas, exception lists, sense keys, synsets and the inverse relations are written as sorted tables of pickled values, so they
+		can be looked up in the memory-mapped file without loading it.
+
+		The file consists of a magic string, the store version, a json header and the tables. The header stores the
+		constructor arguments, a fingerprint of all source files, the remaining attributes of the WordNet and the
+		positions of the tables.
+
+		Arguments:
+			path	(string)	the path the store will be written to
+		"""
+		print("...writing shared store")
+		state = self._snapshot_state()
+		attributes = {attribute: value for attribute, value in state.items() if attribute not in ["lemmas", "synsets", "sense_keys", "exceptions", "_gloss_sources"]}
+
+		# write to a temporary file first so that attached processes never see a partial store
+		tmp_path = "{0}.{1}.tmp".format(path, os.getpid())
+		with open(tmp_path, "wb") as f:
+			tables = {}
+			f.write(b"\0" * SHARED_STORE_HEADER_SPACE)
+			for wordclass in self.wordclasses:
+				tables["lemmas." + wordclass] = MappedTable.write(f, state["lemmas"][wordclass].items())
+				tables["exceptions." + wordclass] = MappedTable.write(f, state["exceptions"][wordclass].items())
+			tables["sense_keys"] = MappedTable.write(f, state["sense_keys"].items())
+			tables["synsets"] = MappedTable.write(f, state["synsets"].items())
+			tables["inverse_relations"] = MappedTable.write(f, self._inverse_relation_index().items())
+
+			header = json.dumps({
+				"version": SHARED_STORE_VERSION,
+				"arguments": self._snapshot_arguments(),
+				"sources": self._fingerprint_sources(self._snapshot_arguments()),
+				"attributes": attributes,
+				"tables": tables
+			}).encode("utf-8")
+			if len(SHARED_STORE_MAGIC) + 8 + len(header) > SHARED_STORE_HEADER_SPACE:
+				raise ValueError("The header of the shared store doesnt fit into {0} bytes.".format(SHARED_STORE_HEADER_SPACE))
+
+			f.seek(0)
+			f.write(SHARED_STORE_MAGIC)
+			f.write(struct.pack("<II", SHARED_STORE_VERSION, len(header)))
+			f.write(header)
+		os.replace(tmp_path, path)
+
+	def write_relation_overlay(self, relations, path):
+		"""Write relations extracted by the RelationExtractor into a relation overlay file, which can be loaded much
+		faster than the pickled relations as all sense keys are already resolved to synset ids.
+
+		The file consists of a magic string, the overlay version, a json header and arrays of unsigned 32 bit integers
+		(little endian). The header contains the table of synset ids, the table of relation names, the relations whose
+		members are tuples and the lengths of the arrays. The arrays are:
+			sources			index (into the synset id table) of every synset that has new relations
+			source_indptr	start of the entries of each source in the entry arrays, one more than sources
+			entry_relation	index (into the relation name table) of the relation of each entry
+			entry_indptr	start of the members of each entry in members, one more than entries
+			members			indices (into the synset id table) of the members of all entries
+
+		Arguments:
+			relations	(dict)		synset ids as keys, dicts of relation names and lists of sense keys (or tuples of them) as values
+			path		(string)	the path the overlay will be written to
+		"""
+		print("...writing relation overlay")
+		synset_ids = {}
+		relation_names = {}
+		tuple_relations = set()
+		arrays = {name: array("I") for name in OVERLAY_ARRAYS}
+		arrays["source_indptr"].append(0)
+		arrays["entry_indptr"].append(0)
+		unresolved = 0
+
+		for source_id in sorted(relations):
+			arrays["sources"].append(synset_ids.setdefault(source_id, len(synset_ids)))
+			for relation_name, members in relations[source_id].items():
+				for member in members:
+					try:
+						member_ids = [self.synset_id_from_key(key) for key in (member if isinstance(member, (tuple, list)) else [member])]
+					except AttributeError:
+						unresolved += 1
+						continue
+
+					if isinstance(member, (tuple, list)):
+						tuple_relations.add(relation_name)
+					arrays["entry_relation"].append(relation_names.setdefault(relation_name, len(relation_names)))
+					arrays["members"].extend(synset_ids.setdefault(member_id, len(synset_ids)) for member_id in member_ids)
+					arrays["entry_indptr"].append(len(arrays["members"]))
+			arrays["source_indptr"].append(len(arrays["entry_relation"]))
+
+		if unresolved:
+			print("WARNING: skipped {0} relation members with unknown sense keys".format(unresolved))
+
+		header = json.dumps({
+			"version": OVERLAY_VERSION,
+			"synset_ids": sorted(synset_ids, key=synset_ids.get),
+			"relations": sorted(relation_names, key=relation_names.get),
+			"tuple_relations": sorted(tuple_relations),
+			"lengths": {name: len(values) for name, values in arrays.items()}
+		}).encode("utf-8")
+
+		tmp_path = "{0}.{1}.tmp".format(path, os.getpid())
+		with open(tmp_path, "wb") as f:
+			f.write(OVERLAY_MAGIC)
+			f.write(struct.pack("<II", OVERLAY_VERSION, len(header)))
+			f.write(header)
+			for name in OVERLAY_ARRAYS:
+				if sys.byteorder == "big":
+					arrays[name].byteswap()
+				f.write(arrays[name].tobytes())
+		os.replace(tmp_path, path)
+
 	def collect_glosses(self):
 		"""Collect the glosses of all Synsets and create new gloss objects from them,
 		stored in a dictionary using the glosses synset ids as keys.
@@ -109,8 +384,9 @@ class WordNet(object):
 
 	def synset_from_id(self, synset_id):
 		"""From a synset id get the according synset."""
-		if synset_id in self.synsets:
-			return self.synsets[synset_id]
+		synset = self.synsets.get(synset_id)
+		if synset is not None:
+			return synset
 		elif synset_id[0] == "a" and "s"+synset_id[1:] in self.synsets:
 			return self.synsets["s"+synset_id[1:]]
 		elif synset_id[0] == "s" and "a"+synset_id[1:] in self.synsets:
@@ -118,10 +394,46 @@ class WordNet(object):
 		else:
 			raise ValueError("The synset id {0} doesnt exist in this database.".format(synset_id))
 
+	def enable_query_cache(self, maxsize=100000, report_at_exit=False):
+		"""Memoise the results of synsets_for_lemma, synset_id_from_key, morphy, lemmatize, get_hypernym_synsets and
+		get_similar_adjectives in least recently used caches. The caches of relation dependent queries are cleared when relations change.
+
+		Arguments:
+			maxsize			(int)	the maximal number of results stored per query method
+			report_at_exit	(bool)	if True the cache statistics are printed when the interpreter exits
+		"""
+		self._query_caches = {name: LRUCache(maxsize) for name in ["synsets_for_lemma", "synset_id_from_key", "morphy", "lemmatize"] + RELATION_DEPENDENT_QUERIES}
+		if report_at_exit:
+			atexit.register(self.print_cache_stats)
+
+	def cache_stats(self):
+		"""Get the statistics of the query caches.
+
+		Returns:
+			(dict):	query method names as keys, dicts with hits, misses, evictions, size and maxsize as values
+		"""
+		if self._query_caches is None:
+			return {}
+		return {name: cache.stats() for name, cache in self._query_caches.items()}
+
+	def print_cache_stats(self):
+		"""Print the statistics of the query caches."""
+		print("=== WordNet Query Cache ===")
+		if self._query_caches is None:
+			print("caching is disabled")
+			return
+
+		print("{0:<26}{1:>10}{2:>10}{3:>11}{4:>10}{5:>10}".format("query", "hits", "misses", "evictions", "size", "hit rate"))
+		for name, stats in sorted(self.cache_stats().items()):
+			lookups = stats["hits"] + stats["misses"]
+			hit_rate = 100.0 * stats["hits"] / lookups if lookups else 0.0
+			print("{0:<26}{1:>10}{2:>10}{3:>11}{4:>10}{5:>9.1f}%".format(name, stats["hits"], stats["misses"], stats["evictions"], stats["size"], hit_rate))
+
 	def synset_from_key(self, sense_key):
 		"""From a sense key get the according synset."""
 		return self.synset_from_id(self.synset_id_from_key(sense_key))
 
+	@cached_query
 	def synset_id_from_key(self, sense_key):
 		"""From a sense key get the according synset."""
 		ss_type = get_ss_type_from_sense_key(sense_key)
@@ -132,6 +444,7 @@ class WordNet(object):
 
 		return ss_type + self.sense_keys[sense_key]["synset_offset"]
 
+	@cached_query
 	def synsets_for_lemma(self, lemma, wordclass):
 		"""Return a list of Synset Objects that can represent this lemma."""
 		synsets = []
@@ -145,32 +458,449 @@ class WordNet(object):
 
 		return synsets
 
+	@cached_query
+	def morphy(self, form, wordclass):
+		"""Get the base forms of a word form that are lemmas of the word class, using the morphy algorithm of WordNet:
+		irregular forms are looked up in the exception lists, otherwise inflectional suffixes are detached until
+		forms are found in the lemma index.
+
+		Arguments:
+			form		(string)	the (inflected) word form, e.g. "dogs"
+			wordclass	(string)	the word class the form is interpreted as (noun, verb, adj or adv)
+
+		Returns:
+			(list):	the base forms found in the lemma index, empty if there are none
+		"""
+		lemmas = self.lemmas[wordclass]
+		substitutions = CONSTANTS.MORPHOLOGICAL_SUBSTITUTIONS[wordclass]
+
+		def apply_rules(forms):
+			return [f[:-len(old)] + new for f in forms for old, new in substitutions if f.endswith(old)]
+
+		def filter_forms(forms):
+			found = []
+			for f in forms:
+				if f in lemmas and f not in found:
+					found.append(f)
+			return found
+
+		exceptions = self.exceptions[wordclass]
+		if form in exceptions:
+			return filter_forms([form] + exceptions[form])
+
+		forms = apply_rules([form])
+		found = filter_forms([form] + forms)
+		while forms and not found:
+			forms = apply_rules(forms)
+			found = filter_forms(forms)
+
+		return found
+
+	@cached_query
+	def lemmatize(self, form, wordclass="noun"):
+		"""Get the shortest base form of a word form in the word class (see morphy), the form itself if there is none."""
+		base_forms = self.morphy(form, wordclass)
+		return min(base_forms, key=len) if base_forms else form
+
+	@cached_query
 	def get_hypernym_synsets(self, synset, traversal_depth=1):
 		"""For a given Synset return a list of Synsets that are its hypernyms, traversing an optionally expanded depth through the inheritance tree."""
 		if traversal_depth == 0:
 			return []
 
-		if "hypernym" in synset.relations:
-			hypernym_ids = synset.relations["hypernym"]
-			return [self.synset_from_id(syn_id) for syn_id in hypernym_ids] + list(itertools.chain(*[self.get_hypernym_synsets(self.synset_from_id(syn_id_2), traversal_depth=traversal_depth-1) for syn_id_2 in hypernym_ids]))
+		# lazy WordNets would have to parse every synset to build the graph, so they follow the synsets relations instead
+		if self.lazy:
+			if "hypernym" in synset.relations:
+				hypernym_ids = synset.relations["hypernym"]
+				return [self.synset_from_id(syn_id) for syn_id in hypernym_ids] + list(itertools.chain(*[self.get_hypernym_synsets(self.synset_from_id(syn_id_2), traversal_depth=traversal_depth-1) for syn_id_2 in hypernym_ids]))
+			return []
+
+		graph = self.graph("hypernym")
 
-		return []
+		def expand(node, depth):
+			if depth == 0:
+				return []
+			hypernyms = graph.neighbours(node)
+			return list(hypernyms) + list(itertools.chain(*[expand(hypernym, depth-1) for hypernym in hypernyms]))
 
+		return [self.synsets[graph.synset_ids[node]] for node in expand(graph.number(synset.synset_id), traversal_depth)]
+
+	@cached_query
 	def get_similar_adjectives(self, synset):
 		"""Get similar adjectives of the snyset."""
 		if synset.ss_type not in "as":
 			raise TypeError("Can't search for similar adjectives of a {0}.".format(synset.ss_type))
 
-		if "similar_to" in synset.relations.keys():
-			first_level = [self.synset_from_id(syn_id) for syn_id in synset.relations["similar_to"]]
-			return set([self.synset_from_id(syn) for syn in itertools.chain(*[syn.relations["similar_to"] for syn in first_level if "similar_to" in syn.relations])] + first_level)
-		return []
+		if self.lazy:
+			if "similar_to" in synset.relations.keys():
+				first_level = [self.synset_from_id(syn_id) for syn_id in synset.relations["similar_to"]]
+				return set([self.synset_from_id(syn) for syn in itertools.chain(*[syn.relations["similar_to"] for syn in first_level if "similar_to" in syn.relations])] + first_level)
+			return []
+
+		graph = self.graph("similar_to")
+		first_level = graph.neighbours(graph.number(synset.synset_id))
+		if not first_level:
+			return []
+
+		second_level = itertools.chain(*[graph.neighbours(node) for node in first_level])
+		return set([self.synsets[graph.synset_ids[node]] for node in itertools.chain(first_level, second_level)])
+
+	def synsets_for_lemmas(self, lemmas, wordclass):
+		"""Get the synsets of many lemmas of a word class at once. Every distinct lemma is looked up once.
+
+		Arguments:
+			lemmas		(iterable)	the lemmas, may contain duplicates
+			wordclass	(string)	the word class of all lemmas
+
+		Returns:
+			(list):	a list of Synset Objects for every lemma, in the order of the lemmas
+		"""
+		lemmas = list(lemmas)
+		index = self.lemmas[wordclass]
+		if not isinstance(index, LemmaIndex) or not isinstance(self.synsets, dict):
+			found = {lemma: self.synsets_for_lemma(lemma, wordclass) for lemma in set(lemmas)}
+			return [list(found[lemma]) for lemma in lemmas]
+
+		# the offset columns are read directly instead of creating the entry dict of every lemma
+		ss_type = CONSTANTS.WORDCLASS_SS_TYPE_MAPPING[wordclass]
+		synsets = self.synsets
+		found = {}
+		for lemma in set(lemmas):
+			lemma_synsets = []
+			lemma_id = index.ids.get(lemma)
+			if lemma_id is not None:
+				for offset in index.synset_offsets[index.offsets_indptr[lemma_id]:index.offsets_indptr[lemma_id+1]]:
+					offset = format_offset(offset)
+					synset = synsets.get(ss_type + offset)
+					if synset is None and ss_type == "a":
+						synset = synsets.get("s" + offset)
+					if synset is not None:
+						lemma_synsets.append(synset)
+			found[lemma] = lemma_synsets
+
+		return [list(found[lemma]) for lemma in lemmas]
+
+	def synset_ids_from_keys(self, sense_keys):
+		"""Get the synset ids of many sense keys at once. Every distinct sense key is resolved once.
+
+		Arguments:
+			sense_keys	(iterable)	the sense keys, may contain duplicates
+
+		Returns:
+			(list):	the synset id of every sense key, in the order of the sense keys
+		"""
+		sense_keys = list(sense_keys)
+		if not isinstance(self.sense_keys, SenseIndex):
+			found = {sense_key: self.synset_id_from_key(sense_key) for sense_key in set(sense_keys)}
+			return [found[sense_key] for sense_key in sense_keys]
+
+		ids = self.sense_keys.ids
+		offsets = self.sense_keys.synset_offsets
+		found = {}
+		for sense_key in set(sense_keys):
+			ss_type = get_ss_type_from_sense_key(sense_key)
+			sense_id = ids.get(sense_key)
+			if sense_id is None and ss_type == "a":
+				sense_id = ids.get(re.sub(r"(%)3(:)", "\g<1>5\g<2>", sense_key))
+			if sense_id is None:
+				raise AttributeError("Key {0} doesnt exist!".format(sense_key))
+			found[sense_key] = ss_type + format_offset(offsets[sense_id])
+
+		return [found[sense_key] for sense_key in sense_keys]
+
+	def hypernyms_many(self, synsets, depth=1):
+		"""Get the hypernyms of many synsets at once, like get_hypernym_synsets with traversal_depth=depth. The
+		hypernyms of every distinct synset are expanded once and shared ancestors only once per depth.
+
+		Arguments:
+			synsets		(iterable)	the synsets, may contain duplicates
+			depth		(int)		the number of steps up the inheritance tree
+
+		Returns:
+			(list):	a list of hypernym synsets for every synset, in the order of the synsets
+		"""
+		synsets = list(synsets)
+		if self.lazy:
+			found = {synset.synset_id: self.get_hypernym_synsets(synset, traversal_depth=depth) for synset in synsets}
+			return [list(found[synset.synset_id]) for synset in synsets]
+
+		graph = self.graph("hypernym")
+		expansions = {}
+
+		def expand(node, remaining):
+			if remaining == 0:
+				return []
+			if (node, remaining) not in expansions:
+				hypernyms = graph.neighbours(node)
+				expansions[(node, remaining)] = list(hypernyms) + list(itertools.chain(*[expand(hypernym, remaining-1) for hypernym in hypernyms]))
+			return expansions[(node, remaining)]
+
+		found = {}
+		for synset in synsets:
+			if synset.synset_id not in found:
+				found[synset.synset_id] = [self.synsets[graph.synset_ids[node]] for node in expand(graph.number(synset.synset_id), depth)]
+
+		return [list(found[synset.synset_id]) for synset in synsets]
+
+	def get_relation_sources(self, synset, relation):
+		"""Get the synsets that have the given relation to a synset, e.g. the nouns that have a verb as their function
+		or the nouns that are described by an adjective. For relations with tuples as members (e.g. specifications)
+		a synset is found by every synset of the tuple.
+
+		Arguments:
+			synset		(Synset)	the target of the relation
+			relation	(string)	the name of any relation, a WordNet pointer or an integrated relation
+
+		Returns:
+			(list):	the synsets holding the relation with the synset
+		"""
+		inverse_relations = self._inverse_relation_index().get(self._inverse_relation_key(synset.synset_id))
+		if not inverse_relations:
+			return []
+		return [self.synset_from_id(source_id) for source_id in inverse_relations.get(relation, [])]
+
+	def is_hypernym_of(self, hypernym, synset, max_depth=None):
+		"""Check whether a synset is a hypernym of another synset, at most max_depth steps up the inheritance tree.
+
+		Arguments:
+			hypernym	(Synset)	the potential hypernym
+			synset		(Synset)	the synset whose ancestors are searched
+			max_depth	(int)		the maximal distance between both synsets, None for no limit
+
+		Returns:
+			(bool):	True if hypernym is an ancestor of synset within max_depth
+		"""
+		if self.lazy:
+			distance = self._ancestor_distances_from_relations(synset, max_depth).get(hypernym.synset_id)
+		else:
+			index = self.ancestor_index()
+			distance = index.distance(index.graph.number(synset.synset_id), index.graph.number(hypernym.synset_id))
+
+		return distance is not None and (max_depth is None or distance <= max_depth)
+
+	def ancestors(self, synsets, max_depth=None):
+		"""Get the hypernym ancestors of multiple synsets together with their minimal distance.
+
+		Arguments:
+			synsets		(list)		the synsets to get the ancestors for
+			max_depth	(int)		the maximal distance of the ancestors, None for no limit
+
+		Returns:
+			(list):	for each synset a dict with its ancestor synsets as keys and their distance as values
+		"""
+		ancestors = []
+		for synset in synsets:
+			if self.lazy:
+				distances = self._ancestor_distances_from_relations(synset, max_depth)
+				ancestors.append({self.synset_from_id(synset_id): distance for synset_id, distance in distances.items()})
+			else:
+				index = self.ancestor_index()
+				ancestors.append({self.synsets[index.graph.synset_ids[node]]: distance for node, distance in index.ancestors(index.graph.number(synset.synset_id), max_depth)})
+
+		return ancestors
+
+	def ancestor_index(self, relations=("hypernym",)):
+		"""Get the ancestor index over the given hypernymy relations, building it on first request.
+
+		Arguments:
+			relations	(tuple)		names of the relations leading to the ancestors, e.g. ("hypernym", "instance_hypernym")
+
+		Returns:
+			(AncestorIndex):	the index of ancestors, distances and depths
+		"""
+		if relations not in self._ancestor_indices:
+			print("...indexing ancestors")
+			self._ancestor_indices[relations] = AncestorIndex.from_graphs([self.graph(relation) for relation in relations])
+		return self._ancestor_indices[relations]
+
+	def graph(self, relation):
+		"""Get the adjacency structure of a relation over dense integer synset ids. The graph is built on first
+		request and rebuilt after relations were changed.
+
+		Arguments:
+			relation	(string)	name of a binary relation, e.g. "hypernym" or "function"
+
+		Returns:
+			(RelationGraph):	the CSR representation of the relation
+		"""
+		if relation not in self._graphs:
+			if self._synset_numbering is None:
+				self._synset_numbering = self._number_synsets()
+			self._graphs[relation] = RelationGraph.from_synsets(relation, self.synsets, *self._synset_numbering)
+
+		return self._graphs[relation]
 
 	### PROTECTED ###
 
+	def _init_transient_state(self):
+		"""Initialize the derived structures that are built on demand and therefore not stored in snapshots."""
+		self._graphs = {}
+		self._synset_numbering = None
+		self._ancestor_indices = {}
+		self._inverse_relations = None
+		self._query_caches = None
+
+	def _relations_changed(self):
+		"""Discard all structures derived from the relations of the synsets after they were modified."""
+		self._graphs = {}
+		self._ancestor_indices = {}
+		self._inverse_relations = None
+		if self._query_caches is not None:
+			for name in RELATION_DEPENDENT_QUERIES:
+				self._query_caches[name].clear()
+
+	def _inverse_relation_index(self):
+		"""Get the inverse relations of all synsets, building them on first request and after relations were changed.
+
+		Returns:
+			(dict):	inverse relation keys of the relation members as keys, dicts of relation names and lists of the ids of
+					the synsets holding that relation with the member as values
+		"""
+		if self._inverse_relations is None:
+			print("...indexing inverse relations")
+			index = {}
+			for synset_id, synset in self.synsets.items():
+				for relation, members in synset.relations.items():
+					for member in members:
+						for member_id in (member if isinstance(member, tuple) else (member,)):
+							sources = index.setdefault(self._inverse_relation_key(member_id), {}).setdefault(relation, [])
+							if not sources or sources[-1] != synset_id:
+								sources.append(synset_id)
+			self._inverse_relations = index
+
+		return self._inverse_relations
+
+	@staticmethod
+	def _inverse_relation_key(synset_id):
+		"""Get the key of a synset in the inverse relations. Relations resolved from sense keys may refer to adjective
+		satellites by an 'a' id, so both adjective ss_types share the 'a' key."""
+		return "a" + synset_id[1:] if synset_id[0] == "s" else synset_id
+
+	def _ancestor_distances_from_relations(self, synset, max_depth=None, relations=("hypernym",)):
+		"""Breadth first search for the ancestors of a synset and their minimal distance, following the synsets relations.
+
+		Returns:
+			(dict):	ids of the ancestors as keys, distances as values
+		"""
+		distances = {}
+		frontier = [synset]
+		depth = 0
+		while frontier and (max_depth is None or depth < max_depth):
+			depth += 1
+			next_frontier = []
+			for current in frontier:
+				for relation in relations:
+					for ancestor_id in current.relations.get(relation, ()):
+						ancestor = self.synset_from_id(ancestor_id)
+						if ancestor.synset_id not in distances:
+							distances[ancestor.synset_id] = depth
+							next_frontier.append(ancestor)
+			frontier = next_frontier
+
+		return distances
+
+	def _number_synsets(self):
+		"""Assign a dense integer id to every synset. Adjective heads and satellites share one offset space, so the
+		number of a satellite is also registered under its 'a' id (and vice versa), resolving the a/s ambiguity of
+		ids created from sense keys once.
+
+		Returns:
+			(tuple):	list of synset ids indexed by their number, dict of synset ids and their numbers
+		"""
+		synset_ids = sorted(self.synsets)
+		numbers = {synset_id: number for number, synset_id in enumerate(synset_ids)}
+		for number, synset_id in enumerate(synset_ids):
+			if synset_id[0] in "as":
+				alternative_id = ("s" if synset_id[0] == "a" else "a") + synset_id[1:]
+				if alternative_id not in numbers:
+					numbers[alternative_id] = number
+
+		return synset_ids, numbers
+
+	@classmethod
+	def _constructor_arguments(cls, wordnet_dir, noun_pointers, adj_pointers, verb_pointers, adv_pointers, relations_filename=None, lazy=False, workers=None, keep_glosses=True):
+		"""Bind positional and keyword constructor arguments to a dict of argument names and values."""
+		arguments = dict(locals())
+		del arguments["cls"]
+		# lists of relation files are stored as json, where tuples become lists
+		if isinstance(relations_filename, tuple):
+			arguments["relations_filename"] = list(relations_filename)
+		return arguments
+
+	@staticmethod
+	def _same_content(arguments, other_arguments):
+		"""Check if two sets of constructor arguments load the same content, arguments only affecting the loading
+		process (the number of workers) are ignored."""
+		def content(a):
+			return {name: value for name, value in a.items() if name != "workers"}
+		return content(arguments) == content(other_arguments)
+
+	def _snapshot_arguments(self):
+		"""Get the constructor arguments this WordNet was created with."""
+		return self._constructor_arguments(self.wordnet_dir, self.noun_pointers, self.adj_pointers, self.verb_pointers, self.adv_pointers, self.relations_filename, self.lazy, getattr(self, "workers", None), getattr(self, "keep_glosses", True))
+
+	def _snapshot_state(self):
+		"""Get the attributes that are stored in a snapshot. Lazy synset tables are materialised completely."""
+		state = {attribute: value for attribute, value in self.__dict__.items() if attribute not in ["_graphs", "_synset_numbering", "_ancestor_indices", "_inverse_relations", "_query_caches"]}
+		if isinstance(self.synsets, LazySynsetTable):
+			state["synsets"] = dict(self.synsets.items())
+			state["lazy"] = False
+		return state
+
+	@staticmethod
+	def _fingerprint_sources(arguments):
+		"""Create a fingerprint (size and modification time) of every source file the WordNet is built from."""
+		sources = []
+		if os.path.isdir(arguments["wordnet_dir"]):
+			sources += [os.path.join(arguments["wordnet_dir"], f) for f in sorted(os.listdir(arguments["wordnet_dir"]))]
+		elif os.path.isfile(arguments["wordnet_dir"]):
+			lmf_dir = os.path.dirname(arguments["wordnet_dir"])
+			sources += [arguments["wordnet_dir"]] + [os.path.join(lmf_dir, wordclass + ".exc") for wordclass in CONSTANTS.WORDCLASS_SS_TYPE_MAPPING]
+		sources += [arguments[name] for name in ["noun_pointers", "adj_pointers", "verb_pointers", "adv_pointers"]]
+		sources += WordNet._relation_filenames(arguments["relations_filename"])
+
+		fingerprint = {}
+		for source in sources:
+			if os.path.isfile(source):
+				stat = os.stat(source)
+				fingerprint[os.path.abspath(source)] = [stat.st_size, stat.st_mtime_ns]
+		return fingerprint
+
+	@classmethod
+	def _sources_unchanged(cls, fingerprint, arguments):
+		"""Check a stored fingerprint against the current source files. Sources that are not available anymore
+		do not invalidate the fingerprint, so snapshots can be shipped without the database files."""
+		current = cls._fingerprint_sources(arguments)
+		return set(current) <= set(fingerprint) and all(current[source] == fingerprint[source] for source in current)
+
+	@staticmethod
+	def _read_snapshot(path):
+		"""Read the header and payload of a snapshot file. The header is None if the file doesnt exist or is not a
+		snapshot of the current version, the payload is None if it fails the checksum validation."""
+		if not os.path.isfile(path):
+			return None, None
+
+		with open(path, "rb") as f:
+			if f.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+				return None, None
+			version, header_length = struct.unpack("<II", f.read(8))
+			if version != SNAPSHOT_VERSION:
+				return None, None
+			header = json.loads(f.read(header_length).decode("utf-8"))
+			payload = f.read()
+
+		if hashlib.sha256(payload).hexdigest() != header["checksum"]:
+			print("...snapshot failed checksum validation")
+			return header, None
+
+		return header, payload
+
 	def _load_wordnet(self, wordnet_dir):
-		"""Load the WordNet from the database directory provided."""
+		"""Load the WordNet from the database directory or WN-LMF file provided."""
 		print("=== Loading WordNet... ===")
+		if os.path.isfile(wordnet_dir):
+			return self._load_lmf_file(wordnet_dir)
+
 		# get files in dir
 		files = [os.path.join(wordnet_dir, f) for f in os.listdir(wordnet_dir)]
 		missing_files = []
@@ -186,153 +916,422 @@ class WordNet(object):
 		# load files
 		lemmas = {}
 		synsets = {}
+		synsets_by_offset = {}
 
-		# parse sense index file
+		# the word classes are independent of each other, with multiple workers they are parsed in a process pool
+		# while the sense index is parsed here, the largest (noun) files are submitted first
+		pool = None
+		if self.workers and self.workers > 1:
+			pool = ProcessPoolExecutor(max_workers=min(self.workers, len(self.wordclasses)))
+			loaded_wordclasses = {wordclass: pool.submit(self._load_pickled_wordclass, wordnet_dir, wordclass) for wordclass in self.wordclasses}
+
+		# parse sense index file and partition it by word class, so that each data file is only joined with its own sense keys
 		with open(os.path.join(wordnet_dir, "index.sense")) as f:
-			sense_keys = self._parse_sense_index_file(f.read())
+			sense_keys = self._parse_sense_index_file(f)
+		sense_keys_by_offset = self._sense_keys_by_offset(sense_keys)
+		missing_synsets = Counter()
 
 		# for all wordclasses pass the database files
 		for wordclass in self.wordclasses:
-			print("parsing {0} files...".format(wordclass))
+			if pool is None:
+				lemmas[wordclass], synsets_by_offset[wordclass] = self._load_wordclass(wordnet_dir, wordclass)
+			else:
+				lemmas[wordclass], synsets_by_offset[wordclass] = pickle.loads(loaded_wordclasses[wordclass].result())
 
-			# parse index file
-			lemmas[wordclass] = {}
-			with open(os.path.join(wordnet_dir, "index." + wordclass)) as f:
-				print("\t...index")
-				lemmas[wordclass] = self._parse_index_file(f.read())
+			# in lazy mode the data files are only read when a synset is requested
+			if self.lazy:
+				continue
 
-			# parse data file
-			with open(os.path.join(wordnet_dir, "data." + wordclass)) as f:
-				print("\t...data")
-				parsed_data_file = self._join_data_with_sense_keys(self._parse_data_file(f.read(), self.pointers[wordclass]), sense_keys, wordclass)
+			self._join_synsets_with_sense_keys(synsets_by_offset[wordclass], sense_keys_by_offset[wordclass], wordclass, missing_synsets)
+			for synset in synsets_by_offset[wordclass].values():
+				synsets[synset.synset_id] = synset
+
+		if pool is not None:
+			pool.shutdown()
+
+		if self.lazy:
+			print("...mapping data files")
+			synsets = LazySynsetTable(self, wordnet_dir, sense_keys_by_offset)
+		elif missing_synsets:
+			print("WARNING: sense keys refer to missing synsets ({0})".format(", ".join("{0}: {1}".format(wordclass, count) for wordclass, count in sorted(missing_synsets.items()))))
+
+		print("...finished")
+		return lemmas, synsets, sense_keys
+
+	def _load_exception_files(self, wordnet_dir):
+		"""Load the exception lists of irregular inflections. Missing exception files are treated as empty lists, the
+		exception files of a WN-LMF file are expected in its directory.
+
+		Returns:
+			(dict):	word classes as keys, dicts of inflected forms and lists of their base forms as values
+		"""
+		if os.path.isfile(wordnet_dir):
+			wordnet_dir = os.path.dirname(wordnet_dir)
+		exceptions = {}
+		for wordclass in self.wordclasses:
+			exceptions[wordclass] = {}
+			path = os.path.join(wordnet_dir, wordclass + ".exc")
+			if os.path.isfile(path):
+				with open(path) as f:
+					for fields in self._iter_database_lines(f):
+						exceptions[wordclass][fields[0]] = fields[1:]
+
+		return exceptions
+
+	def _load_lmf_file(self, path):
+		"""Stream a WN-LMF XML file into the same lemma, synset and sense key tables that are built from the database
+		files. The file is parsed with iterparse and every lexical entry and synset is discarded as soon as it has been
+		read, so besides the tables only the references between entries, senses and synsets are kept in memory.
+
+		Sense keys are taken from the dc:identifier of a sense or decoded from the escaped sense id (Open English
+		WordNet), synset offsets from the synset id. Relation types are mapped to the pointer symbols of the database
+		files, relations without a pointer in the pointer file of their word class are skipped. Lexical entries have
+		to precede the synsets, as in all WN-LMF releases.
+
+		Returns:
+			(tuple):	dict of LemmaIndex per word class, dict of synset ids and Synset Objects, SenseIndex
+		"""
+		print("parsing WN-LMF file...")
+		lemma_entries = {wordclass: {} for wordclass in self.wordclasses}
+		sense_keys = SenseIndex()
+		synsets = {}
+		synset_ids = {}
+		entry_words = {}
+		synset_members = {}
+		sense_synsets = {}
+		sense_relations = []
+		skipped = Counter()
+
+		with (gzip.open(path, "rb") if path.endswith(".gz") else open(path, "rb")) as f:
+			lexicon = None
+			for event, element in ElementTree.iterparse(f, events=("start", "end")):
+				if event == "start":
+					if element.tag == "Lexicon":
+						lexicon = element
+						sense_id_prefix = element.get("id", "") + "-"
+					continue
+
+				if element.tag == "LexicalEntry":
+					self._read_lmf_entry(element, sense_id_prefix, lemma_entries, sense_keys, synset_ids, entry_words, synset_members, sense_synsets, sense_relations, skipped)
+				elif element.tag == "Synset":
+					synset = self._read_lmf_synset(element, synset_ids, entry_words, synset_members, skipped)
+					if synset is not None:
+						synsets[synset.synset_id] = synset
+				else:
+					continue
+				# the lexicon holds all elements parsed so far, including the processed ones
+				lexicon.clear()
+
+		# lexical relations (antonyms, derivations, ...) hold between senses, the synsets of both senses are related
+		for source_id, relation_type, target_sense in sense_relations:
+			relation_name = self._lmf_relation_name(relation_type, CONSTANTS.SS_TYPE_WORDCLASS_MAPPING[source_id[0]])
+			target_id = sense_synsets.get(target_sense)
+			if relation_name is None or target_id is None or source_id not in synsets:
+				skipped[relation_type] += 1
+				continue
+			add_key(relation_name, synsets[source_id].relations, value=[])
+			synsets[source_id].relations[relation_name].append(target_id)
+
+		lemmas = {}
+		for wordclass in self.wordclasses:
+			lemmas[wordclass] = LemmaIndex()
+			for lemma in sorted(lemma_entries[wordclass]):
+				pos, offsets, sense_cnt, tagsense_cnt = lemma_entries[wordclass][lemma]
+				# the pointer symbols of a lemma are not available before all synsets are read, they are not indexed
+				lemmas[wordclass].add(lemma, pos, len(offsets), [], sense_cnt, tagsense_cnt, offsets)
 
-				print("...creating synsets")
-				# create the synsets
-				for offset in parsed_data_file:
-					offset_data = parsed_data_file[offset]
-					synset_id = offset_data["ss_type"] + offset
-					relations = self._relations_from_pointers(offset_data["pointers"], wordclass)
-					synsets[synset_id] = Synset(synset_id=synset_id, sense_keys=offset_data["sense_keys"], relations=relations, gloss=offset_data["gloss"], words=offset_data["words"])
+		if skipped:
+			print("WARNING: skipped WN-LMF elements without a counterpart in the pointer files ({0})".format(", ".join("{0}: {1}".format(name, count) for name, count in sorted(skipped.items()))))
 
 		print("...finished")
 		return lemmas, synsets, sense_keys
 
-	def _parse_index_file(self, file_content):
+	def _read_lmf_entry(self, entry, sense_id_prefix, lemma_entries, sense_keys, synset_ids, entry_words, synset_members, sense_synsets, sense_relations, skipped):
+		"""Add a LexicalEntry element to the lemma entries and sense keys, remember the synsets of its senses and
+		their sense relations until all synsets are read."""
+		lemma = entry.find("Lemma")
+		pos = lemma.get("partOfSpeech")
+		if pos not in CONSTANTS.SS_TYPE_WORDCLASS_MAPPING:
+			skipped["part of speech " + pos] += 1
+			return
+
+		entry_id = entry.get("id")
+		word = intern_string(lemma.get("writtenForm").replace(" ", "_"))
+		entry_words[entry_id] = word
+		# [pos, synset offsets, sense count, tagged sense count] like in the index files, which list satellites as adjectives
+		lemma_entry = lemma_entries[CONSTANTS.SS_TYPE_WORDCLASS_MAPPING[pos]].setdefault(word.lower(), ["a" if pos == "s" else pos, [], 0, 0])
+
+		for sense in entry.iter("Sense"):
+			synset_id = self._lmf_synset_id(sense.get("synset"), pos, synset_ids)
+			sense_key = self._lmf_sense_key(sense, sense_id_prefix)
+			tag_cnt = sum(int(count.text) for count in sense.iter("Count"))
+
+			if synset_id[1:] not in lemma_entry[1]:
+				lemma_entry[1].append(synset_id[1:])
+			lemma_entry[2] += 1
+			lemma_entry[3] += 1 if tag_cnt else 0
+
+			if sense_key is not None and sense_key not in sense_keys:
+				sense_keys.add(sense_key, int(synset_id[1:]), lemma_entry[2], tag_cnt)
+			else:
+				sense_key = None
+			synset_members.setdefault(synset_id, []).append((entry_id, sense_key))
+			sense_synsets[sense.get("id")] = synset_id
+			for relation in sense.iter("SenseRelation"):
+				sense_relations.append((synset_id, relation.get("relType"), relation.get("target")))
+
+	def _read_lmf_synset(self, element, synset_ids, entry_words, synset_members, skipped):
+		"""Create a Synset Object from a Synset element and the senses of the lexical entries read before.
+
+		Returns:
+			(Synset):	the synset, None if its part of speech has no word class
+		"""
+		synset_id = self._lmf_synset_id(element.get("id"), element.get("partOfSpeech"), synset_ids)
+		wordclass = CONSTANTS.SS_TYPE_WORDCLASS_MAPPING.get(synset_id[0])
+		if wordclass is None:
+			skipped["part of speech " + synset_id[0]] += 1
+			return None
+
+		members = synset_members.pop(synset_id, [])
+		if element.get("members"):
+			order = {entry_id: position for position, entry_id in enumerate(element.get("members").split())}
+			members.sort(key=lambda member: order.get(member[0], len(order)))
+
+		relations = {}
+		for relation in element.iter("SynsetRelation"):
+			relation_name = self._lmf_relation_name(relation.get("relType"), wordclass)
+			if relation_name is None:
+				skipped[relation.get("relType")] += 1
+				continue
+			add_key(relation_name, relations, value=[])
+			relations[relation_name].append(self._lmf_synset_id(relation.get("target"), synset_id[0], synset_ids))
+
+		# definitions and examples are joined like the glosses of the data files
+		gloss = "; ".join([definition.text for definition in element.iter("Definition")] + ['"{0}"'.format(example.text) for example in element.iter("Example")])
+		words = [(entry_words[entry_id], self._lmf_lex_id(sense_key)) for entry_id, sense_key in members]
+		return Synset(synset_id=synset_id, sense_keys=[sense_key for entry_id, sense_key in members if sense_key is not None], words=words, relations=relations, gloss=gloss)
+
+	@staticmethod
+	def _lmf_synset_id(lmf_id, pos, synset_ids):
+		"""Get the synset id (ss_type + offset) of a WN-LMF synset id. Ids ending with an offset and a part of speech
+		(e.g. 'oewn-02086723-n') keep their offset, synsets of other resources are numbered in the order they are referenced."""
+		synset_id = synset_ids.get(lmf_id)
+		if synset_id is None:
+			match = LMF_SYNSET_ID.search(lmf_id)
+			synset_id = intern_string(match.group(2) + match.group(1) if match else pos + format_offset(len(synset_ids) + 1))
+			synset_ids[lmf_id] = synset_id
+		return synset_id
+
+	@staticmethod
+	def _lmf_sense_key(sense, sense_id_prefix):
+		"""Get the sense key of a Sense element from its dc:identifier or its escaped id (e.g. 'oewn-dog__1.05.00..'),
+		None if it has neither."""
+		identifier = sense.get(DC_IDENTIFIER)
+		if identifier is not None and "%" in identifier:
+			return identifier.lower()
+
+		sense_id = sense.get("id", "")
+		if sense_id.startswith(sense_id_prefix):
+			sense_id = sense_id[len(sense_id_prefix):]
+		if "__" not in sense_id:
+			return None
+
+		unescape = lambda part: LMF_SENSE_ID_ESCAPE.sub(lambda match: CONSTANTS.LMF_SENSE_ID_ESCAPES[match.group(1)] if match.group(1) else "-", part)
+		lemma, lexical_id = sense_id.split("__", 1)
+		return (unescape(lemma) + "%" + unescape(lexical_id.replace(".", ":"))).lower()
+
+	@staticmethod
+	def _lmf_lex_id(sense_key):
+		"""Get the lex_id of a sense key in the single hex digit notation of the data files, 0 without a sense key."""
+		if sense_key is None:
+			return "0"
+		return "{0:x}".format(int(sense_key.split("%")[1].split(":")[2]))
+
+	def _lmf_relation_name(self, relation_type, wordclass):
+		"""Get the relation name of a WN-LMF relation type in a word class, None if the pointer files have no such relation."""
+		symbol = CONSTANTS.LMF_WORDCLASS_RELATION_POINTERS.get(wordclass, {}).get(relation_type, CONSTANTS.LMF_RELATION_POINTERS.get(relation_type))
+		return self.pointers[wordclass].get(symbol)
+
+	def _load_pickled_wordclass(self, wordnet_dir, wordclass):
+		"""Load the files of a word class in a worker process and return them pickled, so that they can be unpickled
+		in the main process while garbage collection is disabled."""
+		gc.disable()
+		return pickle.dumps(self._load_wordclass(wordnet_dir, wordclass), protocol=pickle.HIGHEST_PROTOCOL)
+
+	def _load_wordclass(self, wordnet_dir, wordclass):
+		"""Parse the index and data file of a word class, the synsets are created without sense keys.
+
+		Returns:
+			(tuple):	the parsed index file, dict of offsets and Synset Objects (empty in lazy mode)
+		"""
+		print("parsing {0} files...".format(wordclass))
+		with open(os.path.join(wordnet_dir, "index." + wordclass)) as f:
+			index = self._parse_index_file(f)
+
+		synsets = {}
+		if not self.lazy:
+			with open(os.path.join(wordnet_dir, "data." + wordclass)) as f:
+				parsed_data_file = self._parse_data_file(f, self.pointers[wordclass])
+
+			for offset in parsed_data_file:
+				synsets[offset] = self._create_synset(offset, parsed_data_file[offset], wordclass)
+
+		return index, synsets
+
+	def _create_synset(self, offset, offset_data, wordclass):
+		"""Create a Synset Object from the parsed data file entry of a synset."""
+		synset_id = offset_data["ss_type"] + offset
+		relations = self._relations_from_pointers(offset_data["pointers"], wordclass)
+		gloss = offset_data["gloss"] if self._gloss_sources is None else self._gloss_sources[wordclass]
+		return Synset(synset_id=synset_id, sense_keys=offset_data["sense_keys"], relations=relations, gloss=gloss, words=offset_data["words"])
+
+	@staticmethod
+	def _iter_database_lines(lines):
+		"""
+		Stream the entries of a database file, splitting every line exactly once. Lines of the license header (indented
+		by two spaces) and lines without content are skipped.
+
+		Key Arguments:
+			lines	(iterable):		the lines of the file, usually the open file object itself
+
+		Yields:
+			list:	the fields of an entry
+		"""
+		for line in lines:
+			if line[:2] == "  ":
+				continue
+			fields = line.strip().split(" ")
+			if len(fields) > 1:
+				yield fields
+
+	def _parse_index_file(self, lines):
 		"""
-		Parse the content of an index.POS file to a dictionary representation that stores the lemmas as keys and the according information as an additional dict.
+		Parse an index.POS file to a dictionary representation that stores the lemmas as keys and the according information as an additional dict.
 
 		Key Arguments:
-			file_content	(string):	the content of an index file.
+			lines	(iterable):		the lines of an index file, e.g. the open file object
 
 		Returns:
-			dict:	dict with lemmas as keys, name-value mappings as values
+			LemmaIndex:	mapping with lemmas as keys, name-value mappings as values
 		"""
-		lines = [line.strip().split(" ") for line in file_content.split("\n") if line[:2] != "  " and len(line.strip().split(" ")) > 1]
-		index = {}
+		index = LemmaIndex()
 
-		for word in lines:
+		for word in self._iter_database_lines(lines):
 			if word[0] not in index:
-				index[word[0]] = {  # word[0] -> lemma
-					"pos": word[1],
-					"synset_cnt": word[2],
-					"p_cnt": word[3],
-					"ptr_symbol": word[4:4+int(word[3])],
-					"sense_cnt": word[4+int(word[3])],
-					"tagsense_cnt": word[4+int(word[3])+1],
-					"synset_offsets": word[4+int(word[3])+2:]
-				}
+				p_cnt = int(word[3])
+				index.add(word[0], word[1], int(word[2]), word[4:4+p_cnt], int(word[4+p_cnt]), int(word[4+p_cnt+1]), word[4+p_cnt+2:])
 			else:
 				print("Omitting duplicate index entry!")
 
 		return index
 
-	def _parse_data_file(self, file_content, pointers):
+	def _parse_data_file(self, lines, pointers):
 		"""
-		Parse the content of a data.POS file to a dictionary representation with synset offsets as keys and the rest of the information as their values.
+		Parse a data.POS file to a dictionary representation with synset offsets as keys and the rest of the information as their values.
 
 		Key Arguments:
-			file_content	(string):	the content of a data file
+			lines			(iterable):	the lines of a data file, e.g. the open file object
 			pointers		(dict):		pointers and their description that are used in this data file
 
 		Returns:
 			dict:	synset offsets as keys, info as values
 		"""
-		lines = [line.strip().split(" ") for line in file_content.split("\n") if line[:2] != "  " and len(line.strip().split(" ")) > 1]
 		data = {}
 
-		for word in lines:
+		for word in self._iter_database_lines(lines):
 			if word[0] not in data:
-				word_chunk_length = 2
-				word_info = {
-					"lex_filenum": word[1],
-					"ss_type": word[2],
-					"w_cnt": int(word[3], 16),
-					"p_cnt": int(word[4+int(word[3], 16)*2]),
-					"gloss": " ".join(word[word.index("|")+1:]),
-					"sense_keys": []  # will be filled by another function
-				}
-
-				word_list = [(w, word[4:4+word_info["w_cnt"]*word_chunk_length+1][i+1]) for i, w in list(enumerate(word[4:4+word_info["w_cnt"]*word_chunk_length]))[::2]]
-				pointers = [word[4+word_info["w_cnt"]*word_chunk_length+1:4+word_info["w_cnt"]*word_chunk_length+1 + word_info["p_cnt"]*4][i:i+4] for i in range(0, word_info["p_cnt"]*4, 4)]
-
-				word_info.update({
-					"words": word_list,
-					"pointers": pointers
-				})
-
-				if word_info["ss_type"] == "v":
-					f_cnt_position = int(4 + (word_info["w_cnt"] * word_chunk_length) + 1 + (word_info["p_cnt"] * 4))
-					f_cnt = int(word[f_cnt_position], 16)
-					frame_list = [word[f_cnt_position+1:f_cnt_position+1+f_cnt*3][i+1:i+3] for i in range(0, f_cnt*3, 3)]
-
-					word_info.update({
-						"f_cnt": f_cnt,
-						"frames": frame_list
-					})
-
-				data[word[0]] = word_info
-
+				data[word[0]] = self._parse_data_record(word)
 			else:
 				print("Omitting duplicate data entry!")
 
 		return data
 
-	def _parse_sense_index_file(self, file_content):
-		"""Parse a sense index files content."""
-		lines = [line.strip().split(" ") for line in file_content.split("\n") if line[:2] != "  " and len(line.strip().split(" ")) > 1]
-		index = {}
+	@staticmethod
+	def _parse_data_record(word):
+		"""
+		Parse a single split line of a data.POS file.
 
-		for word in lines:
+		Key Arguments:
+			word	(list):		the fields of the line, the first one being the synset offset
+
+		Returns:
+			dict:	the information about the synset
+		"""
+		w_cnt = int(word[3], 16)
+		p_cnt_position = 4 + w_cnt * 2  # every word is followed by its lex_id
+		p_cnt = int(word[p_cnt_position])
+		pointers_end = p_cnt_position + 1 + p_cnt * 4  # every pointer consists of symbol, offset, pos and source/target
+
+		word_info = {
+			"lex_filenum": word[1],
+			"ss_type": word[2],
+			"w_cnt": w_cnt,
+			"p_cnt": p_cnt,
+			"gloss": " ".join(word[word.index("|", pointers_end)+1:]),
+			"sense_keys": [],  # will be filled by another function
+			"words": [(word[i], word[i+1]) for i in range(4, p_cnt_position, 2)],
+			"pointers": [word[i:i+4] for i in range(p_cnt_position+1, pointers_end, 4)]
+		}
+
+		if word_info["ss_type"] == "v":
+			f_cnt = int(word[pointers_end], 16)
+			# every frame consists of a "+", the frame number and the word number, the "+" is omitted
+			word_info.update({
+				"f_cnt": f_cnt,
+				"frames": [word[i+1:i+3] for i in range(pointers_end+1, pointers_end+1+f_cnt*3, 3)]
+			})
+
+		return word_info
+
+	def _parse_sense_index_file(self, lines):
+		"""Parse the lines of a sense index file into a SenseIndex."""
+		index = SenseIndex()
+
+		for word in self._iter_database_lines(lines):
 			if word[0] not in index:
-				index[word[0]] = {
-					"synset_offset": word[1],
-					"sense_number": word[2],
-					"tag_cnt": word[3]
-				}
+				index.add(word[0], int(word[1]), int(word[2]), int(word[3]))
 			else:
 				print("DUPLICATE SENSE INDEX!")
 
 		return index
 
-	def _join_data_with_sense_keys(self, data, sense_index, pos):
-		"""Join a data file with the sense indexes to add the possible sense keys to each synset."""
-		print("\t...sense keys")
-		joined = data
-		pos = {"noun": ["1"], "verb": ["2"], "adj": ["3", "5"], "adv": ["4"]}[pos]
+	def _join_synsets_with_sense_keys(self, synsets, sense_keys_by_offset, wordclass, missing_synsets):
+		"""Join the synsets of a data file with the sense keys of its word class to add the possible sense keys to each synset.
 
-		mso = 0
+		Arguments:
+			synsets					(dict)		offsets as keys and the synsets of the data file as values
+			sense_keys_by_offset	(dict)		offsets as keys and the sense keys of the word class at that offset as values
+			wordclass				(string)	the word class of the data file
+			missing_synsets			(Counter)	counts sense keys referring to offsets missing in the data file per word class
+		"""
+		print("...joining {0} sense keys".format(wordclass))
+		for synset_offset, offset_sense_keys in sense_keys_by_offset.items():
+			if synset_offset in synsets:
+				synsets[synset_offset].sense_keys.extend(offset_sense_keys)
+			else:
+				missing_synsets[wordclass] += len(offset_sense_keys)
 
-		for sense_key in sense_index:
-			sense_key_info = sense_index[sense_key]
-			synset_offset = sense_key_info["synset_offset"]
-			if synset_offset in data:
-				joined[synset_offset]["sense_keys"].append(sense_key)
-			elif synset_offset not in data and re.search("%([0-9]+):", sense_key).group(1) in pos:
-				print(synset_offset)
-				mso += 1
+		return synsets
 
-		print("\t\t{0} missing synsets".format(mso))
-		return joined
+	def _sense_keys_by_offset(self, sense_index):
+		"""Partition the sense keys of the sense index by the word class (parsed from the ss_type number after the "%")
+		and the offset of the synset they belong to.
+
+		Returns:
+			dict:	word classes as keys, dicts of synset offsets and their sense keys as values
+		"""
+		grouped = {wordclass: {} for wordclass in self.wordclasses}
+		# the offset column is read directly, creating the dict of every sense key would be wasted
+		for sense_key, offset in zip(sense_index, sense_index.synset_offsets):
+			wordclass = CONSTANTS.SS_TYPE_NUMBER_WORDCLASS_MAPPING[sense_key[sense_key.index("%")+1]]
+			synset_offset = format_offset(offset)
+			offset_sense_keys = grouped[wordclass].get(synset_offset)
+			if offset_sense_keys is None:
+				grouped[wordclass][synset_offset] = [sense_key]
+			else:
+				offset_sense_keys.append(sense_key)
+
+		return grouped
 
 	def _load_pointers(self, pointer_file):
 		"""Load a pointer file."""
@@ -346,20 +1345,642 @@ class WordNet(object):
 			relation_name = self.pointers[wordclass][pointer[0]]
 			if relation_name not in relations.keys():
 				relations[relation_name] = []
-			relations[relation_name].append(pointer[2] + pointer[1])
+			# synset ids are referenced by many pointers, interning lets all of them share the synsets own id string
+			relations[relation_name].append(intern_string(pointer[2] + pointer[1]))
 
 		return relations
 
-	def _integrate_relations_from_file(self, filename):
-		"""Integrate the relations in an additional relation file into the WordNet Interface."""
-		print("...integrating new relations")
-		import pickle
+	@staticmethod
+	def _relation_filenames(relations_filename):
+		"""Get the list of relation files from the relations_filename argument, which is a single path or a list."""
+		if not relations_filename:
+			return []
+		if isinstance(relations_filename, (list, tuple)):
+			return list(relations_filename)
+		return [relations_filename]
 
+	def _integrate_relations_from_file(self, filename):
+		"""Integrate the relations in an additional relation file (pickled relations or an overlay) into the WordNet Interface."""
 		with open(filename, "rb") as f:
+			if f.read(len(OVERLAY_MAGIC)) == OVERLAY_MAGIC:
+				return self._integrate_relation_overlay(f, filename)
+			f.seek(0)
+			print("...integrating new relations")
 			relations = pickle.load(f)
+
 		for synset_id in relations:
 			self.synsets[synset_id].update_relations(relations[synset_id], self)
 
+	def _integrate_relation_overlay(self, f, filename):
+		"""Integrate the relations of an overlay file (opened and positioned behind the magic string), see write_relation_overlay."""
+		print("...integrating relation overlay")
+		version, header_length = struct.unpack("<II", f.read(8))
+		if version != OVERLAY_VERSION:
+			raise ValueError("The relation overlay {0} has version {1}, expected {2}.".format(filename, version, OVERLAY_VERSION))
+		header = json.loads(f.read(header_length).decode("utf-8"))
+
+		# all arrays are read in one bulk operation
+		data = f.read()
+		arrays = {}
+		position = 0
+		for name in OVERLAY_ARRAYS:
+			arrays[name] = array("I")
+			arrays[name].frombytes(data[position:position + 4 * header["lengths"][name]])
+			if sys.byteorder == "big":
+				arrays[name].byteswap()
+			position += 4 * header["lengths"][name]
+
+		synset_ids = [intern_string(synset_id) for synset_id in header["synset_ids"]]
+		relation_names = header["relations"]
+		tuple_relations = set(header["tuple_relations"])
+		source_indptr, entry_relation, entry_indptr, members = arrays["source_indptr"], arrays["entry_relation"], arrays["entry_indptr"], arrays["members"]
+
+		for source, source_number in enumerate(arrays["sources"]):
+			relations = self.synset_from_id(synset_ids[source_number]).relations
+			for entry in range(source_indptr[source], source_indptr[source+1]):
+				relation_name = relation_names[entry_relation[entry]]
+				entry_members = [synset_ids[member] for member in members[entry_indptr[entry]:entry_indptr[entry+1]]]
+				add_key(relation_name, relations, value=[])
+				relations[relation_name].append(tuple(entry_members) if relation_name in tuple_relations else entry_members[0])
+
+		self._relations_changed()
+
+
+class SharedWordNet(WordNet):
+	"""Read-only WordNet for multi-process workers. Lemmas, sense keys and synsets stay in a store file written by
+	WordNet.build_shared_store and are only read from its memory map, so the operating system shares one copy of the
+	store among all processes that attach to it. Synsets are unpickled from the map on every access (enable the query
+	cache to keep frequently used ones) and their relations cant be changed.
+
+	Pickling a SharedWordNet only pickles the path of the store, so it can be passed to worker processes cheaply.
+
+	Attributes:
+		store_path	(string)	the path of the attached store file
+		lemmas		(dict)		word classes as keys, MappedTables of the lemmas of that word class as values
+		sense_keys	(MappedTable)	sense keys as keys, the sense key infos as values
+		synsets		(MappedTable)	synset ids as keys, Synset Objects as values
+
+	Methods:
+		attach		(SharedWordNet):	attach to a store file, rebuilding it if the sources changed
+	"""
+
+	def __init__(self, store_path):
+		"""Attach to a shared store file.
+
+		Arguments:
+			store_path	(string)	the path of a store file written by WordNet.build_shared_store
+		"""
+		header = self._read_store_header(store_path)
+		if header is None:
+			raise ValueError("{0} is no shared WordNet store of version {1}.".format(store_path, SHARED_STORE_VERSION))
+
+		self.__dict__.update(header["attributes"])
+		self.store_path = store_path
+		self.lemmas = {wordclass: MappedTable(store_path, header["tables"]["lemmas." + wordclass]) for wordclass in self.wordclasses}
+		self.exceptions = {wordclass: MappedTable(store_path, header["tables"]["exceptions." + wordclass]) for wordclass in self.wordclasses}
+		self.sense_keys = MappedTable(store_path, header["tables"]["sense_keys"])
+		self.synsets = MappedTable(store_path, header["tables"]["synsets"])
+		# building graphs would unpickle every synset, queries follow the relations of the synsets like in lazy mode
+		self.lazy = True
+		self._init_transient_state()
+		self._inverse_relations = MappedTable(store_path, header["tables"]["inverse_relations"])
+
+	@classmethod
+	def attach(cls, store_path, *args, **kwargs):
+		"""Attach to a shared store file. If the store does not exist, is from an older store version or any of its
+		source files changed, the WordNet is loaded from the database files and the store is rebuilt.
+
+		Arguments:
+			store_path	(string)	the path of the store file
+			*args		()			optional constructor arguments of WordNet used for (re)building the store,
+									if omitted the arguments stored in the store are used
+
+		Returns:
+			(SharedWordNet):	the attached WordNet
+		"""
+		print("=== Attaching shared WordNet... ===")
+		header = cls._read_store_header(store_path)
+		arguments = cls._constructor_arguments(*args, **kwargs) if (args or kwargs) else (header or {}).get("arguments")
+
+		if header is None or not cls._same_content(arguments, header["arguments"]) or not cls._sources_unchanged(header["sources"], arguments):
+			if arguments is None:
+				raise ValueError("The shared store {0} is not usable and no arguments to rebuild it were provided.".format(store_path))
+			print("...shared store missing or outdated, rebuilding")
+			WordNet(**arguments).build_shared_store(store_path)
+
+		wordnet = cls(store_path)
+		print("...finished")
+		return wordnet
+
+	def _relations_changed(self):
+		raise TypeError("The shared WordNet {0} is read-only, relations cant be changed.".format(self.store_path))
+
+	@staticmethod
+	def _read_store_header(path):
+		"""Read the header of a store file. None if the file doesnt exist or is not a store of the current version."""
+		if not os.path.isfile(path):
+			return None
+
+		with open(path, "rb") as f:
+			if f.read(len(SHARED_STORE_MAGIC)) != SHARED_STORE_MAGIC:
+				return None
+			version, header_length = struct.unpack("<II", f.read(8))
+			if version != SHARED_STORE_VERSION:
+				return None
+			return json.loads(f.read(header_length).decode("utf-8"))
+
+
+class RelationGraph(object):
+	"""Adjacency structure of a single relation in compressed sparse row format. Every synset is identified by a
+	dense integer (its number), the relation members of synset i are indices[indptr[i]:indptr[i+1]].
+
+	Attributes:
+		relation		(string)	the name of the relation
+		synset_ids		(list)		synset ids indexed by their number, shared by all graphs of a WordNet
+		numbers			(dict)		synset ids (of either adjective ss_type) as keys, their numbers as values
+		indptr			(array)		start of the members of each synset in indices, one more entry than synsets
+		indices			(array)		numbers of the relation members of all synsets
+
+	Methods:
+		number			(int):		get the number of a synset id
+		neighbours		(array):	get the numbers of the members a synset (given by number) relates to
+		members			(list):		get the ids of the members a synset (given by id) relates to
+	"""
+
+	def __init__(self, relation, synset_ids, numbers, indptr, indices):
+		self.relation = relation
+		self.synset_ids = synset_ids
+		self.numbers = numbers
+		self.indptr = indptr
+		self.indices = indices
+
+	def __len__(self):
+		return len(self.synset_ids)
+
+	@classmethod
+	def from_synsets(cls, relation, synsets, synset_ids, numbers):
+		"""Build the graph of a relation from the relation dicts of the synsets."""
+		indptr = array("i", [0])
+		indices = array("i")
+		for synset_id in synset_ids:
+			for member in synsets[synset_id].relations.get(relation, ()):
+				if isinstance(member, tuple):
+					raise TypeError("Relation {0} is not binary and can't be represented as a graph.".format(relation))
+				indices.append(numbers[member])
+			indptr.append(len(indices))
+
+		return cls(relation, synset_ids, numbers, indptr, indices)
+
+	def number(self, synset_id):
+		"""Get the number of a synset id."""
+		if synset_id not in self.numbers:
+			raise ValueError("The synset id {0} doesnt exist in this database.".format(synset_id))
+		return self.numbers[synset_id]
+
+	def neighbours(self, number):
+		"""Get the numbers of the synsets the synset with the given number relates to."""
+		return self.indices[self.indptr[number]:self.indptr[number+1]]
+
+	def members(self, synset_id):
+		"""Get the ids of the synsets the synset with the given id relates to."""
+		return [self.synset_ids[number] for number in self.neighbours(self.number(synset_id))]
+
+
+class AncestorIndex(object):
+	"""Precomputed transitive closure of a hypernymy relation. For every synset number the numbers of all its
+	ancestors are stored in ascending order, together with their minimal distance (number of steps upwards).
+	Additionally the depth of every synset, the length of the longest path from it up to a root, is stored.
+
+	Attributes:
+		graph			(RelationGraph)		the (first) graph the index was built from, used for numbering
+		indptr			(array)				start of the ancestors of each synset in indices
+		indices			(array)				numbers of the ancestors of all synsets, ascending per synset
+		distances		(array)				minimal distance of each ancestor in indices
+		depths			(array)				depth of each synset, roots have depth 0
+
+	Methods:
+		distance		(int):		get the distance between a synset and one of its ancestors
+		ancestors		(list):		get the ancestors of a synset with their distance
+	"""
+
+	def __init__(self, graph, indptr, indices, distances, depths):
+		self.graph = graph
+		self.indptr = indptr
+		self.indices = indices
+		self.distances = distances
+		self.depths = depths
+
+	@classmethod
+	def from_graphs(cls, graphs):
+		"""Build the index from one or more graphs over the same numbering, e.g. hypernym and instance_hypernym."""
+		def parents(node):
+			return itertools.chain(*[graph.neighbours(node) for graph in graphs])
+
+		# ancestors of a node are its parents and the ancestors of its parents, so parents are resolved first
+		closures = [None] * len(graphs[0])
+		depths = array("H", [0]) * len(graphs[0])
+		for start in range(len(closures)):
+			if closures[start] is not None:
+				continue
+			on_path = set()
+			stack = [(start, False)]
+			while stack:
+				node, parents_resolved = stack.pop()
+				if parents_resolved:
+					closure = {}
+					for parent in parents(node):
+						closure[parent] = 1
+					for parent in parents(node):
+						# a missing closure means the relation contains a cycle, the cyclic edge is ignored
+						if closures[parent] is None:
+							continue
+						depths[node] = max(depths[node], depths[parent] + 1)
+						for ancestor, distance in closures[parent].items():
+							if distance + 1 < closure.get(ancestor, distance + 2):
+								closure[ancestor] = distance + 1
+					closures[node] = closure
+					on_path.discard(node)
+				elif closures[node] is None and node not in on_path:
+					on_path.add(node)
+					stack.append((node, True))
+					for parent in parents(node):
+						if closures[parent] is None and parent not in on_path:
+							stack.append((parent, False))
+
+		indptr = array("i", [0])
+		indices = array("i")
+		distances = array("H")
+		for node, closure in enumerate(closures):
+			for ancestor in sorted(closure):
+				indices.append(ancestor)
+				distances.append(closure[ancestor])
+			indptr.append(len(indices))
+			closures[node] = None
+
+		return cls(graphs[0], indptr, indices, distances, depths)
+
+	def distance(self, node, ancestor):
+		"""Get the minimal distance from a synset to an ancestor (both as numbers), None if it is no ancestor."""
+		start, end = self.indptr[node], self.indptr[node+1]
+		position = bisect.bisect_left(self.indices, ancestor, start, end)
+		if position < end and self.indices[position] == ancestor:
+			return self.distances[position]
+		return None
+
+	def ancestors(self, node, max_depth=None):
+		"""Get the ancestors of a synset (as number) within max_depth as a list of (number, distance) tuples."""
+		start, end = self.indptr[node], self.indptr[node+1]
+		return [(ancestor, distance) for ancestor, distance in zip(self.indices[start:end], self.distances[start:end]) if max_depth is None or distance <= max_depth]
+
+
+def format_offset(offset):
+	"""Format an integer offset as the 8 digit string used in the database files and synset ids."""
+	return "{0:08d}".format(offset)
+
+
+class LemmaIndex(Mapping):
+	"""Read-only mapping of the lemmas of an index.POS file to their entries. The fields are stored in typed columns
+	indexed by a dense lemma id, the pointer symbols and synset offsets of all lemmas in concatenated arrays (like a
+	RelationGraph). Lookups create the entry dict of a lemma on demand.
+
+	Attributes:
+		ids					(dict)		lemmas as keys, their ids as values
+		pos					(bytearray)	the pos character of every lemma
+		synset_cnts			(array)		number of synsets of every lemma
+		p_cnts				(array)		number of pointer symbols of every lemma
+		sense_cnts			(array)		number of senses of every lemma
+		tagsense_cnts		(array)		number of senses of every lemma that are tagged in a corpus
+		symbols				(list)		pointer symbols, their position is stored in ptr_symbols
+		ptr_indptr			(array)		start of the pointer symbols of each lemma in ptr_symbols
+		ptr_symbols			(array)		positions of the pointer symbols of all lemmas
+		offsets_indptr		(array)		start of the synset offsets of each lemma in synset_offsets
+		synset_offsets		(array)		synset offsets of all lemmas
+	"""
+
+	def __init__(self):
+		self.ids = {}
+		self.pos = bytearray()
+		self.synset_cnts = array("H")
+		self.p_cnts = array("H")
+		self.sense_cnts = array("H")
+		self.tagsense_cnts = array("H")
+		self.symbols = []
+		self.ptr_indptr = array("I", [0])
+		self.ptr_symbols = array("B")
+		self.offsets_indptr = array("I", [0])
+		self.synset_offsets = array("I")
+
+		self._symbol_positions = {}
+
+	def __getitem__(self, lemma):
+		lemma_id = self.ids[lemma]
+		return {
+			"pos": chr(self.pos[lemma_id]),
+			"synset_cnt": self.synset_cnts[lemma_id],
+			"p_cnt": self.p_cnts[lemma_id],
+			"ptr_symbol": [self.symbols[symbol] for symbol in self.ptr_symbols[self.ptr_indptr[lemma_id]:self.ptr_indptr[lemma_id+1]]],
+			"sense_cnt": self.sense_cnts[lemma_id],
+			"tagsense_cnt": self.tagsense_cnts[lemma_id],
+			"synset_offsets": [format_offset(offset) for offset in self.synset_offsets[self.offsets_indptr[lemma_id]:self.offsets_indptr[lemma_id+1]]]
+		}
+
+	def __contains__(self, lemma):
+		return lemma in self.ids
+
+	def __iter__(self):
+		return iter(self.ids)
+
+	def __len__(self):
+		return len(self.ids)
+
+	def add(self, lemma, pos, synset_cnt, ptr_symbols, sense_cnt, tagsense_cnt, synset_offsets):
+		"""Add the entry of a lemma, the offsets are given as strings."""
+		self.ids[lemma] = len(self.ids)
+		self.pos.append(ord(pos))
+		self.synset_cnts.append(synset_cnt)
+		self.p_cnts.append(len(ptr_symbols))
+		self.sense_cnts.append(sense_cnt)
+		self.tagsense_cnts.append(tagsense_cnt)
+
+		for symbol in ptr_symbols:
+			if symbol not in self._symbol_positions:
+				self._symbol_positions[symbol] = len(self.symbols)
+				self.symbols.append(symbol)
+			self.ptr_symbols.append(self._symbol_positions[symbol])
+		self.ptr_indptr.append(len(self.ptr_symbols))
+
+		self.synset_offsets.extend(int(offset) for offset in synset_offsets)
+		self.offsets_indptr.append(len(self.synset_offsets))
+
+
+class SenseIndex(Mapping):
+	"""Read-only mapping of the sense keys of the index.sense file to their entries. The fields are stored in typed
+	columns indexed by a dense sense id, lookups create the entry dict of a sense key on demand.
+
+	Attributes:
+		ids					(dict)		sense keys as keys, their ids as values
+		synset_offsets		(array)		offset of the synset of every sense
+		sense_numbers		(array)		number of every sense in relation to its lemma
+		tag_cnts			(array)		frequency of every sense in a corpus
+	"""
+
+	def __init__(self):
+		self.ids = {}
+		self.synset_offsets = array("I")
+		self.sense_numbers = array("H")
+		self.tag_cnts = array("I")
+
+	def __getitem__(self, sense_key):
+		sense_id = self.ids[sense_key]
+		return {
+			"synset_offset": format_offset(self.synset_offsets[sense_id]),
+			"sense_number": self.sense_numbers[sense_id],
+			"tag_cnt": self.tag_cnts[sense_id]
+		}
+
+	def __contains__(self, sense_key):
+		return sense_key in self.ids
+
+	def __iter__(self):
+		return iter(self.ids)
+
+	def __len__(self):
+		return len(self.ids)
+
+	def add(self, sense_key, synset_offset, sense_number, tag_cnt):
+		"""Add the entry of a sense key."""
+		self.ids[sense_key] = len(self.ids)
+		self.synset_offsets.append(synset_offset)
+		self.sense_numbers.append(sense_number)
+		self.tag_cnts.append(tag_cnt)
+
+
+class LazySynsetTable(Mapping):
+	"""Read-only mapping from synset ids to Synset Objects that is backed by memory-mapped data files. As synset
+	offsets are byte offsets into the data files, a synset is parsed by seeking to its offset and reading a single
+	line. Parsed synsets are cached, so relations integrated into them persist.
+
+	Attributes:
+		wordnet			(WordNet)	the WordNet the synsets belong to, used to resolve pointers
+		wordnet_dir		(string)	the directory containing the data files
+		sense_keys		(dict)		word classes as keys, dicts of offsets and the sense keys of that synset as values
+	"""
+
+	def __init__(self, wordnet, wordnet_dir, sense_keys):
+		self.wordnet = wordnet
+		self.wordnet_dir = wordnet_dir
+		self.sense_keys = sense_keys
+
+		self._cache = {}
+		self._maps = {}
+		self._length = None
+
+	def __getstate__(self):
+		"""Memory maps cant be pickled, they are reopened on demand."""
+		state = dict(self.__dict__)
+		state["_maps"] = {}
+		return state
+
+	def __getitem__(self, synset_id):
+		if synset_id in self._cache:
+			return self._cache[synset_id]
+
+		synset = self._read_synset(synset_id)
+		if synset is None:
+			raise KeyError(synset_id)
+
+		self._cache[synset_id] = synset
+		return synset
+
+	def __contains__(self, synset_id):
+		try:
+			self[synset_id]
+		except KeyError:
+			return False
+		return True
+
+	def __iter__(self):
+		for wordclass in self.wordnet.wordclasses:
+			data_map = self._data_map(wordclass)
+			position = 0
+			while position < len(data_map):
+				end = data_map.find(b"\n", position)
+				end = len(data_map) if end == -1 else end
+				# license lines start with two spaces, synset lines with their offset followed by lex_filenum and ss_type
+				if data_map[position:position+1] != b" ":
+					fields = data_map[position:end].split(b" ", 3)
+					yield fields[2].decode("utf-8") + fields[0].decode("utf-8")
+				position = end + 1
+
+	def __len__(self):
+		if self._length is None:
+			self._length = sum(1 for synset_id in self)
+		return self._length
+
+	def _data_map(self, wordclass):
+		"""Get the memory map of the data file of a word class."""
+		if wordclass not in self._maps:
+			with open(os.path.join(self.wordnet_dir, "data." + wordclass), "rb") as f:
+				self._maps[wordclass] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+		return self._maps[wordclass]
+
+	def _read_synset(self, synset_id):
+		"""Parse the synset at the offset the id refers to. Returns None if there is no synset of that id."""
+		if not isinstance(synset_id, str) or len(synset_id) < 2 or synset_id[0] not in CONSTANTS.SS_TYPE_WORDCLASS_MAPPING or not synset_id[1:].isdigit():
+			return None
+
+		wordclass = CONSTANTS.SS_TYPE_WORDCLASS_MAPPING[synset_id[0]]
+		offset = synset_id[1:]
+		data_map = self._data_map(wordclass)
+		position = int(offset)
+
+		# the offset is only valid if a line starts there and that line belongs to the requested synset
+		if position >= len(data_map) or (position > 0 and data_map[position-1:position] != b"\n"):
+			return None
+		end = data_map.find(b"\n", position)
+		line = data_map[position:len(data_map) if end == -1 else end].decode("utf-8").strip().split(" ")
+		if line[0] != offset or len(line) < 3 or line[2] != synset_id[0]:
+			return None
+
+		offset_data = self.wordnet._parse_data_record(line)
+		offset_data["sense_keys"] = list(self.sense_keys[wordclass].get(offset, []))
+		return self.wordnet._create_synset(offset, offset_data, wordclass)
+
+
+class MappedTable(Mapping):
+	"""Read-only mapping of string keys to pickled values stored in a region of a memory-mapped file. The table starts
+	with the number of entries and the positions of all records (relative to the start of the table, one more than
+	entries), followed by the records sorted by their utf-8 encoded key. A record consists of the key length, the key
+	and the pickled value. Keys are found by binary search, values are unpickled on every access.
+
+	Attributes:
+		path		(string)	the file containing the table
+		start		(int)		the position of the table in the file
+	"""
+
+	def __init__(self, path, start):
+		self.path = path
+		self.start = start
+
+		self._map = None
+
+	def __getstate__(self):
+		"""Memory maps cant be pickled, the file is mapped again on demand."""
+		return {"path": self.path, "start": self.start, "_map": None}
+
+	def __getitem__(self, key):
+		index = self._find(key)
+		if index is None:
+			raise KeyError(key)
+
+		position, end = self._record(index)
+		data_map = self._data_map()
+		key_length = struct.unpack_from("<H", data_map, position)[0]
+		return pickle.loads(data_map[position+2+key_length:end])
+
+	def __contains__(self, key):
+		return self._find(key) is not None
+
+	def __iter__(self):
+		for index in range(len(self)):
+			yield self._key(index).decode("utf-8")
+
+	def __len__(self):
+		return struct.unpack_from("<I", self._data_map(), self.start)[0]
+
+	@staticmethod
+	def write(f, items, pickled=False):
+		"""Write a table of the given (key, value) pairs at the current position of a file.
+
+		Arguments:
+			f			(file)		the file opened for writing in binary mode
+			items		(iterable)	the (key, value) pairs
+			pickled		(bool)		if True the values are already pickled bytes, which are stored as they are
+
+		Returns:
+			(int):	the position of the table in the file
+		"""
+		records = sorted((key.encode("utf-8"), value if pickled else pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)) for key, value in items)
+		positions = [4 + 8 * (len(records) + 1)]
+		for key, value in records:
+			positions.append(positions[-1] + 2 + len(key) + len(value))
+
+		start = f.tell()
+		f.write(struct.pack("<I", len(records)))
+		f.write(struct.pack("<{0}Q".format(len(positions)), *positions))
+		for key, value in records:
+			f.write(struct.pack("<H", len(key)))
+			f.write(key)
+			f.write(value)
+		return start
+
+	def _data_map(self):
+		"""Get the memory map of the file."""
+		if self._map is None:
+			with open(self.path, "rb") as f:
+				self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+		return self._map
+
+	def _record(self, index):
+		"""Get the absolute start and end position of a record."""
+		position, end = struct.unpack_from("<QQ", self._data_map(), self.start + 4 + 8 * index)
+		return self.start + position, self.start + end
+
+	def _key(self, index):
+		"""Get the encoded key of a record."""
+		position = self._record(index)[0]
+		data_map = self._data_map()
+		key_length = struct.unpack_from("<H", data_map, position)[0]
+		return data_map[position+2:position+2+key_length]
+
+	def _find(self, key):
+		"""Binary search for the index of the record of a key, None if the key is not in the table."""
+		if not isinstance(key, str):
+			return None
+
+		encoded_key = key.encode("utf-8")
+		low, high = 0, len(self)
+		while low < high:
+			middle = (low + high) // 2
+			if self._key(middle) < encoded_key:
+				low = middle + 1
+			else:
+				high = middle
+
+		if low < len(self) and self._key(low) == encoded_key:
+			return low
+		return None
+
+
+class GlossSource(object):
+	"""Reads the glosses of the synsets of a data file on demand. Synsets of a WordNet that doesnt keep glosses in
+	memory refer to the GlossSource of their data file instead of storing the gloss text, as synset offsets are byte
+	offsets into the data file only the line of the synset is read.
+
+	Attributes:
+		path	(string)	the path of the data file
+	"""
+
+	def __init__(self, path):
+		self.path = path
+
+		self._map = None
+
+	def __getstate__(self):
+		"""Memory maps cant be pickled, the file is mapped again on demand."""
+		return {"path": self.path, "_map": None}
+
+	def read(self, offset):
+		"""Read the gloss of the synset at the given offset (string) from the data file."""
+		if self._map is None:
+			with open(self.path, "rb") as f:
+				self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+		position = int(offset)
+		end = self._map.find(b"\n", position)
+		line = self._map[position:len(self._map) if end == -1 else end].decode("utf-8")
+		return WordNet._parse_data_record(line.strip().split(" "))["gloss"]
+
 
 class Synset(object):
 	"""A Synset Class to easily access and manage Synsets.
@@ -367,22 +1988,26 @@ class Synset(object):
 	Attributes:
 		synset_id		(string)		combination of the ss_type and the offset of the synset to uniquely
 										identify the synset e.g. 'n03428529'
-		ss_type			(string)		single character indicating the pos of the synset -> n/v/a/s/r
-		offset			(string)		8 digit byte offset of the synset in the original wordnet database file of its ss_type
+		ss_type			(string)		single character indicating the pos of the synset -> n/v/a/s/r, derived from the synset id
+		offset			(string)		8 digit byte offset of the synset in the original wordnet database file of its ss_type,
+										derived from the synset id
 		sense_keys		(list)			the sense keys that are contained in the synset uniquely identifying a sense of a lemma,
 										in the following format: lemmy%ss_type:lex_filenum:lex_id:head_word:head_id
 										e.g. 'disease%1:26:00::'
 		words			(list)			words as annotated by lexicographer, case sensitive
 		relations		(dict)			keys are the relation names while values are synset_ids to the synsets the relation holds with
 										these values may also be tuples for ternary relations
-		gloss			(string)		the full gloss
-		definitions		(list)			a list of definitions as found in the gloss
-		examples		(list)			a list of examples as found in the gloss
+		gloss			(string)		the full gloss, read from the data file on every access if the synset was created
+										with a GlossSource instead of the gloss text
+		definitions		(list)			a list of definitions as found in the gloss, split on first access
+		examples		(list)			a list of examples as found in the gloss, split on first access
 
 	Methods:
 		update_relations	()
 	"""
 
+	__slots__ = ("synset_id", "sense_keys", "words", "relations", "_gloss", "_gloss_parts")
+
 	def __eq__(self, other):
 		"""Compare by synset id."""
 		return self.synset_id == other.synset_id
@@ -402,17 +2027,61 @@ class Synset(object):
 			sense_keys		(list)			a list of possible sense keys for that synset
 			words			(list)			the lemmas that synset can have
 			relations		(dict)			relations of the synset to other synsets
-			gloss			(string)		the gloss text
+			gloss			(string)		the gloss text or the GlossSource of the data file containing the synset
 		"""
-		self.__dict__.update(locals())
-		del self.__dict__["self"]
-
-		self.ss_type = synset_id[0]
-		self.offset = synset_id[1:]
-
-		gloss_parts = [part.strip() for part in gloss.split(";")]
-		self.definitions = [part for part in gloss_parts if not part.startswith('"') or not part.endswith('"')]
-		self.examples = [part for part in gloss_parts if part.startswith('"') and part.endswith('"')]
+		self.synset_id = intern_string(synset_id)
+		self.sense_keys = sense_keys
+		self.words = words
+		self.relations = relations
+		self._gloss = gloss
+		self._gloss_parts = None
+
+	def __setstate__(self, state):
+		"""Restore a pickled synset, including synsets pickled before slots were used."""
+		self._gloss_parts = None
+		set_slot_state(self, state)
+
+	@property
+	def gloss(self):
+		"""The full gloss."""
+		if isinstance(self._gloss, GlossSource):
+			return self._gloss.read(self.offset)
+		return self._gloss
+
+	@gloss.setter
+	def gloss(self, gloss):
+		self._gloss = gloss
+		self._gloss_parts = None
+
+	@property
+	def definitions(self):
+		"""The definitions in the gloss."""
+		return self._split_gloss()[0]
+
+	@property
+	def examples(self):
+		"""The examples in the gloss, quoted parts of the gloss."""
+		return self._split_gloss()[1]
+
+	@property
+	def ss_type(self):
+		"""Single character indicating the pos of the synset."""
+		return self.synset_id[0]
+
+	@property
+	def offset(self):
+		"""Byte offset of the synset in the data file of its ss_type."""
+		return self.synset_id[1:]
+
+	def _split_gloss(self):
+		"""Split the gloss into definitions and examples on first request."""
+		if self._gloss_parts is None:
+			gloss_parts = [part.strip() for part in self.gloss.split(";")]
+			self._gloss_parts = (
+				[part for part in gloss_parts if not part.startswith('"') or not part.endswith('"')],
+				[part for part in gloss_parts if part.startswith('"') and part.endswith('"')]
+			)
+		return self._gloss_parts
 
 	def update_relations(self, relations, wordnet):
 		"""Add a list of relations to this synset."""
@@ -420,9 +2089,11 @@ class Synset(object):
 			add_key(relation_type, self.relations, value=[])
 			for rel_member in relations[relation_type]:
 				if isinstance(rel_member, tuple) or isinstance(rel_member, list):
-					self.relations[relation_type].append(tuple(map(lambda m: wordnet.synset_id_from_key(m), rel_member)))
+					self.relations[relation_type].append(tuple(map(lambda m: intern_string(wordnet.synset_id_from_key(m)), rel_member)))
 				else:
-					self.relations[relation_type].append(wordnet.synset_id_from_key(rel_member))
+					self.relations[relation_type].append(intern_string(wordnet.synset_id_from_key(rel_member)))
+
+		wordnet._relations_changed()
 
 if __name__ == "__main__":
 	from pprint import pprint
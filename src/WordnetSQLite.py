@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# AUTHOR: Tonio Weidler
+
+"""Module contains a WordNet Interface that answers its queries from an indexed SQLite database instead of keeping
+the whole WordNet in memory."""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), "../"))
+
+import json
+import sqlite3
+import threading
+
+try:
+	from collections.abc import Mapping
+except ImportError:
+	from collections import Mapping
+
+from src.WordnetInterface import WordNet, Synset
+from src.util import LRUCache
+
+SQLITE_STORE_VERSION = 4
+
+SCHEMA = [
+	"CREATE TABLE meta (name TEXT PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID",
+	"CREATE TABLE lemmas (wordclass TEXT NOT NULL, lemma TEXT NOT NULL, pos TEXT, synset_cnt INTEGER, p_cnt INTEGER, ptr_symbol TEXT, sense_cnt INTEGER, tagsense_cnt INTEGER, synset_offsets TEXT, PRIMARY KEY (wordclass, lemma)) WITHOUT ROWID",
+	"CREATE TABLE exceptions (wordclass TEXT NOT NULL, form TEXT NOT NULL, base_forms TEXT NOT NULL, PRIMARY KEY (wordclass, form)) WITHOUT ROWID",
+	"CREATE TABLE sense_keys (sense_key TEXT PRIMARY KEY, synset_offset TEXT, sense_number INTEGER, tag_cnt INTEGER) WITHOUT ROWID",
+	"CREATE TABLE synsets (synset_id TEXT PRIMARY KEY, sense_keys TEXT, words TEXT, gloss TEXT) WITHOUT ROWID",
+	"CREATE TABLE relations (synset_id TEXT NOT NULL, relation TEXT NOT NULL, position INTEGER NOT NULL, member TEXT NOT NULL, is_tuple INTEGER NOT NULL, PRIMARY KEY (synset_id, relation, position)) WITHOUT ROWID",
+	"CREATE TABLE inverse_relations (member TEXT PRIMARY KEY, sources TEXT NOT NULL) WITHOUT ROWID"
+]
+
+# list fields are stored space separated, as neither lemmas, pointer symbols, offsets nor synset ids contain spaces
+LEMMA_FIELDS = ["pos", "synset_cnt", "p_cnt", "ptr_symbol", "sense_cnt", "tagsense_cnt", "synset_offsets"]
+LEMMA_LIST_FIELDS = ["ptr_symbol", "synset_offsets"]
+
+class SQLiteWordNet(WordNet):
+	"""Read-only WordNet backed by an SQLite database that contains the parsed database files, the sense keys and the
+	integrated relations. Lemmas, sense keys and synsets are looked up through indexed tables when they are requested,
+	so a process only holds the synsets it uses. The most recently used synsets are kept in a small hot cache.
+
+	The WordNet is read-only. A database connection is opened on first use in every thread and process, so the WordNet
+	can be pickled and passed to worker processes. The hot cache is not locked, so threads sharing the WordNet should
+	serialise their queries (as the WordNetServer does).
+
+	Attributes:
+		database_path	(string)		the path of the SQLite database
+		lemmas			(dict)			word classes as keys, SQLiteTables of the lemmas of that word class as values
+		sense_keys		(SQLiteTable)	sense keys as keys, the sense key infos as values
+		synsets			(SQLiteTable)	synset ids as keys, Synset Objects as values
+
+	Methods:
+		build					(None):				import a loaded WordNet into a new SQLite database
+		attach					(SQLiteWordNet):	open an SQLite database, rebuilding it if the sources changed
+		related_synset_ids		(list):				get the members of a relation of a synset without creating the synset
+	"""
+
+	def __init__(self, database_path, hot_cache_size=4096):
+		"""Open an SQLite database created by SQLiteWordNet.build.
+
+		Arguments:
+			database_path	(string)	the path of the SQLite database
+			hot_cache_size	(int)		the number of recently used synsets that are kept in memory
+		"""
+		self.database_path = database_path
+		self._local = threading.local()
+
+		meta = self._read_meta(database_path)
+		if meta is None:
+			raise ValueError("{0} is no WordNet SQLite database of version {1}.".format(database_path, SQLITE_STORE_VERSION))
+
+		self.__dict__.update(meta["attributes"])
+		self.lemmas = {wordclass: SQLiteTable(self, "lemmas", "lemma", "_lemma_from_row", condition=("wordclass", wordclass)) for wordclass in self.wordclasses}
+		self.exceptions = {wordclass: SQLiteTable(self, "exceptions", "form", "_exception_from_row", condition=("wordclass", wordclass)) for wordclass in self.wordclasses}
+		self.sense_keys = SQLiteTable(self, "sense_keys", "sense_key", "_sense_key_from_row")
+		self.synsets = SQLiteTable(self, "synsets", "synset_id", "_synset_from_row", hot_cache_size=hot_cache_size)
+		# building graphs would read every synset, queries follow the relations of the synsets like in lazy mode
+		self.lazy = True
+		self._init_transient_state()
+		self._inverse_relations = SQLiteTable(self, "inverse_relations", "member", "_inverse_relations_from_row")
+
+	def __getstate__(self):
+		"""Connections cant be pickled, they are opened again on demand."""
+		state = dict(self.__dict__)
+		del state["_local"]
+		return state
+
+	def __setstate__(self, state):
+		self.__dict__.update(state)
+		self._local = threading.local()
+
+	@classmethod
+	def build(cls, wordnet, database_path):
+		"""Import the lemmas, exception lists, sense keys, synsets, relations and inverse relations of a loaded WordNet into a new SQLite database.
+
+		Arguments:
+			wordnet			(WordNet)	the loaded WordNet, including the relations integrated from a relations file
+			database_path	(string)	the path the database will be written to
+		"""
+		print("...writing SQLite database")
+		state = wordnet._snapshot_state()
+		attributes = {attribute: value for attribute, value in state.items() if attribute not in ["lemmas", "synsets", "sense_keys", "exceptions", "_gloss_sources"]}
+
+		# write to a temporary file first so that readers never see a partial database
+		tmp_path = "{0}.{1}.tmp".format(database_path, os.getpid())
+		if os.path.exists(tmp_path):
+			os.remove(tmp_path)
+
+		database = sqlite3.connect(tmp_path)
+		try:
+			database.execute("PRAGMA journal_mode = OFF")
+			database.execute("PRAGMA synchronous = OFF")
+			for statement in SCHEMA:
+				database.execute(statement)
+
+			database.executemany("INSERT INTO meta VALUES (?, ?)", [(name, json.dumps(value)) for name, value in [
+				("version", SQLITE_STORE_VERSION),
+				("arguments", wordnet._snapshot_arguments()),
+				("sources", wordnet._fingerprint_sources(wordnet._snapshot_arguments())),
+				("attributes", attributes)
+			]])
+			database.executemany("INSERT INTO lemmas VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", (
+				(wordclass, lemma) + tuple(" ".join(info[field]) if field in LEMMA_LIST_FIELDS else info[field] for field in LEMMA_FIELDS)
+				for wordclass in wordnet.wordclasses for lemma, info in state["lemmas"][wordclass].items()
+			))
+			database.executemany("INSERT INTO exceptions VALUES (?, ?, ?)", (
+				(wordclass, form, " ".join(base_forms)) for wordclass in wordnet.wordclasses for form, base_forms in state["exceptions"][wordclass].items()
+			))
+			database.executemany("INSERT INTO sense_keys VALUES (?, ?, ?, ?)", (
+				(sense_key, info["synset_offset"], info["sense_number"], info["tag_cnt"]) for sense_key, info in state["sense_keys"].items()
+			))
+			database.executemany("INSERT INTO synsets VALUES (?, ?, ?, ?)", (
+				(synset_id, " ".join(synset.sense_keys), json.dumps(synset.words), synset.gloss) for synset_id, synset in state["synsets"].items()
+			))
+			database.executemany("INSERT INTO relations VALUES (?, ?, ?, ?, ?)", (
+				(synset_id, relation, position, " ".join(member) if isinstance(member, tuple) else member, isinstance(member, tuple))
+				for synset_id, synset in state["synsets"].items() for relation, members in synset.relations.items() for position, member in enumerate(members)
+			))
+			database.executemany("INSERT INTO inverse_relations VALUES (?, ?)", (
+				(member, json.dumps(sources)) for member, sources in wordnet._inverse_relation_index().items()
+			))
+			database.commit()
+		finally:
+			database.close()
+		os.replace(tmp_path, database_path)
+
+	@classmethod
+	def attach(cls, database_path, *args, **kwargs):
+		"""Open an SQLite database. If the database does not exist, is from an older version or any of its source files
+		changed, the WordNet is loaded from the database files and imported into a new database.
+
+		Arguments:
+			database_path	(string)	the path of the SQLite database
+			*args			()			optional constructor arguments of WordNet used for (re)building the database,
+										if omitted the arguments stored in the database are used
+
+		Returns:
+			(SQLiteWordNet):	the opened WordNet
+		"""
+		print("=== Opening WordNet SQLite database... ===")
+		meta = cls._read_meta(database_path)
+		arguments = cls._constructor_arguments(*args, **kwargs) if (args or kwargs) else (meta or {}).get("arguments")
+
+		if meta is None or not cls._same_content(arguments, meta["arguments"]) or not cls._sources_unchanged(meta["sources"], arguments):
+			if arguments is None:
+				raise ValueError("The SQLite database {0} is not usable and no arguments to rebuild it were provided.".format(database_path))
+			print("...database missing or outdated, rebuilding")
+			cls.build(WordNet(**arguments), database_path)
+
+		wordnet = cls(database_path)
+		print("...finished")
+		return wordnet
+
+	def related_synset_ids(self, synset_id, relation):
+		"""Get the ids of the members of a relation of a synset, reading only the relations table.
+
+		Returns:
+			(list):	synset ids, tuples of synset ids for ternary relations
+		"""
+		rows = self._connection().execute("SELECT member, is_tuple FROM relations WHERE synset_id = ? AND relation = ? ORDER BY position", (synset_id, relation))
+		return [tuple(member.split(" ")) if is_tuple else member for member, is_tuple in rows]
+
+	### PROTECTED ###
+
+	def _relations_changed(self):
+		raise TypeError("The SQLite WordNet {0} is read-only, relations cant be changed.".format(self.database_path))
+
+	def _connection(self):
+		"""Get the read-only connection of the current thread, connections are not shared with forked processes."""
+		if getattr(self._local, "pid", None) != os.getpid():
+			self._local.database = sqlite3.connect("file:{0}?mode=ro".format(self.database_path), uri=True)
+			self._local.pid = os.getpid()
+		return self._local.database
+
+	@staticmethod
+	def _read_meta(database_path):
+		"""Read the meta table of a database. None if the file doesnt exist or is not a database of the current version."""
+		if not os.path.isfile(database_path):
+			return None
+
+		try:
+			database = sqlite3.connect("file:{0}?mode=ro".format(database_path), uri=True)
+			try:
+				meta = {name: json.loads(value) for name, value in database.execute("SELECT name, value FROM meta")}
+			finally:
+				database.close()
+		except sqlite3.DatabaseError:
+			return None
+
+		return meta if meta.get("version") == SQLITE_STORE_VERSION else None
+
+	def _lemma_from_row(self, row, lemma):
+		info = dict(zip(LEMMA_FIELDS, row))
+		for field in LEMMA_LIST_FIELDS:
+			info[field] = info[field].split(" ") if info[field] else []
+		return info
+
+	def _exception_from_row(self, row, form):
+		return row[0].split(" ")
+
+	def _sense_key_from_row(self, row, sense_key):
+		return {"synset_offset": row[0], "sense_number": row[1], "tag_cnt": row[2]}
+
+	def _inverse_relations_from_row(self, row, member):
+		return json.loads(row[0])
+
+	def _synset_from_row(self, row, synset_id):
+		sense_keys, words, gloss = row
+		relations = {}
+		for relation, member, is_tuple in self._connection().execute("SELECT relation, member, is_tuple FROM relations WHERE synset_id = ? ORDER BY relation, position", (synset_id,)):
+			relations.setdefault(relation, []).append(tuple(member.split(" ")) if is_tuple else member)
+
+		return Synset(synset_id=synset_id, sense_keys=sense_keys.split(" ") if sense_keys else [], words=[tuple(word) for word in json.loads(words)], relations=relations, gloss=gloss)
+
+
+class SQLiteTable(Mapping):
+	"""Read-only mapping over a table of the SQLite database, keyed by its primary key (within a fixed condition, e.g.
+	the word class of the lemmas). Every operation is a single statement, sqlite3 caches the prepared statements.
+
+	Attributes:
+		wordnet			(SQLiteWordNet)		the WordNet providing the connection and decoding the rows
+		table			(string)			the name of the table
+		key				(string)			the name of the key column
+		decode			(string)			the name of the method of the WordNet that creates a value from a row and its key
+		condition		(tuple)				optional column name and value that all rows of this mapping have
+	"""
+
+	def __init__(self, wordnet, table, key, decode, condition=None, hot_cache_size=None):
+		self.wordnet = wordnet
+		self.table = table
+		self.key = key
+		self.decode = decode
+		self.condition = condition
+
+		self._hot = LRUCache(hot_cache_size) if hot_cache_size else None
+		columns = {"lemmas": ", ".join(LEMMA_FIELDS), "sense_keys": "synset_offset, sense_number, tag_cnt", "synsets": "sense_keys, words, gloss", "inverse_relations": "sources", "exceptions": "base_forms"}[table]
+		where = " AND {0} = ?".format(condition[0]) if condition else ""
+		self._parameters = (condition[1],) if condition else ()
+		self._select = "SELECT {0} FROM {1} WHERE {2} = ?{3}".format(columns, table, key, where)
+		self._exists = "SELECT 1 FROM {0} WHERE {1} = ?{2}".format(table, key, where)
+		self._keys = "SELECT {0} FROM {1} WHERE 1{2} ORDER BY {0}".format(key, table, where)
+		self._count = "SELECT COUNT(*) FROM {0} WHERE 1{1}".format(table, where)
+
+	def __getitem__(self, key):
+		if self._hot is not None:
+			value = self._hot.get(key)
+			if value is not None:
+				return value
+
+		row = self.wordnet._connection().execute(self._select, (key,) + self._parameters).fetchone()
+		if row is None:
+			raise KeyError(key)
+
+		value = getattr(self.wordnet, self.decode)(row, key)
+		if self._hot is not None:
+			self._hot.put(key, value)
+		return value
+
+	def __contains__(self, key):
+		if self._hot is not None and key in self._hot:
+			return True
+		return self.wordnet._connection().execute(self._exists, (key,) + self._parameters).fetchone() is not None
+
+	def __iter__(self):
+		for (key,) in self.wordnet._connection().execute(self._keys, self._parameters):
+			yield key
+
+	def __len__(self):
+		return self.wordnet._connection().execute(self._count, self._parameters).fetchone()[0]
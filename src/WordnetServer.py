@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# AUTHOR: Tonio Weidler
+
+"""Module contains a local HTTP server that answers the queries of a WordNet loaded once (including the extracted
+relations) for any number of tools, and a client with the same query methods as the WordNet Interface.
+
+Usage:
+	python3 src/WordnetServer.py [--snapshot PATH] [--wordnet-dir DIR] [--relations FILE ...] [--port PORT]
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), "../"))
+
+import json
+import time
+import queue
+import inspect
+import argparse
+import threading
+import builtins
+import http.client
+from concurrent.futures import Future
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from src.WordnetInterface import WordNet, Synset
+
+SERVER_METHODS = [
+	"synset_from_id", "synset_from_key", "synset_id_from_key", "synsets_for_lemma", "morphy", "lemmatize",
+	"get_hypernym_synsets", "get_similar_adjectives", "get_relation_sources", "is_hypernym_of",
+	"synsets_for_lemmas", "synset_ids_from_keys", "hypernyms_many"
+]
+# queries that are answered together by a batch method: the batch method, the argument collected from all requests
+# and the arguments that have to be equal for all requests of a batch
+BATCHED_QUERIES = {
+	"synsets_for_lemma": ("synsets_for_lemmas", "lemma", ["wordclass"]),
+	"synset_id_from_key": ("synset_ids_from_keys", "sense_key", []),
+	"get_hypernym_synsets": ("hypernyms_many", "synset", ["traversal_depth"])
+}
+
+def encode(value, synset_ids_only=False):
+	"""Encode a query argument or result as json compatible value. Synsets, tuples and sets are wrapped in marker
+	dicts so that decode can restore them, synsets are reduced to their id if synset_ids_only is True."""
+	if isinstance(value, Synset):
+		if synset_ids_only:
+			return {"__synset_id__": value.synset_id}
+		return {"__synset__": {
+			"synset_id": value.synset_id,
+			"sense_keys": value.sense_keys,
+			"words": encode(value.words),
+			"relations": encode(value.relations),
+			"gloss": value.gloss
+		}}
+	if isinstance(value, tuple):
+		return {"__tuple__": [encode(item, synset_ids_only) for item in value]}
+	if isinstance(value, (set, frozenset)):
+		return {"__set__": [encode(item, synset_ids_only) for item in value]}
+	if isinstance(value, list):
+		return [encode(item, synset_ids_only) for item in value]
+	if isinstance(value, dict):
+		return {key: encode(item, synset_ids_only) for key, item in value.items()}
+	return value
+
+def decode(value, wordnet=None):
+	"""Restore a value encoded by encode. Synset ids are resolved with the given WordNet."""
+	if isinstance(value, list):
+		return [decode(item, wordnet) for item in value]
+	if not isinstance(value, dict):
+		return value
+	if "__synset_id__" in value:
+		return wordnet.synset_from_id(value["__synset_id__"])
+	if "__synset__" in value:
+		fields = value["__synset__"]
+		return Synset(synset_id=fields["synset_id"], sense_keys=fields["sense_keys"], words=decode(fields["words"]), relations=decode(fields["relations"]), gloss=fields["gloss"])
+	if "__tuple__" in value:
+		return tuple(decode(item, wordnet) for item in value["__tuple__"])
+	if "__set__" in value:
+		return set(decode(item, wordnet) for item in value["__set__"])
+	return {key: decode(item, wordnet) for key, item in value.items()}
+
+
+class QueryRequest(object):
+	"""A query waiting for the dispatcher. Its arguments are kept as received and are only decoded and bound to the
+	parameter names of the query method by the dispatcher, as decoding synset ids reads from the WordNet."""
+
+	__slots__ = ("method", "args", "kwargs", "arguments", "future", "start")
+
+	def __init__(self, method, args, kwargs):
+		self.method = method
+		self.args = args
+		self.kwargs = kwargs
+		self.arguments = None
+		self.future = Future()
+		self.start = time.time()
+
+
+class WordNetServer(object):
+	"""Local HTTP server answering queries of a WordNet. Every query is a POST request to /[method] with a json body
+	{"args": [...], "kwargs": {...}}, the response contains the encoded result or the type and message of the raised
+	exception. GET /stats returns the latency statistics of every query method.
+
+	The connections are handled in threads, but all queries (including the lookup of the synsets passed as arguments)
+	are answered by a single dispatcher thread, so the WordNet (and its query caches) is never used concurrently. Requests arriving while the dispatcher answers a batch are queued
+	and answered together as the next batch, requests of the same query with the batch methods of the WordNet. A batch
+	window makes the dispatcher wait for further requests, trading latency for larger batches.
+
+	Attributes:
+		wordnet			(WordNet)	the WordNet that answers the queries
+		host			(string)	the address the server listens on
+		port			(int)		the port the server listens on, the chosen port if 0 was given
+		batch_window	(float)		seconds the dispatcher waits for further requests after the first one
+		max_batch_size	(int)		the maximal number of requests answered together
+
+	Methods:
+		serve_forever	(None):		answer requests until shutdown is called
+		start			(None):		answer requests in a background thread
+		shutdown		(None):		stop the server and the dispatcher
+		stats			(dict):		get the latency statistics of every query method
+		print_stats		(None):		print the latency statistics
+	"""
+
+	def __init__(self, wordnet, host="127.0.0.1", port=8765, batch_window=0.0, max_batch_size=1024):
+		"""Create the server, it starts answering requests with serve_forever or start.
+
+		Arguments:
+			wordnet			(WordNet)	the loaded WordNet, any variant of the WordNet Interface
+			host			(string)	the address to listen on, only local addresses should be used
+			port			(int)		the port to listen on, 0 chooses a free port
+			batch_window	(float)		seconds to wait for further requests that can be batched with the first one,
+										0 only batches the requests that are already queued
+			max_batch_size	(int)		the maximal number of requests answered together
+		"""
+		self.wordnet = wordnet
+		self.batch_window = batch_window
+		self.max_batch_size = max_batch_size
+		self._queue = queue.Queue()
+		self._stats = {}
+		self._stats_lock = threading.Lock()
+		self._signatures = {method: inspect.signature(getattr(type(wordnet), method)) for method in SERVER_METHODS}
+
+		self._http_server = ThreadingHTTPServer((host, port), self._handler_class())
+		self._http_server.daemon_threads = True
+		self.host, self.port = self._http_server.server_address[:2]
+		self._dispatcher = threading.Thread(target=self._dispatch, daemon=True)
+		self._dispatcher.start()
+
+	def serve_forever(self):
+		"""Answer requests until shutdown is called from another thread."""
+		print("serving WordNet on http://{0}:{1}/".format(self.host, self.port))
+		self._http_server.serve_forever()
+
+	def start(self):
+		"""Answer requests in a background thread."""
+		threading.Thread(target=self.serve_forever, daemon=True).start()
+
+	def shutdown(self):
+		"""Stop answering requests and stop the dispatcher."""
+		self._http_server.shutdown()
+		self._http_server.server_close()
+		self._queue.put(None)
+		self._dispatcher.join()
+
+	def query(self, method, args, kwargs):
+		"""Submit a query to the dispatcher and wait for its result, exceptions of the query are raised. The arguments
+		may be encoded with encode, they are decoded by the dispatcher."""
+		if method not in SERVER_METHODS:
+			raise AttributeError("The WordNet server has no query {0}.".format(method))
+		request = QueryRequest(method, args, kwargs)
+		self._queue.put(request)
+		return request.future.result()
+
+	def stats(self):
+		"""Get the latency statistics of the query methods.
+
+		Returns:
+			(dict):	query method names as keys, dicts with the number of requests, the number of those answered in
+					batches and the mean and maximal latency in milliseconds as values
+		"""
+		with self._stats_lock:
+			return {method: {
+				"requests": stats["requests"],
+				"batched": stats["batched"],
+				"mean_ms": 1000.0 * stats["total"] / stats["requests"],
+				"max_ms": 1000.0 * stats["max"]
+			} for method, stats in self._stats.items()}
+
+	def print_stats(self):
+		"""Print the latency statistics of the query methods."""
+		print("=== WordNet Server Latencies ===")
+		print("{0:<24}{1:>10}{2:>10}{3:>12}{4:>12}".format("query", "requests", "batched", "mean (ms)", "max (ms)"))
+		for method, stats in sorted(self.stats().items()):
+			print("{0:<24}{1:>10}{2:>10}{3:>12.3f}{4:>12.3f}".format(method, stats["requests"], stats["batched"], stats["mean_ms"], stats["max_ms"]))
+
+	def _handler_class(self):
+		"""Create the request handler class of the HTTP server, bound to this server."""
+		server = self
+
+		class QueryHandler(BaseHTTPRequestHandler):
+			# keep the connections of the clients open between requests
+			protocol_version = "HTTP/1.1"
+
+			def do_GET(self):
+				if self.path != "/stats":
+					return self._respond(404, {"error": {"type": "AttributeError", "message": "Unknown path {0}.".format(self.path)}})
+				self._respond(200, {"result": server.stats()})
+
+			def do_POST(self):
+				body = json.loads(self.rfile.read(int(self.headers["Content-Length"])).decode("utf-8"))
+				try:
+					result = server.query(self.path.lstrip("/"), body.get("args", []), body.get("kwargs", {}))
+				except Exception as e:
+					return self._respond(200, {"error": {"type": type(e).__name__, "message": str(e)}})
+				self._respond(200, {"result": encode(result)})
+
+			def _respond(self, status, content):
+				data = json.dumps(content).encode("utf-8")
+				self.send_response(status)
+				self.send_header("Content-Type", "application/json")
+				self.send_header("Content-Length", str(len(data)))
+				self.end_headers()
+				self.wfile.write(data)
+
+			def log_message(self, format, *args):
+				pass
+
+		return QueryHandler
+
+	def _dispatch(self):
+		"""Answer the queued requests in batches until None is queued."""
+		while True:
+			request = self._queue.get()
+			if request is None:
+				return
+			requests = [request]
+			deadline = time.time() + self.batch_window
+			while len(requests) < self.max_batch_size:
+				try:
+					request = self._queue.get(timeout=max(deadline - time.time(), 0))
+				except queue.Empty:
+					break
+				if request is None:
+					self._answer(requests)
+					return
+				requests.append(request)
+			self._answer(requests)
+
+	def _answer(self, requests):
+		"""Answer a batch of requests, requests of the same batchable query and equal remaining arguments are answered together."""
+		groups = {}
+		for request in requests:
+			try:
+				self._bind(request)
+			except Exception as e:
+				request.future.set_exception(e)
+				self._record(request, batched=False)
+				continue
+			if request.method not in BATCHED_QUERIES:
+				self._answer_single(request)
+				continue
+			batch_method, item_argument, group_arguments = BATCHED_QUERIES[request.method]
+			groups.setdefault((request.method,) + tuple(request.arguments[argument] for argument in group_arguments), []).append(request)
+
+		for key, group in groups.items():
+			if len(group) == 1:
+				self._answer_single(group[0])
+				continue
+			batch_method, item_argument, group_arguments = BATCHED_QUERIES[key[0]]
+			try:
+				results = getattr(self.wordnet, batch_method)([request.arguments[item_argument] for request in group], *key[1:])
+			except Exception:
+				# a single failing request fails the whole batch, the requests are answered one by one to find it
+				for request in group:
+					self._answer_single(request)
+				continue
+			for request, result in zip(group, results):
+				self._finish(request, result, batched=True)
+
+	def _bind(self, request):
+		"""Decode the arguments of a request and bind them to the parameter names of its query method."""
+		arguments = self._signatures[request.method].bind(self.wordnet, *decode(request.args, self.wordnet), **decode(request.kwargs, self.wordnet))
+		arguments.apply_defaults()
+		request.arguments = dict(list(arguments.arguments.items())[1:])
+
+	def _answer_single(self, request):
+		"""Answer a single request with the query method of the WordNet."""
+		try:
+			result = getattr(self.wordnet, request.method)(**request.arguments)
+		except Exception as e:
+			request.future.set_exception(e)
+			self._record(request, batched=False)
+			return
+		self._finish(request, result, batched=False)
+
+	def _finish(self, request, result, batched):
+		"""Hand the result to the waiting connection thread."""
+		request.future.set_result(result)
+		self._record(request, batched)
+
+	def _record(self, request, batched):
+		"""Add the latency of an answered request (including its time in the queue) to the statistics."""
+		latency = time.time() - request.start
+		with self._stats_lock:
+			stats = self._stats.setdefault(request.method, {"requests": 0, "batched": 0, "total": 0.0, "max": 0.0})
+			stats["requests"] += 1
+			stats["batched"] += 1 if batched else 0
+			stats["total"] += latency
+			stats["max"] = max(stats["max"], latency)
+
+
+class WordNetClient(object):
+	"""Client of a WordNetServer with the query methods of the WordNet Interface (see SERVER_METHODS), which return
+	the same types as the WordNet does. Synsets are transferred with their relations, so the integrated relations can
+	be read from them directly. Exceptions of the server are raised as the same built-in exception types.
+
+	Every thread uses its own connection, so a client can be shared between threads.
+
+	Attributes:
+		host	(string)	the address of the server
+		port	(int)		the port of the server
+
+	Methods:
+		server_stats	(dict):		get the latency statistics of the server
+		[query]			():			any query method of the WordNet Interface listed in SERVER_METHODS
+	"""
+
+	def __init__(self, host="127.0.0.1", port=8765):
+		self.host = host
+		self.port = port
+		self._local = threading.local()
+
+	def __getattr__(self, name):
+		if name in SERVER_METHODS:
+			return lambda *args, **kwargs: self._request("POST", "/" + name, {"args": encode(list(args), synset_ids_only=True), "kwargs": encode(kwargs, synset_ids_only=True)})
+		raise AttributeError("'{0}' object has no attribute '{1}'".format(type(self).__name__, name))
+
+	def __getstate__(self):
+		return {"host": self.host, "port": self.port}
+
+	def __setstate__(self, state):
+		self.__init__(**state)
+
+	def server_stats(self):
+		"""Get the latency statistics of the query methods of the server, see WordNetServer.stats."""
+		return self._request("GET", "/stats")
+
+	def _connection(self):
+		"""Get the connection of the current thread, connections are not shared with forked processes."""
+		if getattr(self._local, "pid", None) != os.getpid():
+			self._local.connection = http.client.HTTPConnection(self.host, self.port)
+			self._local.pid = os.getpid()
+		return self._local.connection
+
+	def _request(self, http_method, path, body=None):
+		"""Send a request to the server and get the decoded result, raise the exception of a failed query."""
+		connection = self._connection()
+		data = json.dumps(body).encode("utf-8") if body is not None else None
+		try:
+			connection.request(http_method, path, body=data, headers={"Content-Type": "application/json"})
+			response = json.loads(connection.getresponse().read().decode("utf-8"))
+		except (http.client.HTTPException, ConnectionError):
+			# the server closed the kept-alive connection, retry once with a new one
+			connection.close()
+			connection.request(http_method, path, body=data, headers={"Content-Type": "application/json"})
+			response = json.loads(connection.getresponse().read().decode("utf-8"))
+
+		if "error" in response:
+			exception_type = getattr(builtins, response["error"]["type"], None)
+			if not (isinstance(exception_type, type) and issubclass(exception_type, Exception)):
+				exception_type = RuntimeError
+			raise exception_type(response["error"]["message"])
+		return decode(response["result"])
+
+
+if __name__ == "__main__":
+	arg_parser = argparse.ArgumentParser()
+
+	arg_parser.add_argument("--snapshot",
+		required=False,
+		dest="snapshot",
+		default="extracted_data/wordnet_server.snapshot")
+
+	arg_parser.add_argument("--wordnet-dir",
+		required=False,
+		dest="wordnet_dir",
+		default="data/wordnet_database/")
+
+	arg_parser.add_argument("--relations",
+		required=False,
+		dest="relations",
+		nargs="*",
+		default=["extracted_data/relations_final_full.rel"])
+
+	arg_parser.add_argument("--host",
+		required=False,
+		dest="host",
+		default="127.0.0.1")
+
+	arg_parser.add_argument("--port",
+		required=False,
+		dest="port",
+		default=8765,
+		type=int)
+
+	arg_parser.add_argument("--batch-window",
+		required=False,
+		dest="batch_window",
+		default=0.0,
+		type=float)
+
+	arguments = arg_parser.parse_args()
+
+	wordnet = WordNet.from_snapshot(arguments.snapshot, arguments.wordnet_dir, "src/pointers/noun_pointers.txt", "src/pointers/adj_pointers.txt", "src/pointers/verb_pointers.txt", "src/pointers/adv_pointers.txt", relations_filename=arguments.relations or None)
+	server = WordNetServer(wordnet, host=arguments.host, port=arguments.port, batch_window=arguments.batch_window)
+	try:
+		server.serve_forever()
+	except KeyboardInterrupt:
+		pass
+	finally:
+		server.print_stats()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# AUTHOR: Tonio Weidler
+
+"""Module contains semantic similarity measures between synsets of the WordNet Interface."""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), "../"))
+
+import math
+from array import array
+
+from src.util import get_ss_type_from_sense_key
+
+MEASURES = ["path", "wup", "lch", "res", "lin"]
+
+class WordNetSimilarity(object):
+	"""Similarity measures between synsets based on the hypernymy taxonomy of a WordNet. Depths, ancestors and the
+	information content of all synsets are computed once when the object is created.
+
+	The taxonomy is spanned by hypernyms and instance hypernyms. As verbs have no single root, a virtual root above all
+	verb, adjective and adverb synsets is simulated for the path based measures (like nltk does). The information content of a synset is
+	derived from the tag counts of its sense keys in the sense index (add-one smoothed) and of all its hyponyms.
+
+	Attributes:
+		wordnet					(WordNet)		the WordNet whose synsets are compared
+		index					(AncestorIndex)	ancestors, distances and depths of all synsets
+		max_depths				(dict)			ss_types as keys, the largest depth of a synset of that ss_type as value
+		min_depths				(array)			length of the shortest path from every synset up to a root, indexed by synset number
+		information_content		(array)			information content of every synset, indexed by synset number
+
+	Methods:
+		path_similarity		(float):	inverse of the length of the shortest path between two synsets
+		wup_similarity		(float):	Wu-Palmer similarity, based on the depth of the synsets and their lowest common subsumer
+		lch_similarity		(float):	Leacock-Chodorow similarity, based on shortest path and the depth of the taxonomy
+		res_similarity		(float):	Resnik similarity, the information content of the most informative common subsumer
+		lin_similarity		(float):	Lin similarity, relating the Resnik similarity to the information content of both synsets
+		similarity_matrix	(list):		compute a similarity measure between all pairs of two lists of synsets
+	"""
+
+	def __init__(self, wordnet):
+		"""Precompute depths and information content.
+
+		Arguments:
+			wordnet		(WordNet)	the WordNet whose synsets are compared
+		"""
+		self.wordnet = wordnet
+		self.index = wordnet.ancestor_index(("hypernym", "instance_hypernym"))
+
+		self.max_depths = {}
+		self.min_depths = array("H", [0]) * len(self.index.graph)
+		for number, synset_id in enumerate(self.index.graph.synset_ids):
+			self.max_depths[synset_id[0]] = max(self.max_depths.get(synset_id[0], 0), self.index.depths[number])
+			self.min_depths[number] = min([distance for ancestor, distance in self.index.ancestors(number) if self.index.depths[ancestor] == 0] or [0])
+
+		self.information_content = self._compute_information_content()
+
+	### PUBLIC ###
+
+	def path_similarity(self, synset_a, synset_b):
+		"""Inverse of the length of the shortest path (via a common hypernym) between the synsets plus one, None if
+		the synsets are not connected."""
+		return self.similarity_matrix([synset_a], [synset_b], "path")[0][0]
+
+	def wup_similarity(self, synset_a, synset_b):
+		"""Wu-Palmer similarity: twice the depth of the deepest common subsumer divided by the depths of both synsets
+		(measured through that subsumer), None if the synsets are not connected."""
+		return self.similarity_matrix([synset_a], [synset_b], "wup")[0][0]
+
+	def lch_similarity(self, synset_a, synset_b):
+		"""Leacock-Chodorow similarity: -log(p / 2d) where p is the shortest path length and d the maximal depth of
+		the taxonomy, None if the synsets are of different ss_types or not connected."""
+		return self.similarity_matrix([synset_a], [synset_b], "lch")[0][0]
+
+	def res_similarity(self, synset_a, synset_b):
+		"""Resnik similarity: information content of the most informative common subsumer, None if there is none."""
+		return self.similarity_matrix([synset_a], [synset_b], "res")[0][0]
+
+	def lin_similarity(self, synset_a, synset_b):
+		"""Lin similarity: twice the Resnik similarity divided by the information content of both synsets, None if there
+		is no common subsumer."""
+		return self.similarity_matrix([synset_a], [synset_b], "lin")[0][0]
+
+	def similarity_matrix(self, synsets_a, synsets_b, measure="path"):
+		"""Compute a similarity measure between all pairs of synsets of two lists. The ancestors of every distinct synset
+		are looked up once and each pair is scored by intersecting the ancestor tables of both synsets.
+
+		Arguments:
+			synsets_a	(list)		synsets for the rows of the matrix
+			synsets_b	(list)		synsets for the columns of the matrix
+			measure		(string)	one of "path", "wup", "lch", "res" or "lin"
+
+		Returns:
+			(list):	list of rows, each a list of similarity values (None where the measure is undefined)
+		"""
+		if measure not in MEASURES:
+			raise ValueError("Unknown similarity measure {0}, use one of {1}.".format(measure, ", ".join(MEASURES)))
+
+		ancestor_tables = {}
+		for synset in list(synsets_a) + list(synsets_b):
+			if synset.synset_id not in ancestor_tables:
+				ancestor_tables[synset.synset_id] = self._ancestor_table(synset)
+
+		score = getattr(self, "_score_" + measure)
+		scores = {}
+		matrix = []
+		for synset_a in synsets_a:
+			row = []
+			for synset_b in synsets_b:
+				pair = (synset_a.synset_id, synset_b.synset_id)
+				if pair not in scores:
+					scores[pair] = score(synset_a, synset_b, ancestor_tables[pair[0]], ancestor_tables[pair[1]])
+				row.append(scores[pair])
+			matrix.append(row)
+
+		return matrix
+
+	### PROTECTED ###
+
+	def _compute_information_content(self):
+		"""Compute the information content of every synset from the tag counts of the sense keys.
+
+		Returns:
+			(array):	information content indexed by synset number
+		"""
+		numbers = self.index.graph.numbers
+		frequencies = array("d", [1.0]) * len(self.index.graph)
+		for sense_key, sense_key_info in self.wordnet.sense_keys.items():
+			synset_id = get_ss_type_from_sense_key(sense_key) + sense_key_info["synset_offset"]
+			if synset_id in numbers:
+				frequencies[numbers[synset_id]] += int(sense_key_info["tag_cnt"])
+
+		# every synset contributes its frequency to all of its ancestors
+		cumulated = array("d", frequencies)
+		totals = {}
+		for number, synset_id in enumerate(self.index.graph.synset_ids):
+			totals[synset_id[0]] = totals.get(synset_id[0], 0.0) + frequencies[number]
+			for ancestor, distance in self.index.ancestors(number):
+				cumulated[ancestor] += frequencies[number]
+
+		return array("d", [-math.log(cumulated[number] / totals[synset_id[0]]) for number, synset_id in enumerate(self.index.graph.synset_ids)])
+
+	def _ancestor_table(self, synset):
+		"""Get the ancestors of a synset (including itself at distance 0) as a dict of numbers and distances. The
+		virtual root is added with the number -1, one step above the most distant ancestor."""
+		number = self.index.graph.number(synset.synset_id)
+		table = dict(self.index.ancestors(number))
+		table[number] = 0
+		table[-1] = max(table.values()) + 1
+		return table
+
+	def _common_subsumers(self, synset_a, synset_b, table_a, table_b):
+		"""Get the numbers of the common subsumers of two synsets. The virtual root is only included if one of the
+		synsets is no noun, as nouns share a real root."""
+		if len(table_a) > len(table_b):
+			table_a, table_b = table_b, table_a
+		needs_root = synset_a.ss_type != "n" or synset_b.ss_type != "n"
+		return [number for number in table_a if number in table_b and (number != -1 or needs_root)]
+
+	def _name(self, number):
+		"""Get the first word of a synset (given by number) in lower case, used to order synsets like nltk does."""
+		if number == -1:
+			return ""
+		return self.wordnet.synset_from_id(self.index.graph.synset_ids[number]).words[0][0].lower()
+
+	def _shortest_path(self, synset_a, synset_b, table_a, table_b):
+		"""Length of the shortest path between two synsets via a common subsumer, None if there is none."""
+		subsumers = self._common_subsumers(synset_a, synset_b, table_a, table_b)
+		if not subsumers:
+			return None
+		return min(table_a[number] + table_b[number] for number in subsumers)
+
+	def _score_path(self, synset_a, synset_b, table_a, table_b):
+		distance = self._shortest_path(synset_a, synset_b, table_a, table_b)
+		return None if distance is None else 1.0 / (distance + 1)
+
+	def _score_wup(self, synset_a, synset_b, table_a, table_b):
+		subsumers = self._common_subsumers(synset_a, synset_b, table_a, table_b)
+		if not subsumers:
+			return None
+
+		# like nltk the subsumer with the largest minimal depth is used, preferring the first synset itself and
+		# breaking further ties by the name of the synsets (the virtual root comes first)
+		min_depth = lambda number: 0 if number == -1 else self.min_depths[number]
+		lowest = max(min_depth(number) for number in subsumers)
+		candidates = [number for number in subsumers if min_depth(number) == lowest]
+		subsumer = min(candidates, key=lambda number: (table_a[number] != 0, number != -1, self._name(number)))
+
+		depth = (0 if subsumer == -1 else self.index.depths[subsumer]) + 1
+		return (2.0 * depth) / (table_a[subsumer] + depth + table_b[subsumer] + depth)
+
+	def _score_lch(self, synset_a, synset_b, table_a, table_b):
+		if synset_a.ss_type != synset_b.ss_type:
+			return None
+
+		distance = self._shortest_path(synset_a, synset_b, table_a, table_b)
+		depth = self.max_depths.get(synset_a.ss_type, 0) + (0 if synset_a.ss_type == "n" else 1)
+		if distance is None:
+			return None
+		return -math.log((distance + 1) / (2.0 * depth))
+
+	def _lowest_common_subsumer_ic(self, synset_a, synset_b, table_a, table_b):
+		"""Information content of the most informative common subsumer, None if there is none."""
+		subsumers = [number for number in self._common_subsumers(synset_a, synset_b, table_a, table_b) if number != -1]
+		if not subsumers:
+			return None
+		return max(self.information_content[number] for number in subsumers)
+
+	def _score_res(self, synset_a, synset_b, table_a, table_b):
+		return self._lowest_common_subsumer_ic(synset_a, synset_b, table_a, table_b)
+
+	def _score_lin(self, synset_a, synset_b, table_a, table_b):
+		subsumer_ic = self._lowest_common_subsumer_ic(synset_a, synset_b, table_a, table_b)
+		if subsumer_ic is None:
+			return None
+
+		ic_a = self.information_content[self.index.graph.number(synset_a.synset_id)]
+		ic_b = self.information_content[self.index.graph.number(synset_b.synset_id)]
+		if ic_a + ic_b == 0:
+			return 1.0
+		return 2.0 * subsumer_ic / (ic_a + ic_b)
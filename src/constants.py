@@ -14,8 +14,68 @@ SS_TYPE_WORDCLASS_MAPPING = {
 	"r": "adv",
 	"s": "adj"
 }
+SS_TYPE_NUMBER_WORDCLASS_MAPPING = {
+	"1": "noun",
+	"2": "verb",
+	"3": "adj",
+	"4": "adv",
+	"5": "adj"
+}
 
 ADJECTIVE_POS = ["JJ", "JJS", "JJR"]
 NOUN_POS = ["NN", "NNS", "NNP", "NNPS"]
 ADVERB_POS = ["RB", "RBR", "RBS"]
 VERB_POS = ["VB", "VBD", "VBG", "VBN", "VBP", "VBZ"]
+
+# suffix substitutions (old suffix, new suffix) of the WordNet morphy algorithm for detaching inflections
+MORPHOLOGICAL_SUBSTITUTIONS = {
+	"noun": [("s", ""), ("ses", "s"), ("ves", "f"), ("xes", "x"), ("zes", "z"), ("ches", "ch"), ("shes", "sh"), ("men", "man"), ("ies", "y")],
+	"verb": [("s", ""), ("ies", "y"), ("es", "e"), ("es", ""), ("ed", "e"), ("ed", ""), ("ing", "e"), ("ing", "")],
+	"adj": [("er", ""), ("est", ""), ("er", "e"), ("est", "e")],
+	"adv": []
+}
+
+# relation types of WN-LMF files and the pointer symbols of the database files they correspond to
+LMF_RELATION_POINTERS = {
+	"antonym": "!",
+	"hypernym": "@",
+	"instance_hypernym": "@i",
+	"hyponym": "~",
+	"instance_hyponym": "~i",
+	"holo_member": "#m",
+	"holo_substance": "#s",
+	"holo_part": "#p",
+	"mero_member": "%m",
+	"mero_substance": "%s",
+	"mero_part": "%p",
+	"attribute": "=",
+	"derivation": "+",
+	"domain_topic": ";c",
+	"has_domain_topic": "-c",
+	"domain_region": ";r",
+	"has_domain_region": "-r",
+	"exemplifies": ";u",
+	"is_exemplified_by": "-u",
+	"entails": "*",
+	"causes": ">",
+	"also": "^",
+	"similar": "&",
+	"participle": "<",
+	"pertainym": "\\"
+}
+# word class specific deviations, verb groups are similar relations in WN-LMF
+LMF_WORDCLASS_RELATION_POINTERS = {
+	"verb": {"similar": "$"}
+}
+# escape sequences of characters in the sense ids of Open English WordNet
+LMF_SENSE_ID_ESCAPES = {
+	"ap": "'",
+	"ex": "!",
+	"cm": ",",
+	"cl": ":",
+	"pl": "+",
+	"sl": "/",
+	"lb": "(",
+	"rb": ")",
+	"sp": "_"
+}
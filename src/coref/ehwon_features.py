@@ -9,18 +9,19 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), "../../"))
 
 from pprint import pprint
-from nltk.stem import WordNetLemmatizer
 import itertools
 
-from src.WordnetInterface import WordNet
+from src.WordnetInterface import SharedWordNet
 import src.constants as CONSTANTS
 from src.util import is_verb, is_subj, is_obj
 
 # there is the need to create an global wordnet interface here, that can be used in the functions
 # else, with every function call it would have to be reinitialized
+# the interface is attached to a memory-mapped store, so all processes importing this module share one copy of it
 
-GLOBAL_WORDNET_INTERFACE = WordNet("data/wordnet_database/", "src/pointers/noun_pointers.txt", "src/pointers/adj_pointers.txt", "src/pointers/verb_pointers.txt", "src/pointers/adv_pointers.txt", relations_filename="extracted_data/relations_final_full.rel")
-wnl = WordNetLemmatizer()
+GLOBAL_WORDNET_INTERFACE = SharedWordNet.attach("extracted_data/wordnet_final_full.store", "data/wordnet_database/", "src/pointers/noun_pointers.txt", "src/pointers/adj_pointers.txt", "src/pointers/verb_pointers.txt", "src/pointers/adv_pointers.txt", relations_filename="extracted_data/relations_final_full.rel", keep_glosses=False)
+# the features query the same lemmas and synsets for many mention pairs
+GLOBAL_WORDNET_INTERFACE.enable_query_cache(report_at_exit=True)
 
 def antecedent_attribute_specification(anaphor, antecedent):
     """Compute whether the anaphor is a hypernym of the antecedent, specified by adjectives that are attributes of the antecedent.
@@ -76,7 +77,7 @@ def _calc_typical_action_congruency(phrase, paraphrase):
     if not is_verb(phrase_head_governor_token.pos): return phrase_performs_paraphrase_action
     if not is_subj(phrase_head_dependency_token.deprel) and not is_obj(phrase_head_dependency_token.deprel): return phrase_performs_paraphrase_action
 
-    phrase_head_governor_synsets = set([syn for syn in GLOBAL_WORDNET_INTERFACE.synsets_for_lemma(wnl.lemmatize(phrase_head_governor_token.form), "verb")])
+    phrase_head_governor_synsets = set([syn for syn in GLOBAL_WORDNET_INTERFACE.synsets_for_lemma(GLOBAL_WORDNET_INTERFACE.lemmatize(phrase_head_governor_token.form, "noun"), "verb")])
 
     if not phrase_head_governor_synsets: return phrase_performs_paraphrase_action
 
@@ -85,7 +86,7 @@ def _calc_typical_action_congruency(phrase, paraphrase):
 
     paraphrase_dependency_structure = list(itertools.chain(*paraphrase.document.dep))[paraphrase.span.begin:paraphrase.span.end+1]
     paraphrase_head_dependency_token = paraphrase_dependency_structure[paraphrase.attributes["head_index"]]
-    paraphrase_head_lemma = wnl.lemmatize(paraphrase_head_dependency_token.form, "n").lower()
+    paraphrase_head_lemma = GLOBAL_WORDNET_INTERFACE.lemmatize(paraphrase_head_dependency_token.form, "noun").lower()
     paraphrase_head_synsets = GLOBAL_WORDNET_INTERFACE.synsets_for_lemma(paraphrase_head_lemma, "noun")
 
     if paraphrase_head_synsets and is_verb(phrase_head_governor_token.pos) and potential_typical_actions_synset_ids:
@@ -107,7 +108,7 @@ def _calc_attribute_specification(phrase, paraphrase):
     specifies_with_attributes = False
     paraphrase_dependency_structure = list(itertools.chain(*paraphrase.document.dep))[paraphrase.span.begin:paraphrase.span.end+1]
     paraphrase_head_dependency_token = paraphrase_dependency_structure[paraphrase.attributes["head_index"]]
-    paraphrase_head_lemma = wnl.lemmatize(paraphrase_head_dependency_token.form, "n").lower()
+    paraphrase_head_lemma = GLOBAL_WORDNET_INTERFACE.lemmatize(paraphrase_head_dependency_token.form, "noun").lower()
     paraphrase_head_synsets = set(GLOBAL_WORDNET_INTERFACE.synsets_for_lemma(paraphrase_head_lemma, "noun"))
 
     paraphrase_head_adjectives = [t for t in paraphrase.document.dep[paraphrase.attributes["sentence_id"]] if t.head == paraphrase_head_dependency_token.index and t.pos in CONSTANTS.ADJECTIVE_POS]
@@ -115,7 +116,7 @@ def _calc_attribute_specification(phrase, paraphrase):
     # if the paraphrase has no adjectives at all simply return False as there cant be any congruency then
     if not paraphrase_head_adjectives: return specifies_with_attributes
 
-    paraphrase_head_adjective_lemmas = [wnl.lemmatize(t.form, "a").lower() for t in paraphrase_head_adjectives]
+    paraphrase_head_adjective_lemmas = [GLOBAL_WORDNET_INTERFACE.lemmatize(t.form, "adj").lower() for t in paraphrase_head_adjectives]
     paraphrase_head_adjectives_synsets = list(itertools.chain(*[[syn for syn in GLOBAL_WORDNET_INTERFACE.synsets_for_lemma(adjective, "adj")] for adjective in paraphrase_head_adjective_lemmas]))
     paraphrase_head_adjectives_synset_ids = set([syn.synset_id for syn in paraphrase_head_adjectives_synsets])
 
@@ -125,11 +126,11 @@ def _calc_attribute_specification(phrase, paraphrase):
 
     if phrase_head_dependency_token.pos not in CONSTANTS.NOUN_POS: return specifies_with_attributes
 
-    phrase_head_lemma = wnl.lemmatize(phrase_head_dependency_token.form, "n").lower()
+    phrase_head_lemma = GLOBAL_WORDNET_INTERFACE.lemmatize(phrase_head_dependency_token.form, "noun").lower()
     phrase_head_synsets = GLOBAL_WORDNET_INTERFACE.synsets_for_lemma(phrase_head_lemma, "noun")
 
     # get all phrase head synsets that have a synset of the paraphrase head as their hypernym
-    phrase_head_synsets_with_paraphrase_head_as_hypernym = [syn for syn in phrase_head_synsets if not set(GLOBAL_WORDNET_INTERFACE.get_hypernym_synsets(syn, traversal_depth=3)).isdisjoint(paraphrase_head_synsets)]
+    phrase_head_synsets_with_paraphrase_head_as_hypernym = [syn for syn in phrase_head_synsets if any(GLOBAL_WORDNET_INTERFACE.is_hypernym_of(hypernym, syn, max_depth=3) for hypernym in paraphrase_head_synsets)]
 
     if phrase_head_synsets_with_paraphrase_head_as_hypernym:
         pass
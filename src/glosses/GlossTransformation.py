@@ -270,12 +270,20 @@ class GlossTransformer(object):
 		disambiguated_variable_predicates = []
 		gloss_token_stack = gloss.tokens.copy()
 
+		# the lemma strings are derived on access, so they are computed once per token instead of once per predicate
+		token_lemma_strings = {}
+		for token_id, token in gloss.tokens.items():
+			lemma_strings = token.lemma_strings
+			if type(token) == CollocationHead:
+				lemma_strings = lemma_strings | set(coll.split("_")[0] for coll in lemma_strings)
+			token_lemma_strings[token_id] = lemma_strings
+
 		for i, pred in enumerate(variable_predicates):
 			self._mappable_predicates += 1
 			predicate_sense = "UNKNOWN"
 			for token_id in sorted(gloss_token_stack.keys()):
 				token = gloss.tokens[token_id]
-				if pred.lower() in token.lemma_strings or (type(token) == CollocationHead and pred.lower() in [coll.split("_")[0] for coll in token.lemma_strings]):
+				if pred.lower() in token_lemma_strings[token_id]:
 					if type(token) == CollocationMember:
 						for i in gloss.tokens:
 							t = gloss.tokens[i]
@@ -11,9 +11,21 @@ sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), "..
 from pprint import pprint
 import xml.etree.ElementTree as ET
 import re
+import mmap
+import json
+import struct
+import pickle
+import hashlib
 import datetime
+import itertools
+from concurrent.futures import ProcessPoolExecutor, as_completed
+try:
+	from collections.abc import Mapping
+except ImportError:
+	from collections import Mapping
 from src.glosses.Glosses import Token, CollocationHead, CollocationMember
-from nltk.corpus import wordnet as wn
+from src.WordnetInterface import MappedTable
+from src.WordnetSimilarity import WordNetSimilarity
 from itertools import product as list_product, combinations
 
 GLOSSTAG_POS_POSSIBLE_SS_TYPES = {
@@ -56,6 +68,53 @@ GLOSSTAG_POS_POSSIBLE_SS_TYPES = {
 	"WP$": [],
 	"WRB": [4]
 }
+# syntactic markers of adjectives in the data files, e.g. "galore(ip)"
+ADJECTIVE_MARKER = re.compile(r"\((a|p|ip)\)$")
+# bytes of a glosstag file that are parsed at once
+GLOSSTAG_CHUNK_SIZE = 1 << 20
+GLOSSTAG_STORE_MAGIC = b"EHWONGTS"
+GLOSSTAG_STORE_VERSION = 1
+MFS_TABLE_VERSION = 1
+
+class GlosstagSynsetFilter(object):
+	"""Parser target for the glosstag files that only builds the elements of the synsets with the requested ids, all
+	other synsets are skipped without creating any of their elements.
+
+	Attributes:
+		synset_ids	(container)	the ids of the synsets that are built, None to build all synsets
+		synsets		(list)		the completed synset elements, to be consumed by the caller
+	"""
+
+	def __init__(self, synset_ids):
+		self.synset_ids = synset_ids
+		self.synsets = []
+		self._builder = None
+		self._depth = 0
+
+	def start(self, tag, attrib):
+		if self._builder is None:
+			if tag != "synset" or (self.synset_ids is not None and attrib.get("id") not in self.synset_ids):
+				return
+			self._builder = ET.TreeBuilder()
+		self._depth += 1
+		self._builder.start(tag, attrib)
+
+	def end(self, tag):
+		if self._builder is None:
+			return
+		self._builder.end(tag)
+		self._depth -= 1
+		if self._depth == 0:
+			self.synsets.append(self._builder.close())
+			self._builder = None
+
+	def data(self, data):
+		if self._builder is not None:
+			self._builder.data(data)
+
+	def close(self):
+		pass
+
 
 class GlossDisambiguator(object):
 	"""Class that allows to disambiguate glosses using glosstag files and simple heuristics.
@@ -66,14 +125,24 @@ class GlossDisambiguator(object):
 		glosstag_files		(list)		list of paths to glosstag_files that will be used before applying
 										the heuristic
 		reference_wordnet	(WordNet)	a WordNet object thats used as reference when disambiguating
+		workers				(int)		number of processes that merge the glosstag files (or build their token stores)
+										in parallel, None or 1 to merge them one after another
+		token_store_dir		(string)	optional directory of GlosstagTokenStores of the glosstag files, which are
+										built on first use; the tokens are then looked up instead of parsing the files
+		mfs_table_path		(string)	optional path of a file storing the most frequent senses of the glosstag lemmas
+										between runs, it is discarded when the reference WordNet changes
 
 	Methods:
 		disambiguate_glosses	(dict)	disambiguate the glosses so far as it is possible and return
 										the modified dict of glosses
 	"""
-	def __init__(self, glosses, glosstag_files, reference_wordnet):
+	def __init__(self, glosses, glosstag_files, reference_wordnet, workers=None, token_store_dir=None, mfs_table_path=None):
 		self.__dict__.update(locals())
 		del self.__dict__["self"]
+		self._similarity = None
+		self._candidate_senses = None
+		self._mfs_table = None
+		self._mfs_table_changed = False
 
 		# LOGGING
 		log_dir = "log/"
@@ -88,10 +157,19 @@ class GlossDisambiguator(object):
 	def disambiguate_glosses(self):
 		print("=== Disambiguating Glosses... ===")
 		print("merging files...")
-		for f in self.glosstag_files:
-			print("...{0}".format(f))
-			merged_glosses = self._merge_glosses_with_glosstag_file(f)
+		if self.workers and self.workers > 1 and self.token_store_dir is None:
+			print("...{0} in {1} processes".format(", ".join(self.glosstag_files), self.workers))
+			merged_glosses = self._merge_glosstag_files_in_parallel()
+		else:
+			# looking up the tokens in the token stores is cheaper than starting processes, only building them is not
+			if self.workers and self.workers > 1:
+				self._build_token_stores_in_parallel()
+			for f in self.glosstag_files:
+				print("...{0}".format(f))
+				merged_glosses = self._merge_glosses_with_glosstag_file(f)
 		disambiguated = self._disambiguate_merged_glosses(merged_glosses)
+		if self.mfs_table_path is not None and self._mfs_table_changed:
+			self._write_mfs_table()
 
 		# check if keys were logged, if not delete empty logfile
 		if len(self._logged_messages) == 0:
@@ -103,10 +181,103 @@ class GlossDisambiguator(object):
 
 	def _merge_glosses_with_glosstag_file(self, glosstag_file):
 		"""Merge the glosstag file information into the gloss objects."""
-		glosses = self.glosses
-		tree = ET.parse(glosstag_file)
-		root = tree.getroot()
-
+		if self.token_store_dir is None:
+			return self._merge_token_tables(*self._glosstag_token_tables(glosstag_file, self.glosses))
+
+		store = GlosstagTokenStore.open(glosstag_file, self._token_store_path(glosstag_file))
+		token_tables = {}
+		messages = []
+		for synset_id in self.glosses:
+			record = store.get(synset_id)
+			if record is not None:
+				token_tables[synset_id] = record[0]
+				messages += record[1]
+
+		return self._merge_token_tables(token_tables, messages)
+
+	def _merge_glosstag_files_in_parallel(self):
+		"""Merge the glosstag files in a process pool. Files larger than their share of the total size are split into
+		byte range shards at synset boundaries, so the merge takes about as long as the largest shard.
+
+		Returns:
+			(dict):	the glosses with their merged tokens
+		"""
+		max_shard_size = sum(os.path.getsize(f) for f in self.glosstag_files) // self.workers + 1
+		shards = [(f, shard) for f in self.glosstag_files for shard in self._glosstag_shards(f, max_shard_size)]
+		# the largest shards are submitted first, so that the small ones fill the gaps at the end
+		shards.sort(key=lambda item: -(item[1][1] - item[1][0]) if item[1] is not None else -os.path.getsize(item[0]))
+
+		synset_ids = set(self.glosses)
+		with ProcessPoolExecutor(max_workers=self.workers) as pool:
+			futures = [pool.submit(GlossDisambiguator._glosstag_token_tables, f, synset_ids, shard) for f, shard in shards]
+			for future in as_completed(futures):
+				self._merge_token_tables(*future.result())
+
+		return self.glosses
+
+	def _build_token_stores_in_parallel(self):
+		"""Build the missing or outdated token stores of the glosstag files in a process pool. The files are split into
+		shards like when merging in parallel, the workers pickle the records of their shards and the stores are
+		written by this process."""
+		outdated = [f for f in self.glosstag_files if GlosstagTokenStore.outdated(f, self._token_store_path(f))]
+		if not outdated:
+			return
+
+		print("...building the token stores of {0} in {1} processes".format(", ".join(outdated), self.workers))
+		max_shard_size = sum(os.path.getsize(f) for f in outdated) // self.workers + 1
+		shards = [(f, shard) for f in outdated for shard in self._glosstag_shards(f, max_shard_size)]
+
+		with ProcessPoolExecutor(max_workers=self.workers) as pool:
+			futures = [pool.submit(GlosstagTokenStore.records, f, shard) for f, shard in shards]
+			records = {f: [] for f in outdated}
+			# the records are kept in file order, so that the stores dont depend on the order the shards finish in
+			for (f, shard), future in zip(shards, futures):
+				records[f] += future.result()
+
+		for f in outdated:
+			GlosstagTokenStore.build(f, self._token_store_path(f), records[f])
+
+	def _token_store_path(self, glosstag_file):
+		"""Get the path of the token store of a glosstag file in the token store directory."""
+		return os.path.join(self.token_store_dir, os.path.splitext(os.path.basename(glosstag_file))[0] + ".tokens")
+
+	def _merge_token_tables(self, token_tables, messages):
+		"""Add the tokens of the token tables to the glosses and log the messages created while reading them."""
+		for message in messages:
+			self._log_message(message)
+		for synset_id, tokens in token_tables.items():
+			self.glosses[synset_id].tokens.update(tokens)
+
+		return self.glosses
+
+	@staticmethod
+	def _glosstag_token_tables(glosstag_file, synset_ids, shard=None):
+		"""Create the Token objects of the glosses of the given synsets from a glosstag file. Runs in worker processes
+		when merging in parallel, so it doesnt change the glosses but returns the tokens.
+
+		Arguments:
+			glosstag_file	(string)		path of the glosstag file
+			synset_ids		(container)		ids of the synsets whose tokens are created
+			shard			(tuple)			optional (start, end) byte range of the file, see _glosstag_shards
+
+		Returns:
+			(tuple):	dict of synset ids and dicts of token ids and Token objects, list of log messages
+		"""
+		token_tables = {}
+		messages = []
+		for synset_id, token_table, synset_messages in GlossDisambiguator._iter_glosstag_token_tables(glosstag_file, synset_ids, shard):
+			token_tables[synset_id] = token_table
+			messages += synset_messages
+
+		return token_tables, messages
+
+	@staticmethod
+	def _iter_glosstag_token_tables(glosstag_file, synset_ids, shard=None):
+		"""Stream the Token objects of the glosses of the given synsets from a glosstag file, see _glosstag_token_tables.
+
+		Yields:
+			(tuple):	synset id, dict of token ids and Token objects, list of log messages of the synset
+		"""
 		def resolve_wrapper_nodes(node_list):
 			resolved_nodes = []
 			for node in node_list:
@@ -118,118 +289,174 @@ class GlossDisambiguator(object):
 			return resolved_nodes
 
 
-		# assign glosstag file WSD to the glosses
-		for synset in root:
+		# assign glosstag file WSD to the glosses, only the synsets of the glosses are built
+		for synset in GlossDisambiguator._iter_glosstag_synsets(glosstag_file, synset_ids, shard):
 			synset_id = synset.attrib["id"]
-			if synset_id in glosses:
-				gloss_def = synset.find("./gloss/[@desc='wsd']/def")
-				tokens = resolve_wrapper_nodes(gloss_def.findall("*"))
-				# travers through all tokens in the glosstag gloss, create Token objects for them and append them to the token list in the gloss
-				for token in tokens:
-					if "pos" in list(token.keys()):
-						pos = token.attrib["pos"]
+			token_table = {}
+			messages = []
+			gloss_def = synset.find("./gloss/[@desc='wsd']/def")
+			tokens = resolve_wrapper_nodes(gloss_def.findall("*"))
+			# travers through all tokens in the glosstag gloss, create Token objects for them and append them to the token list in the gloss
+			for token in tokens:
+				if "pos" in list(token.keys()):
+					pos = token.attrib["pos"]
+				else:
+					pos = "unknown"
+					messages.append("NO POS: {0}".format(synset_id))
+
+				token_object = None
+				token_id_in_gloss = int(re.search("_[a-z]+([0-9]+)", token.attrib["id"]).group(1))
+				anno_tag = token.attrib["tag"]
+
+				# check if its a collocation or a normal wf
+				if token.tag == "wf":
+					if "lemma" in list(token.keys()):
+						lemma = token.attrib["lemma"]
+					elif "pos" in list(token.keys()):
+						lemma = token.attrib["pos"]
+
+					# handle different annotation scenarios
+					if anno_tag == "ignore":
+						# token is not part of WN
+						token_original_form = token.text
+						token_wn_synset_offset = None
+						token_wn_sense_key = None
+
+					elif anno_tag == "un":
+						# token is part of WN but wasnt disambiguated
+						token_original_form = token.text
+						token_wn_synset_offset = None
+						token_wn_sense_key = None
+
 					else:
-						pos = "unknown"
-						self._log_message("NO POS: {0}".format(synset_id))
+						# token is disambiguated, Disambiguation is in id tag inside the wf tag
+						disambiguation = token.find("id")
+
+						token_original_form = disambiguation.tail
+						token_wn_synset_offset = ""
+						token_wn_sense_key = disambiguation.attrib["sk"]
+
+					token_object = Token(token_id_in_gloss, token_original_form, lemma, token_wn_synset_offset, token_wn_sense_key, anno_tag, pos)
+
+				elif token.tag == "cf":
+					token_wn_synset_offset = None
+					token_wn_sense_key = None
+
+					# handle different tyoes of collocations
+					if token.find("glob") is not None:
+						# cf is the collocation head and may contain a disambiguated id
+						collocation_glob = token.find("glob")
+						token_original_form = collocation_glob.tail
+						collocation_id = token.attrib["coll"].split(",")
+						if "lemma" in list(collocation_glob.keys()):
+							lemma = collocation_glob.attrib["lemma"]
+						elif "pos" in list(collocation_glob.keys()):
+							lemma = collocation_glob.attrib["pos"]
+
+						if collocation_glob.attrib["tag"] == "un":
+							# cf was not disambiguated
+							collocation_lemma = collocation_glob.attrib["lemma"]
+							collocation_wn_sense_key = None
+							collocation_tag = collocation_glob.attrib["tag"]
+
+						elif collocation_glob.attrib["tag"] == "ignore":
+							# that makes no sense
+							print("IGNORED CF HEAD GLOB FOUND")
+						else:
+							# cf is disambiguated inside the globs id tag
+							disambiguation = collocation_glob.find("id")
+							collocation_lemma = disambiguation.attrib["lemma"]
+							collocation_wn_sense_key = disambiguation.attrib["sk"]
+							collocation_tag = collocation_glob.attrib["tag"]
 
-					token_object = None
-					token_id_in_gloss = int(re.search("_[a-z]+([0-9]+)", token.attrib["id"]).group(1))
-					anno_tag = token.attrib["tag"]
+						token_object = CollocationHead(token_id_in_gloss, token_original_form, lemma, token_wn_synset_offset, token_wn_sense_key, anno_tag, pos, collocation_id, collocation_lemma, collocation_wn_sense_key, collocation_tag)
 
-					# check if its a collocation or a normal wf
-					if token.tag == "wf":
+					else:
+						# cf is not the head of a collocation
+						token_original_form = token.text
+						collocation_id = token.attrib["coll"].split(",")
 						if "lemma" in list(token.keys()):
 							lemma = token.attrib["lemma"]
 						elif "pos" in list(token.keys()):
 							lemma = token.attrib["pos"]
 
-						# handle different annotation scenarios
-						if anno_tag == "ignore":
-							# token is not part of WN
-							token_original_form = token.text
-							token_wn_synset_offset = None
-							token_wn_sense_key = None
-
-						elif anno_tag == "un":
-							# token is part of WN but wasnt disambiguated
-							token_original_form = token.text
-							token_wn_synset_offset = None
-							token_wn_sense_key = None
-
-						else:
-							# token is disambiguated, Disambiguation is in id tag inside the wf tag
-							disambiguation = token.find("id")
-
-							token_original_form = disambiguation.tail
-							token_wn_synset_offset = ""
-							token_wn_sense_key = disambiguation.attrib["sk"]
-
-						token_object = Token(token_id_in_gloss, token_original_form, lemma, token_wn_synset_offset, token_wn_sense_key, anno_tag, pos)
+						token_object = CollocationMember(token_id_in_gloss, token_original_form, lemma, token_wn_synset_offset, token_wn_sense_key, anno_tag, pos, collocation_id)
 
-					elif token.tag == "cf":
-						token_wn_synset_offset = None
-						token_wn_sense_key = None
+				else:
+					messages.append("WARNING: unknown token tag '{0}'".format(token.tag))
+					token_object = None
 
-						# handle different tyoes of collocations
-						if token.find("glob") is not None:
-							# cf is the collocation head and may contain a disambiguated id
-							collocation_glob = token.find("glob")
-							token_original_form = collocation_glob.tail
-							collocation_id = token.attrib["coll"].split(",")
-							if "lemma" in list(collocation_glob.keys()):
-								lemma = collocation_glob.attrib["lemma"]
-							elif "pos" in list(collocation_glob.keys()):
-								lemma = collocation_glob.attrib["pos"]
-
-							if collocation_glob.attrib["tag"] == "un":
-								# cf was not disambiguated
-								collocation_lemma = collocation_glob.attrib["lemma"]
-								collocation_wn_sense_key = None
-								collocation_tag = collocation_glob.attrib["tag"]
-
-							elif collocation_glob.attrib["tag"] == "ignore":
-								# that makes no sense
-								print("IGNORED CF HEAD GLOB FOUND")
-							else:
-								# cf is disambiguated inside the globs id tag
-								disambiguation = collocation_glob.find("id")
-								collocation_lemma = disambiguation.attrib["lemma"]
-								collocation_wn_sense_key = disambiguation.attrib["sk"]
-								collocation_tag = collocation_glob.attrib["tag"]
-
-							token_object = CollocationHead(token_id_in_gloss, token_original_form, lemma, token_wn_synset_offset, token_wn_sense_key, anno_tag, pos, collocation_id, collocation_lemma, collocation_wn_sense_key, collocation_tag)
 
-						else:
-							# cf is not the head of a collocation
-							token_original_form = token.text
-							collocation_id = token.attrib["coll"].split(",")
-							if "lemma" in list(token.keys()):
-								lemma = token.attrib["lemma"]
-							elif "pos" in list(token.keys()):
-								lemma = token.attrib["pos"]
+				token_table[token_id_in_gloss] = token_object
 
-							token_object = CollocationMember(token_id_in_gloss, token_original_form, lemma, token_wn_synset_offset, token_wn_sense_key, anno_tag, pos, collocation_id)
+			yield synset_id, token_table, messages
 
-					else:
-						self._log_message("WARNING: unknown token tag '{0}'".format(token.tag))
-						token_object = None
+	@staticmethod
+	def _iter_glosstag_synsets(glosstag_file, synset_ids, shard=None):
+		"""Stream the synset elements of a glosstag file whose ids are in synset_ids. The file is parsed in chunks and
+		every synset element is dropped after it was consumed, so the memory does not grow with the file size.
 
+		Arguments:
+			glosstag_file	(string)		path of the glosstag file
+			synset_ids		(container)		ids of the synsets that are streamed
+			shard			(tuple)			optional (start, end) byte range of the file that is read, it has to
+											start and end at synset boundaries
 
-					glosses[synset_id].tokens[token_id_in_gloss] = token_object
-		return glosses
+		Yields:
+			Element:	a synset element with all its children
+		"""
+		target = GlosstagSynsetFilter(synset_ids)
+		parser = ET.XMLParser(target=target)
+		with open(glosstag_file, "rb") as f:
+			if shard is None:
+				chunks = iter(lambda: f.read(GLOSSTAG_CHUNK_SIZE), b"")
+			else:
+				# the synsets of a shard are wrapped in a root element of their own
+				f.seek(shard[0])
+				parser.feed(b"<shard>")
+				chunks = itertools.chain(iter(lambda: f.read(min(GLOSSTAG_CHUNK_SIZE, shard[1] - f.tell())), b""), [b"</shard>"])
+			for chunk in chunks:
+				parser.feed(chunk)
+				completed, target.synsets = target.synsets, []
+				for synset in completed:
+					yield synset
+		parser.close()
+
+	@staticmethod
+	def _glosstag_shards(glosstag_file, max_shard_size):
+		"""Split a glosstag file into byte ranges of about max_shard_size bytes that start and end at synset boundaries.
+
+		Returns:
+			(list):	(start, end) tuples, [None] if the file is not larger than max_shard_size
+		"""
+		if os.path.getsize(glosstag_file) <= max_shard_size:
+			return [None]
+
+		with open(glosstag_file, "rb") as f:
+			data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+			try:
+				end = data.rfind(b"</synset>") + len(b"</synset>")
+				boundaries = [data.find(b"<synset ")]
+				while boundaries[-1] + max_shard_size < end:
+					boundary = data.find(b"<synset ", boundaries[-1] + max_shard_size, end)
+					if boundary == -1:
+						break
+					boundaries.append(boundary)
+			finally:
+				data.close()
+
+		return list(zip(boundaries, boundaries[1:] + [end]))
 
 	def _disambiguate_merged_glosses(self, merged_glosses):
 		"""Disambiguate all Glosses where it is still needed after disambiguation. This NEEDS the
 		information about poss/lemmas/collocations from the glosstagsfile, merging first is NOT OPTIONAL!"""
 		processed_glosses = {}
-		total_glosses = len(merged_glosses)
-		current_gloss = 0
 		disambiguated_glosses_count = 0
 		skipped_glosses_count = 0
+		taggable_glosses = []
 
 		# go over all glosses and disambiguate them if possible
 		for gloss_key in merged_glosses:
-			current_gloss += 1
 			gloss = merged_glosses[gloss_key]
 			taggable_tokens = []
 			tagged_tokens = []
@@ -248,20 +475,19 @@ class GlossDisambiguator(object):
 				elif token.tag == "un" and re.match("([a-z]+%[0-9]\|?)+", token.lemma) and not set(GLOSSTAG_POS_POSSIBLE_SS_TYPES[token.pos]).isdisjoint(set(tokens_wn_ss_types)) and type(token) != CollocationMember:
 					taggable_tokens.append(token)
 
+			# the glosses are disambiguated in place, so they keep their position in the output
+			processed_glosses[gloss_key] = gloss
+
 			# if there are no remaining taggable tokens, then proceed with the next gloss
 			if len(taggable_tokens) == 0:
-				processed_glosses[gloss_key] = gloss
 				skipped_glosses_count += 1
 				continue
 			disambiguated_glosses_count += 1
+			taggable_glosses.append((gloss, taggable_tokens, tagged_tokens))
 
-			## DISAMBUGATION PROCEDURE ##
-			print("\tat gloss {0} of {1}".format(current_gloss, total_glosses))
-			print("\t\t...disambiguating {0} words in gloss {1}".format(len(taggable_tokens), gloss_key))
-			# disambiguated_gloss = self._disambiguate_gloss_with_path_similarity(gloss, taggable_tokens, tagged_tokens)
-			disambiguated_gloss = self._disambiguate_gloss_by_most_frequent_sense(gloss, taggable_tokens, tagged_tokens)
-			# finished, append to output
-			processed_glosses[gloss_key] = disambiguated_gloss
+		## DISAMBUGATION PROCEDURE ##
+		print("\t...disambiguating {0} words in {1} glosses".format(sum(len(taggable_tokens) for gloss, taggable_tokens, tagged_tokens in taggable_glosses), len(taggable_glosses)))
+		self._disambiguate_glosses_by_most_frequent_sense(taggable_glosses)
 
 		print("\tdisambiguated {0} glosses, skipped {1}".format(disambiguated_glosses_count, skipped_glosses_count))
 
@@ -269,16 +495,33 @@ class GlossDisambiguator(object):
 
 	## Disambiguation Methods ##
 
+	def _disambiguate_glosses_by_most_frequent_sense(self, taggable_glosses):
+		"""Batch variant of _disambiguate_gloss_by_most_frequent_sense for many glosses. The most frequent senses of
+		all distinct lemmas and POS of the tokens are resolved in one pass before they are assigned.
+
+		Arguments:
+			taggable_glosses	(list)	(gloss, taggable tokens, tagged tokens) tuples
+
+		Returns:
+			(list):	the disambiguated glosses
+		"""
+		mfs_table = self._most_frequent_sense_table()
+		missing = set((token.lemma, token.pos) for gloss, taggable_tokens, tagged_tokens in taggable_glosses for token in taggable_tokens) - set(mfs_table)
+		for lemma, pos in missing:
+			mfs_table[(lemma, pos)] = self._find_most_frequent_sense(lemma, pos)
+		self._mfs_table_changed = self._mfs_table_changed or bool(missing)
+
+		return [self._disambiguate_gloss_by_most_frequent_sense(gloss, taggable_tokens, tagged_tokens) for gloss, taggable_tokens, tagged_tokens in taggable_glosses]
+
 	def _disambiguate_gloss_by_most_frequent_sense(self, gloss, taggable_tokens, tagged_tokens):
 		"""Simple disambiguation heuristic assigning the most frequent sense to each token without a sense."""
 		disambiguated_gloss = gloss
 
 		for undisambiguated_token in taggable_tokens:
-			possible_senses = self._get_possible_wn_senses_for_token(undisambiguated_token)
+			most_frequent_sense = self._most_frequent_sense(undisambiguated_token)
 
-			if len(possible_senses) != 0:
-				most_frequent_sense = max(possible_senses, key=lambda sense_key: self.reference_wordnet.sense_keys[sense_key]["tag_cnt"])
-				synset_offset = self.reference_wordnet.sense_keys[most_frequent_sense]["synset_offset"]
+			if most_frequent_sense is not None:
+				most_frequent_sense, synset_offset = most_frequent_sense
 			else:
 				most_frequent_sense = "no_wn_sense_existing"
 				synset_offset = "no_wn_sense_existing"
@@ -349,42 +592,124 @@ class GlossDisambiguator(object):
 
 	def _get_possible_wn_senses_for_token(self, token):
 		"""Retrieve all possible senses for a token considering its POS."""
+		if self._candidate_senses is None:
+			self._candidate_senses = self._build_candidate_sense_index()
+
 		lemmas = token.lemma.split("|")
-		possible_wn_senses = []
+		possible_wn_senses = set()
 
 		for lemma in lemmas:
 			lemma_raw, lemma_ss_type = lemma.split("%")
 			if int(lemma_ss_type) in GLOSSTAG_POS_POSSIBLE_SS_TYPES[token.pos]:
-				lemma_pos = {1: "n", 2: "v", 3: "a", 4: "r", 5: "s"}[int(lemma_ss_type)]
-				synsets = wn.synsets(lemma_raw, lemma_pos)
-
-				for synset in synsets:
-					for l in synset.lemmas():
-						if l.name() == lemma_raw and str(l.key()) in self.reference_wordnet.sense_keys:
-							possible_wn_senses.append(l.key())
-
-		return set(possible_wn_senses)
+				possible_wn_senses.update(self._candidate_senses.get((lemma_raw, int(lemma_ss_type)), ()))
+
+		return possible_wn_senses
+
+	def _most_frequent_sense(self, token):
+		"""Get the most frequent sense of a token from the MFS table, resolving it if the lemma and POS of the token are new.
+
+		Returns:
+			(tuple):	the sense key and its synset offset, None if the token has no possible sense
+		"""
+		mfs_table = self._most_frequent_sense_table()
+		key = (token.lemma, token.pos)
+		if key not in mfs_table:
+			mfs_table[key] = self._find_most_frequent_sense(token.lemma, token.pos)
+			self._mfs_table_changed = True
+		return mfs_table[key]
+
+	def _find_most_frequent_sense(self, lemma, pos):
+		"""Find the most frequent possible sense of a glosstag lemma string (e.g. "dog%1|run%2") and token POS. The
+		candidate lists are ordered by frequency, so only their first senses are compared.
+
+		Returns:
+			(tuple):	the sense key and its synset offset, None if there is no possible sense
+		"""
+		if self._candidate_senses is None:
+			self._candidate_senses = self._build_candidate_sense_index()
+
+		first_senses = []
+		for single_lemma in lemma.split("|"):
+			lemma_raw, lemma_ss_type = single_lemma.split("%")
+			if int(lemma_ss_type) in GLOSSTAG_POS_POSSIBLE_SS_TYPES[pos] and (lemma_raw, int(lemma_ss_type)) in self._candidate_senses:
+				first_senses.append(self._candidate_senses[(lemma_raw, int(lemma_ss_type))][0])
+
+		if not first_senses:
+			return None
+		most_frequent_sense = min(first_senses, key=self._sense_frequency_order)
+		return most_frequent_sense, self.reference_wordnet.sense_keys[most_frequent_sense]["synset_offset"]
+
+	def _sense_frequency_order(self, sense_key):
+		"""Sort key ordering sense keys by descending tag count, ties are broken by the sense number and the key."""
+		sense = self.reference_wordnet.sense_keys[sense_key]
+		return -sense["tag_cnt"], sense["sense_number"], sense_key
+
+	def _most_frequent_sense_table(self):
+		"""Get the MFS table, read from mfs_table_path on first use if it was built with the same reference WordNet.
+
+		Returns:
+			(dict):	(glosstag lemma string, token POS) tuples as keys, (sense key, synset offset) tuples or None as values
+		"""
+		if self._mfs_table is None:
+			self._mfs_table = {}
+			if self.mfs_table_path is not None and os.path.isfile(self.mfs_table_path):
+				with open(self.mfs_table_path, "rb") as f:
+					stored = pickle.load(f)
+				if stored.get("version") == MFS_TABLE_VERSION and stored["wordnet"] == self._reference_wordnet_fingerprint():
+					self._mfs_table = stored["table"]
+		return self._mfs_table
+
+	def _write_mfs_table(self):
+		"""Store the MFS table at mfs_table_path together with the fingerprint of the reference WordNet."""
+		print("...writing MFS table")
+		tmp_path = "{0}.{1}.tmp".format(self.mfs_table_path, os.getpid())
+		with open(tmp_path, "wb") as f:
+			pickle.dump({"version": MFS_TABLE_VERSION, "wordnet": self._reference_wordnet_fingerprint(), "table": self._mfs_table}, f, protocol=pickle.HIGHEST_PROTOCOL)
+		os.replace(tmp_path, self.mfs_table_path)
+		self._mfs_table_changed = False
+
+	def _reference_wordnet_fingerprint(self):
+		"""Get the fingerprint of the source files of the reference WordNet, see WordNet._fingerprint_sources."""
+		return self.reference_wordnet._fingerprint_sources(self.reference_wordnet._snapshot_arguments())
+
+	def _build_candidate_sense_index(self):
+		"""Index the sense keys of the reference WordNet by the words of their synsets (case sensitive, without
+		adjective markers) and the ss type numbers of the glosstag lemmas. Adjective senses are found with both
+		adjective ss types (3 and 5), as heads and satellites share one index. The sense keys of every entry are
+		ordered by frequency (see _sense_frequency_order), the first one is the most frequent sense.
+
+		Returns:
+			(dict):	(word, ss type number) tuples as keys, tuples of the possible sense keys as values
+		"""
+		print("...indexing candidate senses")
+		candidates = {}
+		for synset in self.reference_wordnet.synsets.values():
+			ss_type_numbers = [3, 5] if synset.ss_type in "as" else [{"n": 1, "v": 2, "r": 4}[synset.ss_type]]
+			words = [ADJECTIVE_MARKER.sub("", word) for word, lex_id in synset.words]
+			for sense_key in synset.sense_keys:
+				sense_lemma = sense_key.split("%")[0]
+				# the sense keys are lower case, every word of the synset with that lemma has the sense
+				for word in set(word for word in words if word.lower() == sense_lemma):
+					for ss_type_number in ss_type_numbers:
+						candidates.setdefault((word, ss_type_number), []).append(sense_key)
+
+		return {key: tuple(sorted(sense_keys, key=self._sense_frequency_order)) for key, sense_keys in candidates.items()}
 
 	def _calc_path_similarity(self, sense_key_a, sense_key_b):
-		"""Calculate path similarity between two sense_keys using nltk.wordnet."""
-		def lemma_from_key(key):
+		"""Calculate path similarity between two sense_keys using the taxonomy of the reference WordNet."""
+		if self._similarity is None:
+			self._similarity = WordNetSimilarity(self.reference_wordnet)
+
+		synsets = []
+		for sense_key in [sense_key_a, sense_key_b]:
+			# keys of adjective satellites are resolved by synset_from_key, as the glosstag files refer to them as adjectives
 			try:
-				return wn.lemma_from_key(key)
-			except:
-				# there is some strange bug in the glosstag file that somehow does always refer to adjective satellites as adjectives
-				# as these keys then cant be found in WN they are tried to be resolved here
-				if re.search("%([0-9]):", key).group(1) == "3":
-					return lemma_from_key(re.sub("(%)[0-9](:)", "\g<1>5\g<2>", key))
-				self._log_message(sense_key_a)
-				return None
-
-		lemma_a = lemma_from_key(sense_key_a)
-		lemma_b = lemma_from_key(sense_key_b)
-
-		if lemma_a and lemma_b:
-			return lemma_a.synset().path_similarity(lemma_b.synset())
-		else:
-			return 0
+				synsets.append(self.reference_wordnet.synset_from_key(sense_key))
+			except AttributeError:
+				self._log_message(sense_key)
+				return 0
+
+		return self._similarity.path_similarity(*synsets)
 
 	### OTHER METHODS ###
 
@@ -395,6 +720,154 @@ class GlossDisambiguator(object):
 				f.write(message + "\n")
 		self._logged_messages.append(message)
 
+class GlosstagTokenStore(Mapping):
+	"""Read-only mapping of the synset ids of a glosstag file to the tokens of their glosses, stored in a binary file
+	that is built once from the glosstag file. The tokens are stored in a MappedTable, so a lookup only reads and
+	unpickles the record of that synset from the memory-mapped file.
+
+	The file consists of a magic string, the store version, a json header and the table. The header stores the size,
+	modification time and sha256 checksum of the glosstag file the store was built from.
+
+	Attributes:
+		path		(string)	the path of the store file
+		source		(dict)		path, size, mtime_ns and sha256 checksum of the glosstag file
+
+	Methods:
+		build		(None):					convert a glosstag file into a store file
+		open		(GlosstagTokenStore):	open a store file, rebuilding it if the glosstag file changed
+		outdated	(bool):					check if a store file is missing or was built from another glosstag file
+		records		(list):					get the pickled records of the synsets of a glosstag file or a shard of it
+	"""
+
+	def __init__(self, path):
+		"""Open a store file written by GlosstagTokenStore.build.
+
+		Arguments:
+			path	(string)	the path of the store file
+		"""
+		header, start = self._read_header(path)
+		if header is None:
+			raise ValueError("{0} is no glosstag token store of version {1}.".format(path, GLOSSTAG_STORE_VERSION))
+
+		self.path = path
+		self.source = header["source"]
+		self._table = MappedTable(path, start)
+
+	def __getitem__(self, synset_id):
+		"""Get the dict of token ids and Token objects and the list of log messages of a synset."""
+		return self._table[synset_id]
+
+	def __contains__(self, synset_id):
+		return synset_id in self._table
+
+	def __iter__(self):
+		return iter(self._table)
+
+	def __len__(self):
+		return len(self._table)
+
+	@classmethod
+	def build(cls, glosstag_file, path, records=None):
+		"""Convert all synsets of a glosstag file into a store file. The glosstag file is streamed and the tokens of
+		every synset are pickled right away, so only the pickled records are kept in memory.
+
+		Arguments:
+			glosstag_file	(string)	the path of the glosstag file
+			path			(string)	the path the store will be written to
+			records			(list)		optional records of all synsets of the file created with records, e.g. in
+										worker processes; they are created here if not given
+		"""
+		print("...building token store {0}".format(path))
+		if records is None:
+			records = cls.records(glosstag_file)
+		header = json.dumps({
+			"version": GLOSSTAG_STORE_VERSION,
+			"source": cls._describe_source(glosstag_file, checksum=True)
+		}).encode("utf-8")
+
+		# write to a temporary file first so that concurrent readers never see a partial store
+		tmp_path = "{0}.{1}.tmp".format(path, os.getpid())
+		with open(tmp_path, "wb") as f:
+			f.write(GLOSSTAG_STORE_MAGIC)
+			f.write(struct.pack("<II", GLOSSTAG_STORE_VERSION, len(header)))
+			f.write(header)
+			MappedTable.write(f, records, pickled=True)
+		os.replace(tmp_path, path)
+
+	@classmethod
+	def open(cls, glosstag_file, path):
+		"""Open the store of a glosstag file. The store is (re)built if it does not exist, is from an older version
+		or the glosstag file changed. A glosstag file with a different modification time but the same checksum is
+		not considered changed.
+
+		Arguments:
+			glosstag_file	(string)	the path of the glosstag file
+			path			(string)	the path of the store file
+
+		Returns:
+			(GlosstagTokenStore):	the opened store
+		"""
+		if cls.outdated(glosstag_file, path):
+			cls.build(glosstag_file, path)
+		return cls(path)
+
+	@classmethod
+	def outdated(cls, glosstag_file, path):
+		"""Check if the store of a glosstag file doesnt exist, is from an older version or the glosstag file changed."""
+		header = cls._read_header(path)[0]
+		return header is None or not cls._source_unchanged(header["source"], glosstag_file)
+
+	@staticmethod
+	def records(glosstag_file, shard=None):
+		"""Create the records of the synsets of a glosstag file, runs in worker processes when building in parallel.
+
+		Arguments:
+			glosstag_file	(string)	the path of the glosstag file
+			shard			(tuple)		optional (start, end) byte range of the file, see GlossDisambiguator._glosstag_shards
+
+		Returns:
+			(list):	(synset id, pickled tuple of the token table and the log messages) tuples
+		"""
+		return [(synset_id, pickle.dumps((token_table, messages), protocol=pickle.HIGHEST_PROTOCOL)) for synset_id, token_table, messages in GlossDisambiguator._iter_glosstag_token_tables(glosstag_file, None, shard)]
+
+	@staticmethod
+	def _describe_source(glosstag_file, checksum=False):
+		"""Get the size and modification time of a glosstag file and optionally its sha256 checksum."""
+		stat = os.stat(glosstag_file)
+		source = {"path": os.path.abspath(glosstag_file), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+		if checksum:
+			sha256 = hashlib.sha256()
+			with open(glosstag_file, "rb") as f:
+				for chunk in iter(lambda: f.read(GLOSSTAG_CHUNK_SIZE), b""):
+					sha256.update(chunk)
+			source["sha256"] = sha256.hexdigest()
+		return source
+
+	@classmethod
+	def _source_unchanged(cls, source, glosstag_file):
+		"""Check the stored description of the glosstag file against the current file, the checksum is only
+		computed if the size and modification time dont match."""
+		current = cls._describe_source(glosstag_file)
+		if current["size"] == source["size"] and current["mtime_ns"] == source["mtime_ns"]:
+			return True
+		return current["size"] == source["size"] and cls._describe_source(glosstag_file, checksum=True)["sha256"] == source["sha256"]
+
+	@staticmethod
+	def _read_header(path):
+		"""Read the header of a store file and the position of its table. None if the file doesnt exist or is not a
+		store of the current version."""
+		if not os.path.isfile(path):
+			return None, None
+
+		with open(path, "rb") as f:
+			if f.read(len(GLOSSTAG_STORE_MAGIC)) != GLOSSTAG_STORE_MAGIC:
+				return None, None
+			version, header_length = struct.unpack("<II", f.read(8))
+			if version != GLOSSTAG_STORE_VERSION:
+				return None, None
+			return json.loads(f.read(header_length).decode("utf-8")), len(GLOSSTAG_STORE_MAGIC) + 8 + header_length
+
+
 if __name__ == "__main__":
 	gd = GlossDisambiguator("", "", "")
 	pprint(gd._get_possible_wn_senses_for_token("successive%3"))
@@ -8,6 +8,8 @@ import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), "../../"))
 
+from src.util import intern_string, set_slot_state
+
 ### GLOSSES ####
 
 class Gloss(object):
@@ -32,6 +34,8 @@ class Gloss(object):
 																		the transformed information
 	"""
 
+	__slots__ = ("pos", "synset_offset", "synset_id", "gloss_text", "gloss_definitions", "gloss_examples", "synset", "tokens")
+
 	def __init__(self, pos, synset_offset, synset_id, gloss_text, gloss_definitions, gloss_examples, synset):
 		"""Instantiate the Gloss
 
@@ -45,11 +49,20 @@ class Gloss(object):
 			gloss_examples			(list)		examples of the gloss as list of strings
 			synset					(dict)		the glosses synset object
 		"""
-		self.__dict__.update(locals())
-		del self.__dict__["self"]
+		self.pos = intern_string(pos)
+		self.synset_offset = synset_offset
+		self.synset_id = synset_id
+		self.gloss_text = gloss_text
+		self.gloss_definitions = gloss_definitions
+		self.gloss_examples = gloss_examples
+		self.synset = synset
 
 		self.tokens = {}
 
+	def __setstate__(self, state):
+		"""Restore a pickled gloss, including glosses pickled before slots were used."""
+		set_slot_state(self, state)
+
 	def __repr__(self):
 		"""Informative String Representation of the gloss instance."""
 		return "GLOSS(pos={0}, words={3} desc={1}, id={2}".format(self.pos, self.gloss_definitions, self.synset_id, self.synset.words)
@@ -79,12 +92,16 @@ class LogicallyTransformedGloss(Gloss):
 		transformed_gloss_parsed	(list)		list of lists, each inner list is a parsed transformation
 	"""
 
+	__slots__ = ("transformed_gloss_strings", "transformed_gloss_entities", "transformed_gloss_parsed")
+
 	def __init__(self, pos, synset_offset, synset_id, gloss_text, gloss_definitions, gloss_examples, synset, transformed_gloss_strings, transformed_gloss_entities, transformed_gloss_parsed, tokens):
 		"""Instantiate a LogicallyTransformedGloss."""
 		super(LogicallyTransformedGloss, self).__init__(pos, synset_offset, synset_id, gloss_text, gloss_definitions, gloss_examples, synset)
 
-		self.__dict__.update(locals())
-		del self.__dict__["self"]
+		self.transformed_gloss_strings = transformed_gloss_strings
+		self.transformed_gloss_entities = transformed_gloss_entities
+		self.transformed_gloss_parsed = transformed_gloss_parsed
+		self.tokens = tokens
 
 	def __repr__(self):
 		"""Informative string representation of the LogicallyTransformedGloss."""
@@ -106,15 +123,30 @@ class Token(object):
 											"ignore" indicates an untaggable word;
 											"mfs" indicates it was disambiguated by this system using the most frequent sense baseline
 		pos						(string):	POS of that token
-		lemma_strings			(set):		a set of different lemmas this token may have in different word classes when not disambiguated
+		lemma_strings			(set):		a set of different lemmas this token may have in different word classes when not disambiguated,
+											computed from the lemma on access
 	"""
 
-	def __init__(self, id, token, lemma, wn_synset_offset, wn_sense_key, tag, pos):
-		"""Instantiate a Token."""
-		self.__dict__.update(locals())
-		del self.__dict__["self"]
+	__slots__ = ("id", "token", "lemma", "wn_synset_offset", "wn_sense_key", "tag", "pos")
 
-		self.lemma_strings = set([lemma_string.split("%")[0].lower() for lemma_string in self.lemma.split("|")])
+	def __init__(self, id, token, lemma, wn_synset_offset, wn_sense_key, tag, pos):
+		"""Instantiate a Token. Lemmas, sense keys, tags and POS repeat a lot across glosses and are therefore interned."""
+		self.id = id
+		self.token = token
+		self.lemma = intern_string(lemma)
+		self.wn_synset_offset = wn_synset_offset
+		self.wn_sense_key = intern_string(wn_sense_key)
+		self.tag = intern_string(tag)
+		self.pos = intern_string(pos)
+
+	def __setstate__(self, state):
+		"""Restore a pickled token, including tokens pickled before slots were used."""
+		set_slot_state(self, state)
+
+	@property
+	def lemma_strings(self):
+		"""The set of different lemmas this token may have in different word classes."""
+		return set([lemma_string.split("%")[0].lower() for lemma_string in self.lemma.split("|")])
 
 	def __repr__(self):
 		"""Informative string representation of the Token Object."""
@@ -138,12 +170,13 @@ class CollocationMember(Token):
 		collocation_id 			(list):		list of ids which are themselves srtings
 	"""
 
+	__slots__ = ("collocation_id",)
+
 	def __init__(self, id, token, lemma, wn_synset_offset, wn_sense_key, tag, pos, collocation_id):
 		"""Instantiate the CollocationMember."""
 		super(CollocationMember, self).__init__(id, token, lemma, wn_synset_offset, wn_sense_key, tag, pos)
 
-		self.__dict__.update(locals())
-		del self.__dict__["self"]
+		self.collocation_id = collocation_id
 
 	def __repr__(self):
 		"""Informative string representation of the Object."""
@@ -172,12 +205,15 @@ class CollocationHead(CollocationMember):
 
 	"""
 
+	__slots__ = ("collocation_lemma", "collocation_wn_sense_key", "collocation_tag")
+
 	def __init__(self, id, token, lemma, wn_synset_offset, wn_sense_key, tag, pos, collocation_id, collocation_lemma, collocation_wn_sense_key, collocation_tag):
 		"""Instantiate the CollocationHead."""
 		super(CollocationHead, self).__init__(id, token, lemma, wn_synset_offset, wn_sense_key, tag, pos, collocation_id)
 
-		self.__dict__.update(locals())
-		del self.__dict__["self"]
+		self.collocation_lemma = intern_string(collocation_lemma)
+		self.collocation_wn_sense_key = intern_string(collocation_wn_sense_key)
+		self.collocation_tag = intern_string(collocation_tag)
 
 	def __repr__(self):
 		"""Informative string representation of the Object."""
@@ -5,6 +5,12 @@
 """General functions used by multiple modules of the system."""
 
 import re
+from collections import OrderedDict
+
+try:
+	from sys import intern
+except ImportError:
+	pass  # python 2 provides intern as a builtin
 
 def get_ss_type_from_sense_key(sense_key):
 	"""Extract the ss type (n/v/a/r/s) of a wordnet sense key.
@@ -21,6 +27,83 @@ def add_key(key, dictionary, value={}):
 	if key not in dictionary:
 		dictionary[key] = value
 
+def intern_string(string):
+	"""Intern a string so that all equal strings share a single object, None is returned unchanged."""
+	if string is None:
+		return None
+	return intern(string)
+
+def set_slot_state(instance, state):
+	"""Restore the state of an unpickled object that uses __slots__. Supports the (dict, slots) tuples pickle creates
+	for slotted objects as well as plain attribute dicts of objects that were pickled before they used __slots__.
+	Attributes that are not stored anymore (e.g. because they are computed now) are skipped."""
+	if isinstance(state, tuple):
+		state = dict(state[0] or {}, **(state[1] or {}))
+	for attribute, value in state.items():
+		try:
+			setattr(instance, attribute, value)
+		except AttributeError:
+			pass
+
+class LRUCache(object):
+	"""Size bounded mapping that evicts the least recently used entry when it is full and counts hits, misses and evictions.
+
+	Attributes:
+		maxsize		(int)	the maximal number of entries
+		hits		(int)	number of lookups that found an entry
+		misses		(int)	number of lookups that didnt find an entry
+		evictions	(int)	number of entries removed to make room for new ones
+
+	Methods:
+		get			(object):	get the value of a key or the default, marking the entry as recently used
+		put			(None):		store a value, evicting the least recently used entry if necessary
+		clear		(None):		remove all entries
+		stats		(dict):		get the statistics of the cache
+	"""
+
+	def __init__(self, maxsize):
+		if maxsize < 1:
+			raise ValueError("The size of a cache must be positive.")
+		self.maxsize = maxsize
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+		self._entries = OrderedDict()
+
+	def __len__(self):
+		return len(self._entries)
+
+	def __contains__(self, key):
+		return key in self._entries
+
+	def get(self, key, default=None):
+		"""Get the value stored for the key or the default if there is none."""
+		try:
+			value = self._entries[key]
+		except KeyError:
+			self.misses += 1
+			return default
+
+		self._entries.move_to_end(key)
+		self.hits += 1
+		return value
+
+	def put(self, key, value):
+		"""Store a value for the key."""
+		self._entries[key] = value
+		self._entries.move_to_end(key)
+		if len(self._entries) > self.maxsize:
+			self._entries.popitem(last=False)
+			self.evictions += 1
+
+	def clear(self):
+		"""Remove all entries, the statistics are kept."""
+		self._entries.clear()
+
+	def stats(self):
+		"""Get hits, misses, evictions, the current size and the maximal size of the cache."""
+		return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "size": len(self._entries), "maxsize": self.maxsize}
+
 def get_wordnet_pos(treebank_tag):
 	"""Get the wordnet pos symbol (a/v/n/r) to a penntreebank POS Tag."""
 	if treebank_tag.startswith('J'):
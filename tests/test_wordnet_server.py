@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# AUTHOR: Tonio Weidler
+
+"""Tests of the WordNet server answering the queries of an SQLite backed WordNet.
+
+Usage:
+	python3 -m unittest tests/test_wordnet_server.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), "../"))
+
+import shutil
+import tempfile
+import threading
+import unittest
+
+from src.WordnetInterface import WordNet
+from src.WordnetSQLite import SQLiteWordNet
+from src.WordnetServer import WordNetServer, WordNetClient
+
+POINTERS = ["src/pointers/noun_pointers.txt", "src/pointers/adj_pointers.txt", "src/pointers/verb_pointers.txt", "src/pointers/adv_pointers.txt"]
+
+# a tiny WordNet in the format of the database files, the synset offsets are the byte offsets of the data lines
+DATABASE_FILES = {
+	"data.noun": "  1 license line\n"
+		"00000017 03 n 01 entity 0 000 | that which exists\n"
+		"00000067 05 n 01 animal 0 001 @ 00000017 n 0000 | a living organism\n"
+		"00000135 05 n 02 dog 0 domestic_dog 0 001 @ 00000067 n 0000 | a member of the genus Canis; \"the dog barked\"\n"
+		"00000243 05 n 01 cat 0 001 @ 00000067 n 0000 | feline mammal\n",
+	"data.verb": "  1 license line\n00000017 38 v 01 run 0 000 01 + 02 00 | move fast\n",
+	"data.adj": "  1 license line\n00000017 00 a 01 hot 0 000 | used of heat\n",
+	"data.adv": "  1 license line\n00000017 02 r 01 fast 0 000 | quickly\n",
+	"index.noun": "  1 license\n"
+		"animal n 1 1 @ 1 1 00000067\n"
+		"cat n 1 1 @ 1 0 00000243\n"
+		"dog n 1 1 @ 1 1 00000135\n"
+		"domestic_dog n 1 1 @ 1 0 00000135\n"
+		"entity n 1 0 1 0 00000017\n",
+	"index.verb": "  1 license\nrun v 1 0 1 0 00000017\n",
+	"index.adj": "  1 license\nhot a 1 0 1 0 00000017\n",
+	"index.adv": "  1 license\nfast r 1 0 1 0 00000017\n",
+	"index.sense": "animal%1:03:00:: 00000067 1 4\n"
+		"cat%1:05:00:: 00000243 1 2\n"
+		"dog%1:05:00:: 00000135 1 7\n"
+		"domestic_dog%1:05:00:: 00000135 1 0\n"
+		"entity%1:03:00:: 00000017 1 1\n"
+		"fast%4:02:00:: 00000017 1 3\n"
+		"hot%3:00:00:: 00000017 1 5\n"
+		"run%2:38:00:: 00000017 1 9\n",
+	"noun.exc": "geese goose\nmice mouse\n",
+	"verb.exc": "ran run\n",
+	"adj.exc": "hotter hot\n"
+}
+
+class ThreadRecordingSQLiteWordNet(SQLiteWordNet):
+	"""SQLite WordNet that records the threads looking up synsets."""
+
+	def __init__(self, database_path, hot_cache_size=4096):
+		super(ThreadRecordingSQLiteWordNet, self).__init__(database_path, hot_cache_size=hot_cache_size)
+		self.lookup_threads = set()
+
+	def synset_from_id(self, synset_id):
+		self.lookup_threads.add(threading.current_thread())
+		return super(ThreadRecordingSQLiteWordNet, self).synset_from_id(synset_id)
+
+
+class WordNetServerSQLiteTest(unittest.TestCase):
+
+	@classmethod
+	def setUpClass(cls):
+		cls.directory = tempfile.mkdtemp()
+		wordnet_dir = os.path.join(cls.directory, "wordnet")
+		os.mkdir(wordnet_dir)
+		for filename, content in DATABASE_FILES.items():
+			with open(os.path.join(wordnet_dir, filename), "w") as f:
+				f.write(content)
+
+		cls.wordnet = WordNet(wordnet_dir + "/", *POINTERS)
+		database_path = os.path.join(cls.directory, "wordnet.sqlite")
+		SQLiteWordNet.build(cls.wordnet, database_path)
+
+		# a hot cache of one synset makes the server read most synsets from the database
+		cls.sqlite_wordnet = ThreadRecordingSQLiteWordNet(database_path, hot_cache_size=1)
+		cls.server = WordNetServer(cls.sqlite_wordnet, port=0)
+		cls.server.start()
+		cls.client = WordNetClient(port=cls.server.port)
+
+	@classmethod
+	def tearDownClass(cls):
+		cls.server.shutdown()
+		shutil.rmtree(cls.directory)
+
+	def synset(self, sense_key):
+		return self.wordnet.synset_from_key(sense_key)
+
+	def test_synset_arguments_are_looked_up_by_the_dispatcher(self):
+		animal, dog, cat = self.synset("animal%1:03:00::"), self.synset("dog%1:05:00::"), self.synset("cat%1:05:00::")
+
+		sources = self.client.get_relation_sources(animal, "hypernym")
+		self.assertEqual(sorted(synset.synset_id for synset in sources), sorted([dog.synset_id, cat.synset_id]))
+		self.assertTrue(self.client.is_hypernym_of(animal, dog))
+		self.assertFalse(self.client.is_hypernym_of(cat, dog))
+		self.assertEqual(self.sqlite_wordnet.lookup_threads, {self.server._dispatcher})
+
+	def test_concurrent_clients(self):
+		sense_keys = sorted(self.wordnet.sense_keys)
+		expected = [self.wordnet.synset_id_from_key(sense_key) for sense_key in sense_keys]
+		results = []
+
+		def run_client():
+			client = WordNetClient(port=self.server.port)
+			results.append([client.synset_from_key(sense_key).synset_id for sense_key in sense_keys])
+
+		threads = [threading.Thread(target=run_client) for _ in range(4)]
+		for thread in threads:
+			thread.start()
+		for thread in threads:
+			thread.join()
+		self.assertEqual(results, [expected] * 4)
+
+	def test_errors_of_the_arguments_are_raised(self):
+		with self.assertRaises(ValueError):
+			self.client._request("POST", "/get_relation_sources", {"args": [{"__synset_id__": "99999999-n"}, "hypernym"], "kwargs": {}})
+		with self.assertRaises(TypeError):
+			self.client.synsets_for_lemma("dog")
+
+
+if __name__ == "__main__":
+	unittest.main()